@@ -1,10 +1,14 @@
 import asyncio
+import atexit
 import logging
+import multiprocessing
 import os
+import queue
 import sys
 from functools import partial, partialmethod
 from logging import Logger, handlers
 from pathlib import Path
+from typing import Optional
 
 import coloredlogs
 from discord.ext import commands
@@ -36,30 +40,65 @@ log_level = TRACE_LEVEL if DEBUG_MODE else logging.INFO
 format_string = "%(asctime)s | %(name)s | %(levelname)s | %(message)s"
 log_format = logging.Formatter(format_string)
 
-log_file = Path("logs", "bot.log")
-log_file.parent.mkdir(exist_ok=True)
-file_handler = handlers.RotatingFileHandler(log_file, maxBytes=5242880, backupCount=7, encoding="utf8")
-file_handler.setFormatter(log_format)
-
 root_log = logging.getLogger()
 root_log.setLevel(log_level)
-root_log.addHandler(file_handler)
 
-if "COLOREDLOGS_LEVEL_STYLES" not in os.environ:
-    coloredlogs.DEFAULT_LEVEL_STYLES = {
-        **coloredlogs.DEFAULT_LEVEL_STYLES,
-        "trace": {"color": 246},
-        "critical": {"background": "red"},
-        "debug": coloredlogs.DEFAULT_LEVEL_STYLES["info"]
-    }
+# Processes spawned by the bot, like the one analysing long messages, import this package too.
+# Only the bot's own process installs the handlers, so a single process writes to and rotates the log file.
+if multiprocessing.parent_process() is None:
+    log_file = Path("logs", "bot.log")
+    log_file.parent.mkdir(exist_ok=True)
+    file_handler = handlers.RotatingFileHandler(log_file, maxBytes=5242880, backupCount=7, encoding="utf8")
+    file_handler.setFormatter(log_format)
+
+    root_log.addHandler(file_handler)
+
+    if "COLOREDLOGS_LEVEL_STYLES" not in os.environ:
+        coloredlogs.DEFAULT_LEVEL_STYLES = {
+            **coloredlogs.DEFAULT_LEVEL_STYLES,
+            "trace": {"color": 246},
+            "critical": {"background": "red"},
+            "debug": coloredlogs.DEFAULT_LEVEL_STYLES["info"]
+        }
+
+    if "COLOREDLOGS_LOG_FORMAT" not in os.environ:
+        coloredlogs.DEFAULT_LOG_FORMAT = format_string
+
+    if "COLOREDLOGS_LOG_LEVEL" not in os.environ:
+        coloredlogs.DEFAULT_LOG_LEVEL = log_level
+
+    coloredlogs.install(logger=root_log, stream=sys.stdout)
+
+
+# While the bot runs, the root logger's handlers are moved behind a queue listener. Writing records to
+# the console and the log file is then done on the listener's thread, so logging doesn't block the event loop.
+log_queue = queue.SimpleQueue()
+log_listener: Optional[handlers.QueueListener] = None
+
+
+def start_log_listener() -> None:
+    """Move the root logger's handlers behind a queue listener running on its own thread."""
+    global log_listener
+    if log_listener is not None:
+        return
+
+    log_listener = handlers.QueueListener(log_queue, *root_log.handlers, respect_handler_level=True)
+    root_log.handlers = [handlers.QueueHandler(log_queue)]
+    log_listener.start()
+
+
+def stop_log_listener() -> None:
+    """Give the root logger its handlers back and stop the queue listener once it writes the queued records."""
+    global log_listener
+    if log_listener is None:
+        return
 
-if "COLOREDLOGS_LOG_FORMAT" not in os.environ:
-    coloredlogs.DEFAULT_LOG_FORMAT = format_string
+    root_log.handlers = list(log_listener.handlers)
+    log_listener.stop()
+    log_listener = None
 
-if "COLOREDLOGS_LOG_LEVEL" not in os.environ:
-    coloredlogs.DEFAULT_LOG_LEVEL = log_level
 
-coloredlogs.install(logger=root_log, stream=sys.stdout)
+atexit.register(stop_log_listener)
 
 logging.getLogger("discord").setLevel(logging.WARNING)
 logging.getLogger("websockets").setLevel(logging.WARNING)
@@ -70,7 +70,6 @@ extensions = set(EXTENSIONS)  # Create a mutable copy.
 if not constants.HelpChannels.enable:
     extensions.remove("bot.exts.help_channels")
 
-for extension in extensions:
-    bot.load_extension(extension)
+bot.load_extensions(extensions)
 
 bot.run(constants.Bot.token)
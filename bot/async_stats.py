@@ -1,18 +1,31 @@
 import asyncio
 import socket
+from collections import defaultdict
+from typing import DefaultDict, List, Optional
 
 from statsd.client.base import StatsClientBase
 
+# Largest datagram that fits in a single Ethernet frame, leaving room for the IP and UDP headers.
+MAX_PACKET_SIZE = 1432
+
 
 class AsyncStatsClient(StatsClientBase):
-    """An async transport method for statsd communication."""
+    """
+    An async transport method for statsd communication.
+
+    Metrics are buffered and sent in newline-separated packets of up to `max_packet_size` bytes,
+    either once `flush_interval` seconds have passed since the first buffered metric or as soon as
+    a full packet is buffered. Unsampled counters are summed locally until they're flushed.
+    """
 
     def __init__(
         self,
         loop: asyncio.AbstractEventLoop,
         host: str = 'localhost',
         port: int = 8125,
-        prefix: str = None
+        prefix: str = None,
+        flush_interval: float = 1,
+        max_packet_size: int = MAX_PACKET_SIZE,
     ):
         """Create a new client."""
         family, _, _, _, addr = socket.getaddrinfo(
@@ -22,6 +35,14 @@ class AsyncStatsClient(StatsClientBase):
         self._loop = loop
         self._transport = None
 
+        self._flush_interval = flush_interval
+        self._max_packet_size = max_packet_size
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+        self._buffer: List[str] = []
+        self._buffer_size = 0
+        self._counters: DefaultDict[str, int] = defaultdict(int)
+
     async def create_socket(self) -> None:
         """Use the loop.create_datagram_endpoint method to create a socket."""
         self._transport, _ = await self._loop.create_datagram_endpoint(
@@ -30,10 +51,59 @@ class AsyncStatsClient(StatsClientBase):
             remote_addr=self._addr
         )
 
+    def close(self) -> None:
+        """Send any buffered metrics and close the socket."""
+        self.flush()
+
+        if self._transport:
+            self._transport.close()
+
+    def incr(self, stat: str, count: int = 1, rate: float = 1) -> None:
+        """Increment a stat by `count`. Unsampled counts are summed until the next flush."""
+        if rate != 1:
+            super().incr(stat, count, rate)
+            return
+
+        self._counters[stat] += count
+        self._schedule_flush()
+
     def _send(self, data: str) -> None:
-        """Start an async task to send data to statsd."""
-        self._loop.create_task(self._async_send(data))
+        """Buffer data to be sent to statsd, flushing the buffer if it fills a packet."""
+        self._buffer.append(data)
+        self._buffer_size += len(data) + 1
+
+        if self._buffer_size >= self._max_packet_size:
+            self.flush()
+        else:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """Schedule the buffer to be flushed after the flush interval unless a flush is already scheduled."""
+        if self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self._flush_interval, self.flush)
+
+    def flush(self) -> None:
+        """Send all buffered metrics and summed counters to the statsd server."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        lines = [self._prepare(stat, f"{count}|c", 1) for stat, count in self._counters.items()]
+        lines.extend(self._buffer)
+
+        self._counters.clear()
+        self._buffer = []
+        self._buffer_size = 0
+
+        if not lines or self._transport is None:
+            return
+
+        packet = lines[0]
+        for line in lines[1:]:
+            if len(packet) + len(line) + 1 > self._max_packet_size:
+                self._transport.sendto(packet.encode('ascii'), self._addr)
+                packet = line
+            else:
+                packet = f"{packet}\n{line}"
 
-    async def _async_send(self, data: str) -> None:
-        """Send data to the statsd server using the async transport."""
-        self._transport.sendto(data.encode('ascii'), self._addr)
+        self._transport.sendto(packet.encode('ascii'), self._addr)
@@ -1,9 +1,11 @@
 import asyncio
+import functools
 import logging
 import socket
+import time
 import warnings
 from collections import defaultdict
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterable, Optional
 
 import aiohttp
 import discord
@@ -11,11 +13,14 @@ from async_rediscache import RedisSession
 from discord.ext import commands
 from sentry_sdk import push_scope
 
-from bot import DEBUG_MODE, api, constants
+from bot import DEBUG_MODE, api, constants, start_log_listener, stop_log_listener
 from bot.async_stats import AsyncStatsClient
 
 log = logging.getLogger('bot')
 
+# Seconds between event loop lag measurements.
+LOOP_LAG_INTERVAL = 1
+
 
 class Bot(commands.Bot):
     """A subclass of `discord.ext.commands.Bot` with an aiohttp session and an API client."""
@@ -48,6 +53,12 @@ class Bot(commands.Bot):
 
         self.stats = AsyncStatsClient(self.loop, statsd_url, 8125, prefix="bot")
 
+        # The latency timers wrapping each instrumented listener, by the names of their events.
+        self._instrumented_listeners: Dict[Callable, Dict[str, Callable]] = {}
+        self._loop_lag_task: Optional[asyncio.Task] = None
+        self._created_at = time.perf_counter()
+        self._startup_reported = False
+
     async def cache_filter_list_data(self) -> None:
         """Cache all the data in the FilterList on the site."""
         full_cache = await self.api_client.get('bot/filter-lists')
@@ -100,6 +111,91 @@ class Bot(commands.Bot):
         super().add_cog(cog)
         log.info(f"Cog loaded: {cog.qualified_name}")
 
+    def add_listener(self, func: Callable, name: Optional[str] = None) -> None:
+        """Add `func` as a listener, wrapped with a latency timer if instrumentation is enabled."""
+        if not constants.Stats.instrumentation:
+            super().add_listener(func, name)
+            return
+
+        name = func.__name__ if name is None else name
+        wrapper = self._instrument_listener(func, name)
+        self._instrumented_listeners.setdefault(func, {})[name] = wrapper
+        super().add_listener(wrapper, name)
+
+    def remove_listener(self, func: Callable, name: Optional[str] = None) -> None:
+        """
+        Remove the listener `func`, or the latency timers it was wrapped with.
+
+        If `name` is None, `func` is removed from all the events it was added to with a timer.
+        """
+        wrappers = self._instrumented_listeners.get(func)
+        if not wrappers:
+            super().remove_listener(func, name)
+            return
+
+        for event in ([name] if name is not None else list(wrappers)):
+            super().remove_listener(wrappers.pop(event, func), event)
+
+        if not wrappers:
+            del self._instrumented_listeners[func]
+
+    def _instrument_listener(self, func: Callable, name: str) -> Callable:
+        """
+        Return a wrapper of the listener `func` which reports its run time to statsd.
+
+        The timer is named after the event and the class of the cog the listener belongs to,
+        e.g. `latency.listeners.on_message.AntiSpam`.
+        """
+        owner = getattr(func, "__self__", None)
+        owner_name = type(owner).__name__ if owner is not None else func.__name__
+        stat = f"latency.listeners.{name}.{owner_name}"
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> None:
+            start = time.perf_counter()
+            try:
+                await func(*args, **kwargs)
+            finally:
+                self.stats.timing(stat, (time.perf_counter() - start) * 1000)
+
+        return wrapper
+
+    async def invoke(self, ctx: commands.Context) -> None:
+        """Invoke the command of `ctx`, reporting how long it took to statsd if instrumentation is enabled."""
+        if not constants.Stats.instrumentation or ctx.command is None:
+            await super().invoke(ctx)
+            return
+
+        command_name = ctx.command.qualified_name.replace(" ", "_")
+        start = time.perf_counter()
+        try:
+            await super().invoke(ctx)
+        finally:
+            self.stats.timing(f"latency.commands.{command_name}", (time.perf_counter() - start) * 1000)
+
+    async def _report_loop_lag(self) -> None:
+        """Periodically report how late the event loop wakes up from a sleep to statsd."""
+        while True:
+            start = self.loop.time()
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            lag = self.loop.time() - start - LOOP_LAG_INTERVAL
+            self.stats.gauge("event_loop.lag", round(lag * 1000, 3))
+
+    def load_extensions(self, extensions: Iterable[str]) -> None:
+        """Load all `extensions` and log how long each took to import and set up, slowest first."""
+        load_times = {}
+
+        for extension in extensions:
+            start = time.perf_counter()
+            self.load_extension(extension)
+            load_times[extension] = time.perf_counter() - start
+
+        report = "\n".join(
+            f"{seconds * 1000:8.1f} ms  {extension}"
+            for extension, seconds in sorted(load_times.items(), key=lambda item: item[1], reverse=True)
+        )
+        log.info(f"Loaded {len(load_times)} extensions in {sum(load_times.values()):.2f} seconds:\n{report}")
+
     def add_command(self, command: commands.Command) -> None:
         """Add `command` as normal and then add its root aliases to the bot."""
         super().add_command(command)
@@ -132,9 +228,12 @@ class Bot(commands.Bot):
         super().clear()
 
     async def close(self) -> None:
-        """Close the Discord connection and the aiohttp session, connector, statsd client, and resolver."""
+        """Close the Discord connection, the aiohttp session, connector, statsd client, resolver, and log listener."""
         await super().close()
 
+        if self._loop_lag_task:
+            self._loop_lag_task.cancel()
+
         await self.api_client.close()
 
         if self.http_session:
@@ -146,12 +245,13 @@ class Bot(commands.Bot):
         if self._resolver:
             await self._resolver.close()
 
-        if self.stats._transport:
-            self.stats._transport.close()
+        self.stats.close()
 
         if self.redis_session:
             await self.redis_session.close()
 
+        stop_log_listener()
+
     def insert_item_into_filter_list_cache(self, item: Dict[str, str]) -> None:
         """Add an item to the bots filter_list_cache."""
         type_ = item["type"]
@@ -167,8 +267,13 @@ class Bot(commands.Bot):
 
     async def login(self, *args, **kwargs) -> None:
         """Re-create the connector and set up sessions before logging into Discord."""
+        start_log_listener()
         self._recreate()
         await self.stats.create_socket()
+
+        if constants.Stats.instrumentation and self._loop_lag_task is None:
+            self._loop_lag_task = self.loop.create_task(self._report_loop_lag())
+
         await super().login(*args, **kwargs)
 
     async def on_guild_available(self, guild: discord.Guild) -> None:
@@ -196,6 +301,12 @@ class Bot(commands.Bot):
 
         self._guild_available.set()
 
+        if not self._startup_reported:
+            self._startup_reported = True
+            startup_time = time.perf_counter() - self._created_at
+            log.info(f"Guild available {startup_time:.2f} seconds after the bot was created.")
+            self.stats.timing("startup.guild_available", startup_time * 1000)
+
     async def on_guild_unavailable(self, guild: discord.Guild) -> None:
         """Clear the internal guild available event when constants.Guild.id becomes unavailable."""
         if guild.id != constants.Guild.id:
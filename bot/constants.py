@@ -361,10 +361,12 @@ class CleanMessages(metaclass=YAMLGetter):
 
     message_limit: int
 
+
 class Stats(metaclass=YAMLGetter):
     section = "bot"
     subsection = "stats"
 
+    instrumentation: bool
     presence_update_timeout: int
     statsd_host: str
 
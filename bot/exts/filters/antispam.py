@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 from operator import itemgetter
 from typing import Dict, Iterable, List, Set
 
+from aiohttp import ClientSession
 from discord import Colour, Member, Message, NotFound, Object, TextChannel
 from discord.ext.commands import Cog
 
@@ -44,6 +45,7 @@ class DeletionContext:
     """Represents a Deletion Context for a single spam event."""
 
     channel: TextChannel
+    http_session: ClientSession
     members: Dict[int, Member] = field(default_factory=dict)
     rules: Set[str] = field(default_factory=set)
     messages: Dict[int, Message] = field(default_factory=dict)
@@ -63,7 +65,7 @@ class DeletionContext:
 
                 # Re-upload attachments
                 destination = message.guild.get_channel(Channels.attachment_log)
-                urls = await send_attachments(message, destination, link_large=False)
+                urls = await send_attachments(message, destination, self.http_session, link_large=False)
                 self.attachments.append(urls)
 
     async def upload_messages(self, actor_id: int, modlog: ModLog) -> None:
@@ -191,7 +193,7 @@ class AntiSpam(Cog):
                 channel = message.channel
                 if channel.id not in self.message_deletion_queue:
                     log.trace(f"Creating queue for channel `{channel.id}`")
-                    self.message_deletion_queue[message.channel.id] = DeletionContext(channel)
+                    self.message_deletion_queue[message.channel.id] = DeletionContext(channel, self.bot.http_session)
                     self.bot.loop.create_task(self._process_deletion_context(message.channel.id))
 
                 # Add the relevant of this trigger to the Deletion Context
@@ -236,7 +238,7 @@ class AntiSpam(Cog):
             # If we have more than one message, we can use bulk delete.
             if len(messages) > 1:
                 message_ids = [message.id for message in messages]
-                self.mod_log.ignore(Event.message_delete, *message_ids)
+                self.mod_log.ignore_many(Event.message_delete, message_ids)
                 await channel.delete_messages(messages)
 
             # Otherwise, the bulk delete endpoint will throw up.
@@ -3,6 +3,7 @@ import binascii
 import logging
 import re
 import typing as t
+from collections import OrderedDict
 
 from discord import Colour, Message, NotFound
 from discord.ext.commands import Cog
@@ -12,6 +13,7 @@ from bot.bot import Bot
 from bot.constants import Channels, Colours, Event, Icons
 from bot.exts.moderation.modlog import ModLog
 from bot.utils.messages import format_user
+from bot.utils.regex import WEBHOOK_URL_RE
 
 log = logging.getLogger(__name__)
 
@@ -41,6 +43,11 @@ TOKEN_EPOCH = 1_293_840_000
 # Each part only matches base64 URL-safe characters.
 # Padding has never been observed, but the padding character '=' is matched just in case.
 TOKEN_RE = re.compile(r"([\w\-=]+)\.([\w\-=]+)\.([\w\-=]+)", re.ASCII)
+# The user ID and HMAC parts of a token are long runs of base64url characters, which ordinary text rarely has
+BASE64_RUN_RE = re.compile(r"[A-Za-z0-9_\-]{20}")
+
+# The amount of messages whose scan results are kept for other listeners of the same message
+SCAN_CACHE_SIZE = 256
 
 
 class Token(t.NamedTuple):
@@ -51,6 +58,53 @@ class Token(t.NamedTuple):
     hmac: str
 
 
+class SecretScan(t.NamedTuple):
+    """The bot token and Discord webhook URL found in a message, if any."""
+
+    token: t.Optional[Token]
+    webhook_url: t.Optional[str]  # Redacted to not include the webhook's token
+
+    @property
+    def found(self) -> bool:
+        """Return True if a token or a webhook URL was found."""
+        return self.token is not None or self.webhook_url is not None
+
+
+# Scan results by message ID, along with the scanned message and its content at the time
+_scans: t.Dict[int, t.Tuple[Message, str, SecretScan]] = OrderedDict()
+
+
+def scan_message(msg: Message) -> SecretScan:
+    """
+    Return the bot token and Discord webhook URL found in `msg`.
+
+    Every listener of a message event needs the same result, so it's kept for the most recently
+    scanned messages. It's only reused for the same message object with unchanged content.
+    """
+    cached = _scans.get(msg.id)
+    if cached:
+        cached_msg, content, scan = cached
+        if cached_msg is msg and content == msg.content:
+            return scan
+
+    token = TokenRemover.find_token_in_message(msg)
+
+    webhook_url = None
+    # A substring search is much cheaper than the case insensitive regex
+    if "/api/webhooks/" in msg.content.lower():
+        match = WEBHOOK_URL_RE.search(msg.content)
+        if match:
+            webhook_url = match[1] + "xxx"
+
+    scan = SecretScan(token, webhook_url)
+    _scans[msg.id] = (msg, msg.content, scan)
+    _scans.move_to_end(msg.id)
+    if len(_scans) > SCAN_CACHE_SIZE:
+        _scans.popitem(last=False)
+
+    return scan
+
+
 class TokenRemover(Cog):
     """Scans messages for potential discord.py bot tokens and removes them."""
 
@@ -73,7 +127,7 @@ class TokenRemover(Cog):
         if not msg.guild or msg.author.bot:
             return
 
-        found_token = self.find_token_in_message(msg)
+        found_token = scan_message(msg).token
         if found_token:
             await self.take_action(msg, found_token)
 
@@ -153,6 +207,11 @@ class TokenRemover(Cog):
     @classmethod
     def find_token_in_message(cls, msg: Message) -> t.Optional[Token]:
         """Return a seemingly valid token found in `msg` or `None` if no token is found."""
+        # A token has three parts separated by dots, and some of them are long base64url runs.
+        # Skip the token regex for the majority of messages without them.
+        if msg.content.count(".") < 2 or not BASE64_RUN_RE.search(msg.content):
+            return
+
         # Use finditer rather than search to guard against method calls prematurely returning the
         # token check (e.g. `message.channel.send` also matches our token pattern)
         for match in TOKEN_RE.finditer(msg.content):
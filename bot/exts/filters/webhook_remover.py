@@ -1,16 +1,14 @@
 import logging
-import re
 
 from discord import Colour, Message, NotFound
 from discord.ext.commands import Cog
 
 from bot.bot import Bot
 from bot.constants import Channels, Colours, Event, Icons
+from bot.exts.filters.token_remover import scan_message
 from bot.exts.moderation.modlog import ModLog
 from bot.utils.messages import format_user
 
-WEBHOOK_URL_RE = re.compile(r"((?:https?://)?discord(?:app)?\.com/api/webhooks/\d+/)\S+/?", re.IGNORECASE)
-
 ALERT_MESSAGE_TEMPLATE = (
     "{user}, looks like you posted a Discord webhook URL. Therefore, your "
     "message has been removed. Your webhook may have been **compromised** so "
@@ -70,9 +68,9 @@ class WebhookRemover(Cog):
         if not msg.guild or msg.author.bot:
             return
 
-        matches = WEBHOOK_URL_RE.search(msg.content)
-        if matches:
-            await self.delete_and_respond(msg, matches[1] + "xxx")
+        redacted_url = scan_message(msg).webhook_url
+        if redacted_url:
+            await self.delete_and_respond(msg, redacted_url)
 
     @Cog.listener()
     async def on_message_edit(self, before: Message, after: Message) -> None:
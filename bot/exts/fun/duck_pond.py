@@ -1,9 +1,18 @@
 import asyncio
+import json
 import logging
-from typing import Union
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import MutableMapping, Optional, Set, Tuple, Union
+from weakref import WeakValueDictionary
 
 import discord
-from discord import Color, Embed, Member, Message, RawReactionActionEvent, User, errors
+from async_rediscache import RedisCache
+from discord import (
+    Color, Embed, Member, Message, RawReactionActionEvent, RawReactionClearEmojiEvent, RawReactionClearEvent, User,
+    errors
+)
 from discord.ext.commands import Cog, Context, command
 
 from bot import constants
@@ -14,16 +23,82 @@ from bot.utils.webhooks import send_webhook
 
 log = logging.getLogger(__name__)
 
+# Stored in place of the reactions of messages which can't be relayed by ducks, so they aren't fetched again
+INELIGIBLE = "ineligible"
+# The stored reactions of messages older than this are deleted; they're fetched again if the messages get more ducks
+DUCK_REACTIONS_TTL = timedelta(days=7)
+PRUNE_INTERVAL = timedelta(days=1)
+
+
+@dataclass
+class DuckReactions:
+    """The duck reactions added to a message by staff members."""
+
+    reactions: Set[Tuple[int, str]] = field(default_factory=set)  # Pairs of reactor IDs and emojis
+    _n_by_reactor: Counter = field(default_factory=Counter, init=False, repr=False)
+
+    def __post_init__(self):
+        self._n_by_reactor.update(user_id for user_id, _ in self.reactions)
+
+    @property
+    def n_reactors(self) -> int:
+        """Return the amount of staff members who reacted with at least one duck."""
+        return len(self._n_by_reactor)
+
+    def add(self, user_id: int, emoji: str) -> None:
+        """Add the reaction with `emoji` by the staff member with `user_id`."""
+        if (user_id, emoji) not in self.reactions:
+            self.reactions.add((user_id, emoji))
+            self._n_by_reactor[user_id] += 1
+
+    def remove(self, user_id: int, emoji: str) -> None:
+        """Remove the reaction with `emoji` by the user with `user_id`, if it was added by a staff member."""
+        if (user_id, emoji) in self.reactions:
+            self.reactions.remove((user_id, emoji))
+            self._n_by_reactor[user_id] -= 1
+            if not self._n_by_reactor[user_id]:
+                del self._n_by_reactor[user_id]
+
+    def remove_emoji(self, emoji: str) -> None:
+        """Remove all reactions with `emoji`."""
+        for user_id, reaction_emoji in list(self.reactions):
+            if reaction_emoji == emoji:
+                self.remove(user_id, emoji)
+
+    @classmethod
+    def from_json(cls, json_reactions: str) -> "DuckReactions":
+        """Create the reactions from their JSON representation in Redis."""
+        return cls({(user_id, emoji) for user_id, emoji in json.loads(json_reactions)})
+
+    def to_json(self) -> str:
+        """Return the JSON representation of the reactions to store in Redis."""
+        return json.dumps(sorted(self.reactions))
+
 
 class DuckPond(Cog):
     """Relays messages to #duck-pond whenever a certain number of duck reactions have been achieved."""
 
+    # RedisCache[message.id, str]
+    # The JSON representation of `DuckReactions` on messages by human staff members, or `INELIGIBLE`
+    # for duck-reacted messages which can't be relayed (anymore). Only messages by human staff members
+    # can be relayed by ducks, so their reactions are kept up to date from reaction events after being
+    # fetched from the API once. Entries older than `DUCK_REACTIONS_TTL` are pruned periodically.
+    duck_reactions = RedisCache()
+
     def __init__(self, bot: Bot):
         self.bot = bot
         self.webhook_id = constants.Webhooks.duck_pond
         self.webhook = None
         self.bot.loop.create_task(self.fetch_webhook())
         self.relay_lock = None
+        # Locks guarding updates of the stored duck reactions of each message, by message ID
+        self.reactions_locks: MutableMapping[int, asyncio.Lock] = WeakValueDictionary()
+        self.prune_task = self.bot.loop.create_task(self.prune_duck_reactions())
+
+    def cog_unload(self) -> None:
+        """Cancel the task pruning the stored duck reactions."""
+        if self.prune_task:
+            self.prune_task.cancel()
 
     async def fetch_webhook(self) -> None:
         """Fetches the webhook object, so we can post to it."""
@@ -43,13 +118,12 @@ class DuckPond(Cog):
                     return True
         return False
 
-    async def has_green_checkmark(self, message: Message) -> bool:
-        """Check if the message has a green checkmark reaction."""
+    @staticmethod
+    def has_green_checkmark(message: Message) -> bool:
+        """Check if the message has a green checkmark reaction added by the bot."""
         for reaction in message.reactions:
             if reaction.emoji == "✅":
-                async for user in reaction.users():
-                    if user == self.bot.user:
-                        return True
+                return reaction.me
         return False
 
     @staticmethod
@@ -60,13 +134,9 @@ class DuckPond(Cog):
         else:
             return hasattr(emoji, "name") and emoji.name.startswith("ducky_")
 
-    async def count_ducks(self, message: Message) -> int:
-        """
-        Count the number of ducks in the reactions of a specific message.
-
-        Only counts ducks added by staff members.
-        """
-        duck_reactors = set()
+    async def fetch_duck_reactions(self, message: Message) -> DuckReactions:
+        """Fetch the duck reactions added to `message` by staff members from the API."""
+        duck_reactions = DuckReactions()
 
         # iterate over all reactions
         for reaction in message.reactions:
@@ -74,10 +144,41 @@ class DuckPond(Cog):
             if not self._is_duck_emoji(reaction.emoji):
                 continue
 
-            # update the set of reactors with all staff reactors
-            duck_reactors |= {user.id async for user in reaction.users() if self.is_staff(user)}
+            async for user in reaction.users():
+                if self.is_staff(user):
+                    duck_reactions.add(user.id, str(reaction.emoji))
 
-        return len(duck_reactors)
+        return duck_reactions
+
+    async def load_duck_reactions(self, message_id: int) -> Optional[DuckReactions]:
+        """Return the duck reactions on the message with `message_id` from Redis, if they're stored."""
+        json_reactions = await self.duck_reactions.get(message_id)
+        if json_reactions is None or json_reactions == INELIGIBLE:
+            return None
+        return DuckReactions.from_json(json_reactions)
+
+    async def prune_duck_reactions(self) -> None:
+        """Periodically delete the stored duck reactions of messages older than `DUCK_REACTIONS_TTL`."""
+        while True:
+            try:
+                cutoff = discord.utils.time_snowflake(datetime.utcnow() - DUCK_REACTIONS_TTL)
+                expired = [message_id for message_id in await self.duck_reactions.to_dict() if message_id < cutoff]
+
+                log.trace(f"Pruning the stored duck reactions of {len(expired)} messages")
+                for message_id in expired:
+                    await self.duck_reactions.delete(message_id)
+            except Exception:
+                log.exception("Failed to prune the stored duck reactions")
+
+            await asyncio.sleep(PRUNE_INTERVAL.total_seconds())
+
+    def get_reactions_lock(self, message_id: int) -> asyncio.Lock:
+        """
+        Return the lock guarding updates of the duck reactions stored for the message with `message_id`.
+
+        Reactions to different messages are handled concurrently. A lock is only kept while it's in use.
+        """
+        return self.reactions_locks.setdefault(message_id, asyncio.Lock())
 
     async def relay_message(self, message: Message) -> None:
         """Relays the message's content and attachments to the duck pond channel."""
@@ -91,7 +192,7 @@ class DuckPond(Cog):
 
         if message.attachments:
             try:
-                await send_attachments(message, self.webhook)
+                await send_attachments(message, self.webhook, self.bot.http_session)
             except (errors.Forbidden, errors.NotFound):
                 e = Embed(
                     description=":x: **This message contained an attachment, but it could not be retrieved**",
@@ -115,7 +216,7 @@ class DuckPond(Cog):
 
         async with self.relay_lock:
             # check if the message has a checkmark after acquiring the lock
-            if await self.has_green_checkmark(message):
+            if self.has_green_checkmark(message):
                 return False
 
             # relay the message
@@ -157,35 +258,66 @@ class DuckPond(Cog):
         if not self._payload_has_duckpond_emoji(payload.emoji):
             return
 
+        # Is the reactor a human staff member?
+        member = payload.member or self.bot.get_guild(payload.guild_id).get_member(payload.user_id)
+        if not self.is_staff(member) or member.bot:
+            return
+
         channel = discord.utils.get(self.bot.get_all_channels(), id=payload.channel_id)
         if channel is None:
             return
 
-        message = await channel.fetch_message(payload.message_id)
-        member = discord.utils.get(message.guild.members, id=payload.user_id)
+        message = None
+        async with self.get_reactions_lock(payload.message_id):
+            json_reactions = await self.duck_reactions.get(payload.message_id)
 
-        # Was the message sent by a human staff member?
-        if not self.is_staff(message.author) or message.author.bot:
-            return
+            if json_reactions == INELIGIBLE:
+                return
+            elif json_reactions is None:
+                message = await channel.fetch_message(payload.message_id)
 
-        # Is the reactor a human staff member?
-        if not self.is_staff(member) or member.bot:
-            return
+                # Was the message sent by a human staff member?
+                if not self.is_staff(message.author) or message.author.bot:
+                    await self.duck_reactions.set(payload.message_id, INELIGIBLE)
+                    return
+
+                # The fetched reactions already include this one
+                duck_reactions = await self.fetch_duck_reactions(message)
+            else:
+                duck_reactions = DuckReactions.from_json(json_reactions)
+                duck_reactions.add(member.id, str(payload.emoji))
 
-        # Time to count our ducks!
-        duck_count = await self.count_ducks(message)
+            await self.duck_reactions.set(payload.message_id, duck_reactions.to_json())
 
         # If we've got more than the required amount of ducks, send the message to the duck_pond.
-        if duck_count >= constants.DuckPond.threshold:
+        if duck_reactions.n_reactors >= constants.DuckPond.threshold:
+            if message is None:
+                message = await channel.fetch_message(payload.message_id)
             await self.locked_relay(message)
 
+            # The message has been relayed, so its reactions don't have to be tracked anymore.
+            async with self.get_reactions_lock(payload.message_id):
+                await self.duck_reactions.set(payload.message_id, INELIGIBLE)
+
     @Cog.listener()
     async def on_raw_reaction_remove(self, payload: RawReactionActionEvent) -> None:
-        """Ensure that people don't remove the green checkmark from duck ponded messages."""
+        """
+        Remove duck reactions from the stored reactions of their message.
+
+        Also ensure that people don't remove the green checkmark from duck ponded messages.
+        """
         # Ignore other guilds and DMs.
         if payload.guild_id != constants.Guild.id:
             return
 
+        if self._payload_has_duckpond_emoji(payload.emoji):
+            async with self.get_reactions_lock(payload.message_id):
+                duck_reactions = await self.load_duck_reactions(payload.message_id)
+                if duck_reactions is not None:
+                    duck_reactions.remove(payload.user_id, str(payload.emoji))
+                    await self.duck_reactions.set(payload.message_id, duck_reactions.to_json())
+            return
+
         channel = discord.utils.get(self.bot.get_all_channels(), id=payload.channel_id)
         if channel is None:
             return
@@ -193,10 +325,35 @@ class DuckPond(Cog):
         # Prevent the green checkmark from being removed
         if payload.emoji.name == "✅":
             message = await channel.fetch_message(payload.message_id)
-            duck_count = await self.count_ducks(message)
-            if duck_count >= constants.DuckPond.threshold:
+            duck_reactions = await self.load_duck_reactions(message.id)
+            if duck_reactions is None:
+                duck_reactions = await self.fetch_duck_reactions(message)
+
+            if duck_reactions.n_reactors >= constants.DuckPond.threshold:
                 await message.add_reaction("✅")
 
+    @Cog.listener()
+    async def on_raw_reaction_clear(self, payload: RawReactionClearEvent) -> None:
+        """Forget the duck reactions of messages whose reactions were all removed."""
+        if payload.guild_id != constants.Guild.id:
+            return
+
+        async with self.get_reactions_lock(payload.message_id):
+            if await self.load_duck_reactions(payload.message_id) is not None:
+                await self.duck_reactions.set(payload.message_id, DuckReactions().to_json())
+
+    @Cog.listener()
+    async def on_raw_reaction_clear_emoji(self, payload: RawReactionClearEmojiEvent) -> None:
+        """Remove the reactions of a duck emoji which was removed from a message."""
+        if payload.guild_id != constants.Guild.id or not self._payload_has_duckpond_emoji(payload.emoji):
+            return
+
+        async with self.get_reactions_lock(payload.message_id):
+            duck_reactions = await self.load_duck_reactions(payload.message_id)
+            if duck_reactions is not None:
+                duck_reactions.remove_emoji(str(payload.emoji))
+                await self.duck_reactions.set(payload.message_id, duck_reactions.to_json())
+
     @command(name="duckify", aliases=("duckpond", "pondify"))
     @has_any_role(constants.Roles.admins)
     async def duckify(self, ctx: Context, message: discord.Message) -> None:
@@ -2,25 +2,39 @@ import asyncio
 import json
 import logging
 import random
+import time
 import typing as t
-from collections import deque
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta, timezone
+from operator import attrgetter
 from pathlib import Path
 
 import discord
 import discord.abc
 from async_rediscache import RedisCache
-from discord.ext import commands
+from discord.ext import commands, tasks
+from discord.utils import snowflake_time
 
 from bot import constants
 from bot.bot import Bot
+from bot.utils.lock import lock_arg
 from bot.utils.scheduling import Scheduler
 
 log = logging.getLogger(__name__)
 
+NAMESPACE = "help"  # Used for the mutually_exclusive decorator; constant to prevent typos
+
 ASKING_GUIDE_URL = "https://pythondiscord.com/pages/asking-good-questions/"
 MAX_CHANNELS_PER_CATEGORY = 50
+MAX_CONCURRENT_INIT_MOVES = 5  # The amount of in-use channels handled concurrently when the cog is initialised.
+ACTIVITY_FLUSH_SECONDS = 60  # The interval at which the changed activity of channels is persisted.
 EXCLUDED_CHANNELS = (constants.Channels.how_to_get_help, constants.Channels.cooldown)
+HELP_CATEGORIES = (
+    constants.Categories.help_available,
+    constants.Categories.help_in_use,
+    constants.Categories.help_dormant,
+)
 
 HELP_CHANNEL_TOPIC = """
 This is a Python help channel. You can claim your own help channel in the Python Help: Available category.
@@ -52,6 +66,48 @@ through our guide for **[asking a good question]({ASKING_GUIDE_URL})**.
 CoroutineFunc = t.Callable[..., t.Coroutine]
 
 
+@dataclass
+class Claim:
+    """The state of a claimed help channel, stored as a single record per channel."""
+
+    claimant_id: int
+    claimed_at: float  # UTC POSIX timestamp
+    unanswered: bool = True
+    question_message_id: t.Optional[int] = None
+
+    @classmethod
+    def from_json(cls, data: str) -> "Claim":
+        """Create a claim from its JSON representation."""
+        return cls(**json.loads(data))
+
+    def to_json(self) -> str:
+        """Return the JSON representation of the claim."""
+        return json.dumps(asdict(self))
+
+    @property
+    def in_use_time(self) -> timedelta:
+        """Return the duration the channel has been in use for."""
+        return datetime.utcnow() - datetime.utcfromtimestamp(self.claimed_at)
+
+
+@dataclass
+class Activity:
+    """The activity in an in-use help channel since it was claimed."""
+
+    claim_message_id: int
+    last_message_id: int
+    user_messages: int  # The amount of undeleted messages sent by users other than bots.
+
+    @classmethod
+    def from_json(cls, data: str) -> "Activity":
+        """Create the activity from its JSON representation."""
+        return cls(**json.loads(data))
+
+    def to_json(self) -> str:
+        """Return the JSON representation of the activity."""
+        return json.dumps(asdict(self))
+
+
 class HelpChannels(commands.Cog):
     """
     Manage the help channel system of the guild.
@@ -87,23 +143,24 @@ class HelpChannels(commands.Cog):
     Help channels are named after the chemical elements in `bot/resources/elements.json`.
     """
 
-    # This cache tracks which channels are claimed by which members.
-    # RedisCache[discord.TextChannel.id, t.Union[discord.User.id, discord.Member.id]]
-    help_channel_claimants = RedisCache()
-
-    # This cache maps a help channel to whether it has had any
-    # activity other than the original claimant. True being no other
-    # activity and False being other activity.
-    # RedisCache[discord.TextChannel.id, bool]
-    unanswered = RedisCache()
-
-    # This dictionary maps a help channel to the time it was claimed
-    # RedisCache[discord.TextChannel.id, UtcPosixTimestamp]
-    claim_times = RedisCache()
-
-    # This cache maps a help channel to original question message in same channel.
-    # RedisCache[discord.TextChannel.id, discord.Message.id]
-    question_messages = RedisCache()
+    # This cache maps a claimed help channel to its claim: the claimant, the time it was claimed,
+    # whether anyone other than the claimant has sent a message in it, and the pinned question.
+    # Keeping the whole claim in a single value lets it be read or written in one round trip.
+    # RedisCache[discord.TextChannel.id, JSON-encoded Claim]
+    claims = RedisCache()
+
+    # This cache maps an in-use help channel to its activity. It's kept up to date from gateway
+    # events so the channel's history only has to be fetched for channels without a record.
+    # Changes are kept in memory and persisted periodically, as well as when a channel is claimed or made dormant.
+    # RedisCache[discord.TextChannel.id, JSON-encoded Activity]
+    channel_activity = RedisCache()
+
+    # The caches which held the claims' fields before they were merged into `claims`.
+    # They're only read to migrate their contents when the cog is initialised.
+    legacy_claimants = RedisCache(namespace="HelpChannels.help_channel_claimants")
+    legacy_claim_times = RedisCache(namespace="HelpChannels.claim_times")
+    legacy_unanswered = RedisCache(namespace="HelpChannels.unanswered")
+    legacy_question_messages = RedisCache(namespace="HelpChannels.question_messages")
 
     def __init__(self, bot: Bot):
         self.bot = bot
@@ -114,6 +171,11 @@ class HelpChannels(commands.Cog):
         self.in_use_category: discord.CategoryChannel = None
         self.dormant_category: discord.CategoryChannel = None
 
+        # The IDs of the help channels in each help category and the clean names of those channels.
+        # Both are built when the cog is initialised and kept up to date from the guild channel events.
+        self.category_channels: t.Dict[int, t.Set[int]] = {category_id: set() for category_id in HELP_CATEGORIES}
+        self.channel_names: t.Dict[int, str] = {}
+
         # Queues
         self.channel_queue: asyncio.Queue[discord.TextChannel] = None
         self.name_queue: t.Deque[str] = None
@@ -124,7 +186,14 @@ class HelpChannels(commands.Cog):
         # Asyncio stuff
         self.queue_tasks: t.List[asyncio.Task] = []
         self.ready = asyncio.Event()
-        self.on_message_lock = asyncio.Lock()
+
+        # Guard the positions of the channels in each category while a channel is moved into it.
+        self.category_locks: t.DefaultDict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+        # A copy of the `channel_activity` cache, loaded when the cog is initialised, and the IDs of
+        # the channels whose activity changed since it was last persisted.
+        self.activity: t.Dict[int, Activity] = {}
+        self.changed_activity: t.Set[int] = set()
         self.init_task = self.bot.loop.create_task(self.init_cog())
 
     def cog_unload(self) -> None:
@@ -136,6 +205,9 @@ class HelpChannels(commands.Cog):
         for task in self.queue_tasks:
             task.cancel()
 
+        log.trace("Cog unload: cancelling the activity flush task")
+        self.flush_activity.cancel()
+
         self.scheduler.cancel_all()
 
     def create_channel_queue(self) -> asyncio.Queue:
@@ -172,7 +244,7 @@ class HelpChannels(commands.Cog):
             log.debug("No more names available for new dormant channels.")
             return None
 
-        log.debug(f"Creating a new dormant channel named {name}.")
+        log.debug("Creating a new dormant channel named %s.", name)
         return await self.dormant_category.create_text_channel(name, topic=HELP_CHANNEL_TOPIC)
 
     def create_name_queue(self) -> deque:
@@ -187,14 +259,47 @@ class HelpChannels(commands.Cog):
         log.trace("Populating the name queue with names.")
         return deque(available_names)
 
+    async def get_claim(self, channel_id: int) -> t.Optional[Claim]:
+        """Return the claim of the channel with `channel_id`, or None if it isn't claimed."""
+        data = await self.claims.get(channel_id)
+        if data is not None:
+            return Claim.from_json(data)
+
+    async def migrate_legacy_caches(self) -> None:
+        """Merge the claims stored in the legacy per-field caches into `claims` and clear the legacy caches."""
+        claimants = await self.legacy_claimants.to_dict()
+        if not claimants:
+            return
+
+        log.info(f"Migrating {len(claimants)} help channel claims to a single record per channel.")
+        claim_times = await self.legacy_claim_times.to_dict()
+        unanswered = await self.legacy_unanswered.to_dict()
+        question_messages = await self.legacy_question_messages.to_dict()
+
+        await self.claims.update({
+            channel_id: Claim(
+                claimant_id=claimant_id,
+                claimed_at=claim_times.get(channel_id, 0),
+                unanswered=unanswered.get(channel_id, True),
+                question_message_id=question_messages.get(channel_id),
+            ).to_json()
+            for channel_id, claimant_id in claimants.items()
+        })
+
+        for cache in (
+            self.legacy_claimants, self.legacy_claim_times, self.legacy_unanswered, self.legacy_question_messages
+        ):
+            await cache.clear()
+
     async def dormant_check(self, ctx: commands.Context) -> bool:
         """Return True if the user is the help channel claimant or passes the role check."""
-        if await self.help_channel_claimants.get(ctx.channel.id) == ctx.author.id:
-            log.trace(f"{ctx.author} is the help channel claimant, passing the check for dormant.")
+        claim = await self.get_claim(ctx.channel.id)
+        if claim and claim.claimant_id == ctx.author.id:
+            log.trace("%s is the help channel claimant, passing the check for dormant.", ctx.author)
             self.bot.stats.incr("help.dormant_invoke.claimant")
             return True
 
-        log.trace(f"{ctx.author} is not the help channel claimant, checking roles.")
+        log.trace("%s is not the help channel claimant, checking roles.", ctx.author)
         has_role = await commands.has_any_role(*constants.HelpChannels.cmd_whitelist).predicate(ctx)
 
         if has_role:
@@ -223,13 +328,14 @@ class HelpChannels(commands.Cog):
                 await self.move_to_dormant(ctx.channel, "command")
                 self.scheduler.cancel(ctx.channel.id)
         else:
-            log.debug(f"{ctx.author} invoked command 'dormant' outside an in-use help channel")
+            log.debug("%s invoked command 'dormant' outside an in-use help channel", ctx.author)
 
-    async def get_available_candidate(self) -> discord.TextChannel:
+    async def get_available_candidate(self, wait: bool = True) -> t.Optional[discord.TextChannel]:
         """
         Return a dormant channel to turn into an available channel.
 
         If no channel is available, wait indefinitely until one becomes available.
+        Return None instead if `wait` is False.
         """
         log.trace("Getting an available channel candidate.")
 
@@ -239,7 +345,9 @@ class HelpChannels(commands.Cog):
             log.info("No candidate channels in the queue; creating a new channel.")
             channel = await self.create_dormant()
 
-            if not channel:
+            if not channel and not wait:
+                log.info("Couldn't create a candidate channel.")
+            elif not channel:
                 log.info("Couldn't create a candidate channel; waiting to get one from the queue.")
                 await self.notify()
                 channel = await self.wait_for_dormant_channel()
@@ -253,7 +361,7 @@ class HelpChannels(commands.Cog):
         try:
             # Try to remove the status prefix using the index of the channel prefix
             name = channel.name[channel.name.index(prefix):]
-            log.trace(f"The clean name for `{channel}` is `{name}`")
+            log.trace("The clean name for `%s` is `%s`", channel, name)
         except ValueError:
             # If, for some reason, the channel name does not contain "help-" fall back gracefully
             log.info(f"Can't get clean name because `{channel}` isn't prefixed by `{prefix}`.")
@@ -267,22 +375,43 @@ class HelpChannels(commands.Cog):
         return not isinstance(channel, discord.TextChannel) or channel.id in EXCLUDED_CHANNELS
 
     def get_category_channels(self, category: discord.CategoryChannel) -> t.Iterable[discord.TextChannel]:
-        """Yield the text channels of the `category` in an unsorted manner."""
-        log.trace(f"Getting text channels in the category '{category}' ({category.id}).")
+        """Yield the text channels of the help `category` in an unsorted manner."""
+        log.trace("Getting text channels in the category '%s' (%s).", category, category.id)
 
-        # This is faster than using category.channels because the latter sorts them.
-        for channel in self.bot.get_guild(constants.Guild.id).channels:
-            if channel.category_id == category.id and not self.is_excluded_channel(channel):
+        # Copy the IDs so a channel event during the iteration doesn't change the set's size.
+        for channel_id in list(self.category_channels[category.id]):
+            channel = self.bot.get_channel(channel_id)
+            if channel is not None:
                 yield channel
 
-    async def get_in_use_time(self, channel_id: int) -> t.Optional[timedelta]:
-        """Return the duration `channel_id` has been in use. Return None if it's not in use."""
-        log.trace(f"Calculating in use time for channel {channel_id}.")
+    def index_channels(self) -> None:
+        """Build the index of the channels in the help categories from the guild's channels."""
+        log.trace("Indexing the channels of the help categories.")
 
-        claimed_timestamp = await self.claim_times.get(channel_id)
-        if claimed_timestamp:
-            claimed = datetime.utcfromtimestamp(claimed_timestamp)
-            return datetime.utcnow() - claimed
+        for channel_ids in self.category_channels.values():
+            channel_ids.clear()
+        self.channel_names.clear()
+
+        for channel in self.bot.get_guild(constants.Guild.id).channels:
+            self.update_index(channel)
+
+    def update_index(self, channel: discord.abc.GuildChannel, deleted: bool = False) -> None:
+        """Update the index of the help categories' channels with the current state of `channel`."""
+        category_id = channel.category_id
+        old_category_id = next(
+            (c_id for c_id, channel_ids in self.category_channels.items() if channel.id in channel_ids),
+            None
+        )
+
+        if old_category_id is not None:
+            self.category_channels[old_category_id].discard(channel.id)
+            self.channel_names.pop(channel.id, None)
+
+        if deleted or category_id not in HELP_CATEGORIES or self.is_excluded_channel(channel):
+            return
+
+        self.category_channels[category_id].add(channel.id)
+        self.channel_names[channel.id] = self.get_clean_channel_name(channel)
 
     @staticmethod
     def get_names() -> t.List[str]:
@@ -295,7 +424,7 @@ class HelpChannels(commands.Cog):
         count = constants.HelpChannels.max_total_channels
         prefix = constants.HelpChannels.name_prefix
 
-        log.trace(f"Getting the first {count} element names from JSON.")
+        log.trace("Getting the first %s element names from JSON.", count)
 
         with Path("bot/resources/elements.json").open(encoding="utf-8") as elements_file:
             all_names = json.load(elements_file)
@@ -309,10 +438,7 @@ class HelpChannels(commands.Cog):
         """Return channel names which are already being used."""
         log.trace("Getting channel names which are already being used.")
 
-        names = set()
-        for cat in (self.available_category, self.in_use_category, self.dormant_category):
-            for channel in self.get_category_channels(cat):
-                names.add(self.get_clean_channel_name(channel))
+        names = set(self.channel_names.values())
 
         if len(names) > MAX_CHANNELS_PER_CATEGORY:
             log.warning(
@@ -320,37 +446,45 @@ class HelpChannels(commands.Cog):
                 f"Discord only supports {MAX_CHANNELS_PER_CATEGORY} in a category."
             )
 
-        log.trace(f"Got {len(names)} used names: {names}")
+        log.trace("Got %s used names: %s", len(names), names)
         return names
 
-    @classmethod
-    async def get_idle_time(cls, channel: discord.TextChannel) -> t.Optional[int]:
+    async def get_idle_time(self, channel: discord.TextChannel) -> t.Optional[int]:
         """
         Return the time elapsed, in seconds, since the last message sent in the `channel`.
 
+        The channel's recorded activity is used if it has any; otherwise, the last message is fetched.
         Return None if the channel has no messages.
         """
-        log.trace(f"Getting the idle time for #{channel} ({channel.id}).")
-
-        msg = await cls.get_last_message(channel)
-        if not msg:
-            log.debug(f"No idle time available; #{channel} ({channel.id}) has no messages.")
-            return None
+        log.trace("Getting the idle time for #%s (%s).", channel, channel.id)
+
+        activity = self.activity.get(channel.id)
+        if activity:
+            # The channel's last message ID is sent by the gateway on startup, so it also accounts
+            # for messages sent while the bot was offline.
+            last_message_id = max(activity.last_message_id, channel.last_message_id or 0)
+            last_message_at = snowflake_time(last_message_id).replace(tzinfo=None)
+        else:
+            msg = await self.get_last_message(channel)
+            if not msg:
+                log.debug("No idle time available; #%s (%s) has no messages.", channel, channel.id)
+                return None
+            last_message_at = msg.created_at
 
-        idle_time = (datetime.utcnow() - msg.created_at).seconds
+        idle_time = (datetime.utcnow() - last_message_at).seconds
 
-        log.trace(f"#{channel} ({channel.id}) has been idle for {idle_time} seconds.")
+        log.trace("#%s (%s) has been idle for %s seconds.", channel, channel.id, idle_time)
         return idle_time
 
     @staticmethod
     async def get_last_message(channel: discord.TextChannel) -> t.Optional[discord.Message]:
         """Return the last message sent in the channel or None if no messages exist."""
-        log.trace(f"Getting the last message in #{channel} ({channel.id}).")
+        log.trace("Getting the last message in #%s (%s).", channel, channel.id)
 
         try:
             return await channel.history(limit=1).next()  # noqa: B305
         except discord.NoMoreItems:
-            log.debug(f"No last message available; #{channel} ({channel.id}) has no messages.")
+            log.debug("No last message available; #%s (%s) has no messages.", channel, channel.id)
             return None
 
     async def init_available(self) -> None:
@@ -361,17 +495,30 @@ class HelpChannels(commands.Cog):
         missing = constants.HelpChannels.max_available - len(channels)
 
         # If we've got less than `max_available` channel available, we should add some.
+        # The candidates which don't have to be waited for are all moved with a single request.
         if missing > 0:
-            log.trace(f"Moving {missing} missing channels to the Available category.")
+            log.trace("Moving %s missing channels to the Available category.", missing)
+
+            candidates = []
             for _ in range(missing):
+                channel = await self.get_available_candidate(wait=False)
+                if channel is None:
+                    break
+                candidates.append(channel)
+
+            if candidates:
+                await asyncio.gather(*(self.send_available_message(channel) for channel in candidates))
+                await self.move_to_bottom_positions(candidates, constants.Categories.help_available)
+                self.report_stats()
+
+            for _ in range(missing - len(candidates)):
                 await self.move_to_available()
 
         # If for some reason we have more than `max_available` channels available,
         # we should move the superfluous ones over to dormant.
         elif missing < 0:
-            log.trace(f"Moving {abs(missing)} superfluous available channels over to the Dormant category.")
-            for channel in channels[:abs(missing)]:
-                await self.move_to_dormant(channel, "auto")
+            log.trace("Moving %s superfluous available channels over to the Dormant category.", abs(missing))
+            await asyncio.gather(*(self.move_to_dormant(channel, "auto") for channel in channels[:abs(missing)]))
 
     async def init_categories(self) -> None:
         """Get the help category objects. Remove the cog if retrieval fails."""
@@ -394,33 +541,48 @@ class HelpChannels(commands.Cog):
 
         log.trace("Initialising the cog.")
         await self.init_categories()
+        self.index_channels()
+        await self.migrate_legacy_caches()
         await self.check_cooldowns()
 
+        self.activity = {
+            channel_id: Activity.from_json(data)
+            for channel_id, data in (await self.channel_activity.to_dict()).items()
+        }
+        self.flush_activity.start()
+
         self.channel_queue = self.create_channel_queue()
         self.name_queue = self.create_name_queue()
 
         log.trace("Moving or rescheduling in-use channels.")
-        for channel in self.get_category_channels(self.in_use_category):
-            await self.move_idle_channel(channel, has_task=False)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_INIT_MOVES)
 
-        # Prevent the command from being used until ready.
-        # The ready event wasn't used because channels could change categories between the time
-        # the command is invoked and the cog is ready (e.g. if move_idle_channel wasn't called yet).
-        # This may confuse users. So would potentially long delays for the cog to become ready.
-        self.close_command.enabled = True
+        async def handle_in_use_channel(channel: discord.TextChannel) -> None:
+            async with semaphore:
+                await self.move_idle_channel(channel, has_task=False)
+
+        # Idle in-use channels are made dormant first so they can be used to fill the Available category.
+        in_use_channels = list(self.get_category_channels(self.in_use_category))
+        await asyncio.gather(*(handle_in_use_channel(channel) for channel in in_use_channels))
 
         await self.init_available()
 
         log.info("Cog is ready!")
         self.ready.set()
 
+        # Prevent the command from being used until ready.
+        # The ready event wasn't used because channels could change categories between the time
+        # the command is invoked and the in-use channels are handled (e.g. if move_idle_channel
+        # wasn't called yet). This may confuse users.
+        self.close_command.enabled = True
+
         self.report_stats()
 
     def report_stats(self) -> None:
         """Report the channel count stats."""
-        total_in_use = sum(1 for _ in self.get_category_channels(self.in_use_category))
-        total_available = sum(1 for _ in self.get_category_channels(self.available_category))
-        total_dormant = sum(1 for _ in self.get_category_channels(self.dormant_category))
+        total_in_use = len(self.category_channels[constants.Categories.help_in_use])
+        total_available = len(self.category_channels[constants.Categories.help_available])
+        total_dormant = len(self.category_channels[constants.Categories.help_dormant])
 
         self.bot.stats.gauge("help.total.in_use", total_in_use)
         self.bot.stats.gauge("help.total.available", total_available)
@@ -455,7 +617,7 @@ class HelpChannels(commands.Cog):
         If `has_task` is True and rescheduling is required, the extant task to make the channel
         dormant will first be cancelled.
         """
-        log.trace(f"Handling in-use channel #{channel} ({channel.id}).")
+        log.trace("Handling in-use channel #%s (%s).", channel, channel.id)
 
         if not await self.is_empty(channel):
             idle_seconds = constants.HelpChannels.idle_minutes * 60
@@ -497,32 +659,43 @@ class HelpChannels(commands.Cog):
         options, see the documentation on `discord.TextChannel.edit`. While possible, position-related
         options should be avoided, as it may interfere with the category move we perform.
         """
-        # Get a fresh copy of the category from the bot to avoid the cache mismatch issue we had.
-        category = await self.try_get_channel(category_id)
-
-        payload = [{"id": c.id, "position": c.position} for c in category.channels]
-
-        # Calculate the bottom position based on the current highest position in the category. If the
-        # category is currently empty, we simply use the current position of the channel to avoid making
-        # unnecessary changes to positions in the guild.
-        bottom_position = payload[-1]["position"] + 1 if payload else channel.position
-
-        payload.append(
-            {
-                "id": channel.id,
-                "position": bottom_position,
-                "parent_id": category.id,
-                "lock_permissions": True,
-            }
-        )
-
-        # We use d.py's method to ensure our request is processed by d.py's rate limit manager
-        await self.bot.http.bulk_channel_update(category.guild.id, payload)
+        await self.move_to_bottom_positions([channel], category_id)
 
         # Now that the channel is moved, we can edit the other attributes
         if options:
             await channel.edit(**options)
 
+    async def move_to_bottom_positions(self, channels: t.Sequence[discord.TextChannel], category_id: int) -> None:
+        """
+        Move the `channels`, in order, to the bottom positions of the category with a single request.
+
+        Moves into the same category are done one at a time so that the position calculations of
+        concurrent moves don't interleave. The requests share a guild-wide rate limit anyway.
+        """
+        async with self.category_locks[category_id]:
+            # Get a fresh copy of the category from the bot to avoid the cache mismatch issue we had.
+            category = await self.try_get_channel(category_id)
+
+            payload = [{"id": c.id, "position": c.position} for c in category.channels]
+
+            # Calculate the bottom position based on the current highest position in the category. If the
+            # category is currently empty, we simply use the current position of the first channel to avoid
+            # making unnecessary changes to positions in the guild.
+            bottom_position = payload[-1]["position"] + 1 if payload else channels[0].position
+
+            for offset, channel in enumerate(channels):
+                payload.append(
+                    {
+                        "id": channel.id,
+                        "position": bottom_position + offset,
+                        "parent_id": category.id,
+                        "lock_permissions": True,
+                    }
+                )
+
+            # We use d.py's method to ensure our request is processed by d.py's rate limit manager
+            await self.bot.http.bulk_channel_update(category.guild.id, payload)
+
     async def move_to_available(self) -> None:
         """Make a channel available."""
         log.trace("Making a channel available.")
@@ -532,7 +705,7 @@ class HelpChannels(commands.Cog):
 
         await self.send_available_message(channel)
 
-        log.trace(f"Moving #{channel} ({channel.id}) to the Available category.")
+        log.trace("Moving #%s (%s) to the Available category.", channel, channel.id)
 
         await self.move_to_bottom_position(
             channel=channel,
@@ -549,7 +722,11 @@ class HelpChannels(commands.Cog):
         """
         log.info(f"Moving #{channel} ({channel.id}) to the Dormant category.")
 
-        await self.help_channel_claimants.delete(channel.id)
+        claim_data = await self.claims.pop(channel.id)
+        claim = Claim.from_json(claim_data) if claim_data is not None else None
+
+        await self.forget_activity(channel.id)
+
         await self.move_to_bottom_position(
             channel=channel,
             category_id=constants.Categories.help_dormant,
@@ -557,24 +734,22 @@ class HelpChannels(commands.Cog):
 
         self.bot.stats.incr(f"help.dormant_calls.{caller}")
 
-        in_use_time = await self.get_in_use_time(channel.id)
-        if in_use_time:
-            self.bot.stats.timing("help.in_use_time", in_use_time)
+        if claim:
+            self.bot.stats.timing("help.in_use_time", claim.in_use_time)
 
-        unanswered = await self.unanswered.get(channel.id)
-        if unanswered:
-            self.bot.stats.incr("help.sessions.unanswered")
-        elif unanswered is not None:
-            self.bot.stats.incr("help.sessions.answered")
+            if claim.unanswered:
+                self.bot.stats.incr("help.sessions.unanswered")
+            else:
+                self.bot.stats.incr("help.sessions.answered")
 
-        log.trace(f"Position of #{channel} ({channel.id}) is actually {channel.position}.")
-        log.trace(f"Sending dormant message for #{channel} ({channel.id}).")
+        log.trace("Position of #%s (%s) is actually %s.", channel, channel.id, channel.position)
+        log.trace("Sending dormant message for #%s (%s).", channel, channel.id)
         embed = discord.Embed(description=DORMANT_MSG)
         await channel.send(embed=embed)
 
-        await self.unpin(channel)
+        await self.unpin(channel, claim)
 
-        log.trace(f"Pushing #{channel} ({channel.id}) into the channel queue.")
+        log.trace("Pushing #%s (%s) into the channel queue.", channel, channel.id)
         self.channel_queue.put_nowait(channel)
         self.report_stats()
 
@@ -589,7 +764,7 @@ class HelpChannels(commands.Cog):
 
         timeout = constants.HelpChannels.idle_minutes * 60
 
-        log.trace(f"Scheduling #{channel} ({channel.id}) to become dormant in {timeout} sec.")
+        log.trace("Scheduling #%s (%s) to become dormant in %s sec.", channel, channel.id, timeout)
         self.scheduler.schedule_later(timeout, channel.id, self.move_idle_channel(channel))
         self.report_stats()
 
@@ -647,23 +822,39 @@ class HelpChannels(commands.Cog):
 
         # Confirm the channel is an in use help channel
         if self.is_in_category(channel, constants.Categories.help_in_use):
-            log.trace(f"Checking if #{channel} ({channel.id}) has been answered.")
+            log.trace("Checking if #%s (%s) has been answered.", channel, channel.id)
+
+            claim = await self.get_claim(channel.id)
+            if not claim or not claim.unanswered:
+                # The claim for this channel doesn't exist or it's already answered.
+                return
+
+            # Check the message did not come from the claimant
+            if claim.claimant_id != message.author.id:
+                # Mark the channel as answered
+                claim.unanswered = False
+                await self.claims.set(channel.id, claim.to_json())
 
-            # Check if there is an entry in unanswered
-            if await self.unanswered.contains(channel.id):
-                claimant_id = await self.help_channel_claimants.get(channel.id)
-                if not claimant_id:
-                    # The mapping for this channel doesn't exist, we can't do anything.
-                    return
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel) -> None:
+        """Add the `channel` to the index if it was created in a help category."""
+        self.update_index(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, _before: discord.abc.GuildChannel, after: discord.abc.GuildChannel) -> None:
+        """Move the `after` channel to its new category in the index."""
+        self.update_index(after)
 
-                # Check the message did not come from the claimant
-                if claimant_id != message.author.id:
-                    # Mark the channel as answered
-                    await self.unanswered.set(channel.id, False)
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        """Remove the `channel` from the index."""
+        self.update_index(channel, deleted=True)
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
         """Move an available channel to the In Use category and replace it with a dormant one."""
+        self.record_activity(message)
+
         if message.author.bot:
             return  # Ignore messages sent by bots.
 
@@ -677,76 +868,159 @@ class HelpChannels(commands.Cog):
         log.trace("Waiting for the cog to be ready before processing messages.")
         await self.ready.wait()
 
-        log.trace("Acquiring lock to prevent a channel from being processed twice...")
-        async with self.on_message_lock:
-            log.trace(f"on_message lock acquired for {message.id}.")
+        if not await self.claim_channel(message):
+            return
 
-            if not self.is_in_category(channel, constants.Categories.help_available):
-                log.debug(
-                    f"Message {message.id} will not make #{channel} ({channel.id}) in-use "
-                    f"because another message in the channel already triggered that."
-                )
-                return
+        # Move a dormant channel to the Available category to fill in the gap.
+        # This is done last and outside the lock because it may wait indefinitely for a channel to
+        # be put in the queue.
+        await self.move_to_available()
+
+    @lock_arg(NAMESPACE, "message", attrgetter("channel.id"))
+    async def claim_channel(self, message: discord.Message) -> bool:
+        """
+        Make the available channel of `message` in-use, claimed by the message's author.
 
-            log.info(f"Channel #{channel} was claimed by `{message.author.id}`.")
-            await self.move_to_in_use(channel)
-            await self.revoke_send_permissions(message.author)
+        Only one claim can be processed per channel at a time, and claims of a channel which is being
+        claimed are ignored. Claims of different channels are processed concurrently.
 
-            await self.pin(message)
+        Return True if the channel was claimed.
+        """
+        channel = message.channel
+        lock_acquired_at = time.perf_counter()
 
-            # Add user with channel for dormant check.
-            await self.help_channel_claimants.set(channel.id, message.author.id)
+        if not self.is_in_category(channel, constants.Categories.help_available):
+            log.debug(
+                "Message %s will not make #%s (%s) in-use "
+                "because another message in the channel already triggered that.",
+                message.id, channel, channel.id
+            )
+            return False
 
-            self.bot.stats.incr("help.claimed")
+        log.info(f"Channel #{channel} was claimed by `{message.author.id}`.")
+        await self.move_to_in_use(channel)
+        await self.revoke_send_permissions(message.author)
 
-            # Must use a timezone-aware datetime to ensure a correct POSIX timestamp.
-            timestamp = datetime.now(timezone.utc).timestamp()
-            await self.claim_times.set(channel.id, timestamp)
+        pinned = await self.pin_wrapper(message.id, channel, pin=True)
 
-            await self.unanswered.set(channel.id, True)
+        # Must use a timezone-aware datetime to ensure a correct POSIX timestamp.
+        claim = Claim(
+            claimant_id=message.author.id,
+            claimed_at=datetime.now(timezone.utc).timestamp(),
+            question_message_id=message.id if pinned else None,
+        )
+        await self.claims.set(channel.id, claim.to_json())
+        await self.set_activity(channel.id, Activity(message.id, last_message_id=message.id, user_messages=1))
+
+        self.bot.stats.incr("help.claimed")
+        self.bot.stats.timing("help.claim_lock", (time.perf_counter() - lock_acquired_at) * 1000)
+
+        return True
+
+    async def set_activity(self, channel_id: int, activity: Activity) -> None:
+        """Set the recorded activity of the channel with `channel_id` and persist it."""
+        self.activity[channel_id] = activity
+        self.changed_activity.discard(channel_id)
+        await self.channel_activity.set(channel_id, activity.to_json())
+
+    async def forget_activity(self, channel_id: int) -> None:
+        """Stop tracking the activity of the channel with `channel_id`."""
+        self.changed_activity.discard(channel_id)
+        if self.activity.pop(channel_id, None):
+            await self.channel_activity.delete(channel_id)
+
+    def record_activity(self, message: discord.Message) -> None:
+        """Record `message` in the activity of its channel if the channel's activity is being tracked."""
+        activity = self.activity.get(message.channel.id)
+        if activity is None:
+            return
 
-            log.trace(f"Releasing on_message lock for {message.id}.")
+        activity.last_message_id = max(activity.last_message_id, message.id)
+        if not message.author.bot:
+            activity.user_messages += 1
 
-        # Move a dormant channel to the Available category to fill in the gap.
-        # This is done last and outside the lock because it may wait indefinitely for a channel to
-        # be put in the queue.
-        await self.move_to_available()
+        self.changed_activity.add(message.channel.id)
+
+    async def persist_activity(self) -> None:
+        """Persist the activity of the channels whose activity changed since it was last persisted."""
+        changed = {
+            channel_id: self.activity[channel_id].to_json()
+            for channel_id in self.changed_activity
+            if channel_id in self.activity
+        }
+        self.changed_activity.clear()
+
+        if changed:
+            log.trace("Persisting the activity of %s help channels.", len(changed))
+            await self.channel_activity.update(changed)
+
+    @tasks.loop(seconds=ACTIVITY_FLUSH_SECONDS)
+    async def flush_activity(self) -> None:
+        """Periodically persist the changed activity of the in-use channels."""
+        await self.persist_activity()
+
+    @flush_activity.after_loop
+    async def flush_remaining_activity(self) -> None:
+        """Persist the activity which changed since the last flush once the flush task stops."""
+        await self.persist_activity()
 
     @commands.Cog.listener()
-    async def on_message_delete(self, msg: discord.Message) -> None:
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
         """
         Reschedule an in-use channel to become dormant sooner if the channel is empty.
 
         The new time for the dormant task is configured with `HelpChannels.deleted_idle_minutes`.
         """
-        if not self.is_in_category(msg.channel, constants.Categories.help_in_use):
+        if payload.channel_id not in self.category_channels[constants.Categories.help_in_use]:
             return
 
-        if not await self.is_empty(msg.channel):
+        activity = self.activity.get(payload.channel_id)
+        message = payload.cached_message
+
+        if activity and message:
+            if message.author.bot or message.id < activity.claim_message_id:
+                return
+
+            activity.user_messages -= 1
+            self.changed_activity.add(payload.channel_id)
+        elif activity:
+            # The author of a message which isn't cached is unknown, so the history has to be read instead.
+            await self.forget_activity(payload.channel_id)
+
+        channel = self.bot.get_channel(payload.channel_id)
+        if not await self.is_empty(channel):
             return
 
-        log.info(f"Claimant of #{msg.channel} ({msg.author}) deleted message, channel is empty now. Rescheduling task.")
+        log.info(f"A message was deleted in #{channel} ({channel.id}) and it's empty now. Rescheduling task.")
 
         # Cancel existing dormant task before scheduling new.
-        self.scheduler.cancel(msg.channel.id)
+        self.scheduler.cancel(channel.id)
 
         delay = constants.HelpChannels.deleted_idle_minutes * 60
-        self.scheduler.schedule_later(delay, msg.channel.id, self.move_idle_channel(msg.channel))
+        self.scheduler.schedule_later(delay, channel.id, self.move_idle_channel(channel))
 
     async def is_empty(self, channel: discord.TextChannel) -> bool:
-        """Return True if there's an AVAILABLE_MSG and the messages leading up are bot messages."""
-        log.trace(f"Checking if #{channel} ({channel.id}) is empty.")
+        """
+        Return True if there's an AVAILABLE_MSG and the messages leading up are bot messages.
+
+        The channel's recorded activity is used if it has any; otherwise, its history is read.
+        """
+        log.trace("Checking if #%s (%s) is empty.", channel, channel.id)
+
+        activity = self.activity.get(channel.id)
+        if activity:
+            return activity.user_messages <= 0
 
         # A limit of 100 results in a single API call.
         # If AVAILABLE_MSG isn't found within 100 messages, then assume the channel is not empty.
         # Not gonna do an extensive search for it cause it's too expensive.
         async for msg in channel.history(limit=100):
             if not msg.author.bot:
-                log.trace(f"#{channel} ({channel.id}) has a non-bot message.")
+                log.trace("#%s (%s) has a non-bot message.", channel, channel.id)
                 return False
 
             if self.match_bot_embed(msg, AVAILABLE_MSG):
-                log.trace(f"#{channel} ({channel.id}) has the available message embed.")
+                log.trace("#%s (%s) has the available message embed.", channel, channel.id)
                 return True
 
         return False
@@ -757,17 +1031,17 @@ class HelpChannels(commands.Cog):
         guild = self.bot.get_guild(constants.Guild.id)
         cooldown = constants.HelpChannels.claim_minutes * 60
 
-        for channel_id, member_id in await self.help_channel_claimants.items():
-            member = guild.get_member(member_id)
+        # All claims are loaded in a single round trip.
+        for claim_data in (await self.claims.to_dict()).values():
+            claim = Claim.from_json(claim_data)
+            member = guild.get_member(claim.claimant_id)
             if not member:
                 continue  # Member probably left the guild.
 
-            in_use_time = await self.get_in_use_time(channel_id)
+            in_use_time = claim.in_use_time
 
-            if not in_use_time or in_use_time.seconds > cooldown:
-                # Remove the role if no claim time could be retrieved or if the cooldown expired.
-                # Since the channel is in the claimants cache, it is definitely strange for a time
-                # to not exist. However, it isn't a reason to keep the user stuck with a cooldown.
+            if in_use_time.seconds > cooldown:
+                # Remove the role if the cooldown expired.
                 await self.remove_cooldown_role(member)
             else:
                 # The member is still on a cooldown; re-schedule it for the remaining time.
@@ -776,12 +1050,12 @@ class HelpChannels(commands.Cog):
 
     async def add_cooldown_role(self, member: discord.Member) -> None:
         """Add the help cooldown role to `member`."""
-        log.trace(f"Adding cooldown role for {member} ({member.id}).")
+        log.trace("Adding cooldown role for %s (%s).", member, member.id)
         await self._change_cooldown_role(member, member.add_roles)
 
     async def remove_cooldown_role(self, member: discord.Member) -> None:
         """Remove the help cooldown role from `member`."""
-        log.trace(f"Removing cooldown role for {member} ({member.id}).")
+        log.trace("Removing cooldown role for %s (%s).", member, member.id)
         await self._change_cooldown_role(member, member.remove_roles)
 
     async def _change_cooldown_role(self, member: discord.Member, coro_func: CoroutineFunc) -> None:
@@ -799,11 +1073,10 @@ class HelpChannels(commands.Cog):
         try:
             await coro_func(role)
         except discord.NotFound:
-            log.debug(f"Failed to change role for {member} ({member.id}): member not found")
+            log.debug("Failed to change role for %s (%s): member not found", member, member.id)
         except discord.Forbidden:
             log.debug(
-                f"Forbidden to change role for {member} ({member.id}); "
-                f"possibly due to role hierarchy"
+                "Forbidden to change role for %s (%s); possibly due to role hierarchy", member, member.id
             )
         except discord.HTTPException as e:
             log.error(f"Failed to change role for {member} ({member.id}): {e.status} {e.code}")
@@ -816,7 +1089,7 @@ class HelpChannels(commands.Cog):
         `HelpChannels.claim_minutes`.
         """
         log.trace(
-            f"Revoking {member}'s ({member.id}) send message permissions in the Available category."
+            "Revoking %s's (%s) send message permissions in the Available category.", member, member.id
         )
 
         await self.add_cooldown_role(member)
@@ -832,28 +1105,28 @@ class HelpChannels(commands.Cog):
     async def send_available_message(self, channel: discord.TextChannel) -> None:
         """Send the available message by editing a dormant message or sending a new message."""
         channel_info = f"#{channel} ({channel.id})"
-        log.trace(f"Sending available message in {channel_info}.")
+        log.trace("Sending available message in %s.", channel_info)
 
         embed = discord.Embed(description=AVAILABLE_MSG)
 
         msg = await self.get_last_message(channel)
         if self.match_bot_embed(msg, DORMANT_MSG):
-            log.trace(f"Found dormant message {msg.id} in {channel_info}; editing it.")
+            log.trace("Found dormant message %s in %s; editing it.", msg.id, channel_info)
             await msg.edit(embed=embed)
         else:
-            log.trace(f"Dormant message not found in {channel_info}; sending a new message.")
+            log.trace("Dormant message not found in %s; sending a new message.", channel_info)
             await channel.send(embed=embed)
 
     async def try_get_channel(self, channel_id: int) -> discord.abc.GuildChannel:
         """Attempt to get or fetch a channel and return it."""
-        log.trace(f"Getting the channel {channel_id}.")
+        log.trace("Getting the channel %s.", channel_id)
 
         channel = self.bot.get_channel(channel_id)
         if not channel:
-            log.debug(f"Channel {channel_id} is not in cache; fetching from API.")
+            log.debug("Channel %s is not in cache; fetching from API.", channel_id)
             channel = await self.bot.fetch_channel(channel_id)
 
-        log.trace(f"Channel #{channel} ({channel_id}) retrieved.")
+        log.trace("Channel #%s (%s) retrieved.", channel, channel_id)
         return channel
 
     async def pin_wrapper(self, msg_id: int, channel: discord.TextChannel, *, pin: bool) -> bool:
@@ -874,28 +1147,22 @@ class HelpChannels(commands.Cog):
             await func(channel.id, msg_id)
         except discord.HTTPException as e:
             if e.code == 10008:
-                log.debug(f"Message {msg_id} in {channel_str} doesn't exist; can't {verb}.")
+                log.debug("Message %s in %s doesn't exist; can't %s.", msg_id, channel_str, verb)
             else:
                 log.exception(
                     f"Error {verb}ning message {msg_id} in {channel_str}: {e.status} ({e.code})"
                 )
             return False
         else:
-            log.trace(f"{verb.capitalize()}ned message {msg_id} in {channel_str}.")
+            log.trace("%sned message %s in %s.", verb.capitalize(), msg_id, channel_str)
             return True
 
-    async def pin(self, message: discord.Message) -> None:
-        """Pin an initial question `message` and store it in a cache."""
-        if await self.pin_wrapper(message.id, message.channel, pin=True):
-            await self.question_messages.set(message.channel.id, message.id)
-
-    async def unpin(self, channel: discord.TextChannel) -> None:
-        """Unpin the initial question message sent in `channel`."""
-        msg_id = await self.question_messages.pop(channel.id)
-        if msg_id is None:
-            log.debug(f"#{channel} ({channel.id}) doesn't have a message pinned.")
+    async def unpin(self, channel: discord.TextChannel, claim: t.Optional[Claim]) -> None:
+        """Unpin the initial question message of the `claim` of `channel`."""
+        if claim is None or claim.question_message_id is None:
+            log.debug("#%s (%s) doesn't have a message pinned.", channel, channel.id)
         else:
-            await self.pin_wrapper(msg_id, channel, pin=False)
+            await self.pin_wrapper(claim.question_message_id, channel, pin=False)
 
     async def wait_for_dormant_channel(self) -> discord.TextChannel:
         """Wait for a dormant channel to become available in the queue and return it."""
@@ -905,7 +1172,7 @@ class HelpChannels(commands.Cog):
         self.queue_tasks.append(task)
         channel = await task
 
-        log.trace(f"Channel #{channel} ({channel.id}) finally retrieved from the queue.")
+        log.trace("Channel #%s (%s) finally retrieved from the queue.", channel, channel.id)
         self.queue_tasks.remove(task)
 
         return channel
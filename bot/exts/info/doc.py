@@ -6,16 +6,12 @@ import textwrap
 from collections import OrderedDict
 from contextlib import suppress
 from types import SimpleNamespace
-from typing import Any, Callable, Optional, Tuple
+from typing import Any, Callable, Optional, TYPE_CHECKING, Tuple
 
 import discord
-from bs4 import BeautifulSoup
-from bs4.element import PageElement, Tag
 from discord.errors import NotFound
 from discord.ext import commands
-from markdownify import MarkdownConverter
 from requests import ConnectTimeout, ConnectionError, HTTPError
-from sphinx.ext import intersphinx
 from urllib3.exceptions import ProtocolError
 
 from bot.bot import Bot
@@ -24,6 +20,10 @@ from bot.converters import ValidPythonIdentifier, ValidURL
 from bot.pagination import LinePaginator
 from bot.utils.messages import wait_for_deletion
 
+if TYPE_CHECKING:
+    from bs4.element import Tag
+    from markdownify import MarkdownConverter
+
 
 log = logging.getLogger(__name__)
 logging.getLogger('urllib3').setLevel(logging.WARNING)
@@ -95,22 +95,34 @@ def async_cache(max_size: int = 128, arg_offset: int = 0) -> Callable:
     return decorator
 
 
-class DocMarkdownConverter(MarkdownConverter):
-    """Subclass markdownify's MarkdownCoverter to provide custom conversion methods."""
+@functools.lru_cache(maxsize=None)
+def _get_markdown_converter() -> "MarkdownConverter":
+    """
+    Return the converter used to convert documentation HTML to Markdown.
+
+    markdownify, like bs4 and sphinx, is slow to import, so it's only imported once it's first used
+    to keep it from delaying the bot's startup.
+    """
+    from markdownify import MarkdownConverter
+
+    class DocMarkdownConverter(MarkdownConverter):
+        """Subclass markdownify's MarkdownCoverter to provide custom conversion methods."""
 
-    def convert_code(self, el: PageElement, text: str) -> str:
-        """Undo `markdownify`s underscore escaping."""
-        return f"`{text}`".replace('\\', '')
+        def convert_code(self, el: "Tag", text: str) -> str:
+            """Undo `markdownify`s underscore escaping."""
+            return f"`{text}`".replace('\\', '')
 
-    def convert_pre(self, el: PageElement, text: str) -> str:
-        """Wrap any codeblocks in `py` for syntax highlighting."""
-        code = ''.join(el.strings)
-        return f"```py\n{code}```"
+        def convert_pre(self, el: "Tag", text: str) -> str:
+            """Wrap any codeblocks in `py` for syntax highlighting."""
+            code = ''.join(el.strings)
+            return f"```py\n{code}```"
 
+    return DocMarkdownConverter(bullets='•')
 
-def markdownify(html: str) -> DocMarkdownConverter:
-    """Create a DocMarkdownConverter object from the input html."""
-    return DocMarkdownConverter(bullets='•').convert(html)
+
+def markdownify(html: str) -> str:
+    """Convert the input html to Markdown."""
+    return _get_markdown_converter().convert(html)
 
 
 class InventoryURL(commands.Converter):
@@ -126,6 +138,8 @@ class InventoryURL(commands.Converter):
     @staticmethod
     async def convert(ctx: commands.Context, url: str) -> str:
         """Convert url to Intersphinx inventory URL."""
+        from sphinx.ext import intersphinx
+
         try:
             intersphinx.fetch_inventory(SPHINX_MOCK_APP, '', url)
         except AttributeError:
@@ -243,6 +257,8 @@ class Doc(commands.Cog):
         async with self.bot.http_session.get(url) as response:
             html = await response.text(encoding='utf-8')
 
+        from bs4 import BeautifulSoup
+
         # Find the signature header and parse the relevant parts.
         symbol_id = url.split('#')[-1]
         soup = BeautifulSoup(html, 'lxml')
@@ -472,6 +488,8 @@ class Doc(commands.Cog):
 
     async def _fetch_inventory(self, inventory_url: str) -> Optional[dict]:
         """Get and return inventory from `inventory_url`. If fetching fails, return None."""
+        from sphinx.ext import intersphinx
+
         fetch_func = functools.partial(intersphinx.fetch_inventory, SPHINX_MOCK_APP, '', inventory_url)
         for retry in range(1, FAILED_REQUEST_RETRY_AMOUNT+1):
             try:
@@ -498,7 +516,7 @@ class Doc(commands.Cog):
         return None
 
     @staticmethod
-    def _match_end_tag(tag: Tag) -> bool:
+    def _match_end_tag(tag: "Tag") -> bool:
         """Matches `tag` if its class value is in `SEARCH_END_TAG_ATTRS` or the tag is table."""
         for attr in SEARCH_END_TAG_ATTRS:
             if attr in tag.get("class", ()):
@@ -3,8 +3,6 @@ import typing as t
 from datetime import date, datetime
 
 import discord
-import feedparser
-from bs4 import BeautifulSoup
 from discord.ext.commands import Cog
 from discord.ext.tasks import loop
 
@@ -74,6 +72,9 @@ class PythonNews(Cog):
 
     async def post_pep_news(self) -> None:
         """Fetch new PEPs and when they don't have announcement in #python-news, create it."""
+        # Imported here to keep feedparser from delaying the bot's startup.
+        import feedparser
+
         # Wait until everything is ready and http_session available
         await self.bot.wait_until_guild_available()
         await self.sync_maillists()
@@ -130,6 +131,9 @@ class PythonNews(Cog):
 
     async def post_maillist_news(self) -> None:
         """Send new maillist threads to #python-news that is listed in configuration."""
+        # Imported here to keep bs4 from delaying the bot's startup.
+        from bs4 import BeautifulSoup
+
         await self.bot.wait_until_guild_available()
         await self.sync_maillists()
         existing_news = await self.bot.api_client.get("bot/bot-settings/news")
@@ -1,8 +1,9 @@
 import logging
 import re
 import time
+from collections import defaultdict
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from discord import Colour, Embed, Member
 from discord.ext.commands import Cog, Context, group
@@ -21,7 +22,11 @@ TEST_CHANNELS = (
 )
 
 REGEX_NON_ALPHABET = re.compile(r"[^a-z]", re.MULTILINE & re.IGNORECASE)
+REGEX_WORD = re.compile(r"\w+")
+TAGS_PATH = Path("bot", "resources", "tags")
 FOOTER_TEXT = f"To show a tag, type {constants.Bot.prefix}tags <tagname>."
+# Seconds after which the tag files are checked for changes again when a tag command is used
+TAGS_RELOAD_INTERVAL = 60
 
 
 class Tags(Cog):
@@ -30,63 +35,130 @@ class Tags(Cog):
     def __init__(self, bot: Bot):
         self.bot = bot
         self.tag_cooldowns = {}
-        self._cache = self.get_tags()
+
+        self._cache: Dict[str, dict] = {}
+        # Modification times and titles of the loaded tag files
+        self._files: Dict[Path, Tuple[float, str]] = {}
+        # Casefolded contents and alphabetic parts of the titles of tags, by their titles
+        self._contents: Dict[str, str] = {}
+        self._title_parts: Dict[str, List[str]] = {}
+        # Titles of the tags containing each word, and the sorted indexed words
+        self._word_index: Dict[str, Set[str]] = defaultdict(set)
+        self._words: List[str] = []
+        self._last_reload = 0.0
+
+        self.get_tags()
+
+    def get_tags(self) -> None:
+        """Load new and modified tag files into the cache, and remove the tags of deleted files."""
+        found_files = set()
+
+        for file in TAGS_PATH.glob("**/*"):
+            if not file.is_file():
+                continue
+
+            found_files.add(file)
+            mtime = file.stat().st_mtime
+            if file in self._files:
+                loaded_mtime, title = self._files[file]
+                if mtime == loaded_mtime:
+                    continue
+                self._remove_tag(title)
+
+            log.trace(f"Loading tag file {file}")
+            tag = self._read_tag(file)
+            self._files[file] = (mtime, tag["title"])
+            self._add_tag(tag)
+
+        for file in self._files.keys() - found_files:
+            log.trace(f"Removing tag of deleted file {file}")
+            _, title = self._files.pop(file)
+            self._remove_tag(title)
+
+        self._words = sorted(self._word_index)
+        self._last_reload = time.monotonic()
+
+    def reload_tags_if_due(self) -> None:
+        """Reload the tag files if they weren't checked for changes in the last `TAGS_RELOAD_INTERVAL` seconds."""
+        if time.monotonic() - self._last_reload >= TAGS_RELOAD_INTERVAL:
+            self.get_tags()
+
+    @staticmethod
+    def _read_tag(file: Path) -> dict:
+        """Read the tag in `file`."""
+        tag = {
+            "title": file.stem,
+            "embed": {
+                "description": file.read_text(encoding="utf8"),
+            },
+            "restricted_to": "developers",
+            "location": f"/bot/{file}"
+        }
+
+        # Convert to a list to allow negative indexing.
+        parents = list(file.relative_to(TAGS_PATH).parents)
+        if len(parents) > 1:
+            # -1 would be '.' hence -2 is used as the index.
+            tag["restricted_to"] = parents[-2].name
+
+        return tag
+
+    def _add_tag(self, tag: dict) -> None:
+        """Add `tag` to the cache and the search indices."""
+        title = tag["title"]
+        content = tag["embed"]["description"].casefold()
+
+        self._cache[title] = tag
+        self._contents[title] = content
+        self._title_parts[title] = REGEX_NON_ALPHABET.split(title.lower())
+        for word in set(REGEX_WORD.findall(content)):
+            self._word_index[word].add(title)
+
+    def _remove_tag(self, title: str) -> None:
+        """Remove the tag with `title` from the cache and the search indices."""
+        self._cache.pop(title, None)
+        self._title_parts.pop(title, None)
+        for word in set(REGEX_WORD.findall(self._contents.pop(title, ""))):
+            self._word_index[word].discard(title)
+            if not self._word_index[word]:
+                del self._word_index[word]
 
     @staticmethod
-    def get_tags() -> dict:
-        """Get all tags."""
-        cache = {}
-
-        base_path = Path("bot", "resources", "tags")
-        for file in base_path.glob("**/*"):
-            if file.is_file():
-                tag_title = file.stem
-                tag = {
-                    "title": tag_title,
-                    "embed": {
-                        "description": file.read_text(encoding="utf8"),
-                    },
-                    "restricted_to": "developers",
-                    "location": f"/bot/{file}"
-                }
-
-                # Convert to a list to allow negative indexing.
-                parents = list(file.relative_to(base_path).parents)
-                if len(parents) > 1:
-                    # -1 would be '.' hence -2 is used as the index.
-                    tag["restricted_to"] = parents[-2].name
-
-                cache[tag_title] = tag
-
-        return cache
+    def get_role_names(user: Member) -> Set[str]:
+        """Return the lowercased names of the roles of `user`, to check their access to tags with."""
+        return {role.name.lower() for role in user.roles}
 
     @staticmethod
-    def check_accessibility(user: Member, tag: dict) -> bool:
-        """Check if user can access a tag."""
-        return tag["restricted_to"].lower() in [role.name.lower() for role in user.roles]
+    def check_accessibility(role_names: Set[str], tag: dict) -> bool:
+        """Check if a user with the roles in `role_names` can access a tag."""
+        return tag["restricted_to"].lower() in role_names
 
     @staticmethod
-    def _fuzzy_search(search: str, target: str) -> float:
-        """A simple scoring algorithm based on how many letters are found / total, with order in mind."""
+    def _fuzzy_search(search: str, target_parts: List[str]) -> float:
+        """
+        A simple scoring algorithm based on how many letters are found / total, with order in mind.
+
+        `search` must only contain lowercase letters, `target_parts` are the lowercase alphabetic parts of the target.
+        """
         current, index = 0, 0
-        _search = REGEX_NON_ALPHABET.sub('', search.lower())
-        _targets = iter(REGEX_NON_ALPHABET.split(target.lower()))
+        _targets = iter(target_parts)
         _target = next(_targets)
         try:
             while True:
-                while index < len(_target) and _search[current] == _target[index]:
+                while index < len(_target) and search[current] == _target[index]:
                     current += 1
                     index += 1
                 index, _target = 0, next(_targets)
         except (StopIteration, IndexError):
             pass
-        return current / len(_search) * 100
+        return current / len(search) * 100
 
     def _get_suggestions(self, tag_name: str, thresholds: Optional[List[int]] = None) -> List[str]:
         """Return a list of suggested tags."""
+        search = REGEX_NON_ALPHABET.sub('', tag_name.lower())
         scores: Dict[str, int] = {
-            tag_title: Tags._fuzzy_search(tag_name, tag['title'])
-            for tag_title, tag in self._cache.items()
+            tag_title: Tags._fuzzy_search(search, title_parts)
+            for tag_title, title_parts in self._title_parts.items()
         }
 
         thresholds = thresholds or [100, 90, 80, 70, 60]
@@ -109,6 +181,22 @@ class Tags(Cog):
             return self._get_suggestions(tag_name)
         return found
 
+    def _find_words(self, keyword_word: str) -> List[str]:
+        """Return the indexed words containing `keyword_word`."""
+        return [word for word in self._words if keyword_word in word]
+
+    def _get_candidates(self, keyword: str) -> Set[str]:
+        """
+        Return the titles of the tags which may contain `keyword`.
+
+        Each word of `keyword` has to be a part of a word in the tag's content. The tags still need to be
+        checked for the whole keyword, as its words may be in the wrong order or separated.
+        """
+        candidates = set(self._cache)
+        for keyword_word in REGEX_WORD.findall(keyword):
+            candidates &= set().union(*(self._word_index[word] for word in self._find_words(keyword_word)))
+        return candidates
+
     def _get_tags_via_content(self, check: Callable[[Iterable], bool], keywords: str, user: Member) -> list:
         """
         Search for tags via contents.
@@ -128,10 +216,21 @@ class Tags(Cog):
             # in that case, we simply want to search for such keywords directly instead.
             keywords_processed = [keywords]
 
+        # Narrow down the tags with the word index if we know how `check` combines the keywords
+        if check is all:
+            candidates = set.intersection(*(self._get_candidates(query) for query in keywords_processed))
+        elif check is any:
+            candidates = set.union(*(self._get_candidates(query) for query in keywords_processed))
+        else:
+            candidates = self._cache.keys()
+
+        role_names = self.get_role_names(user)
         matching_tags = []
-        for tag in self._cache.values():
-            matches = (query in tag['embed']['description'].casefold() for query in keywords_processed)
-            if self.check_accessibility(user, tag) and check(matches):
+        for title, tag in self._cache.items():
+            if title not in candidates or not self.check_accessibility(role_names, tag):
+                continue
+            matches = (query in self._contents[title] for query in keywords_processed)
+            if check(matches):
                 matching_tags.append(tag)
 
         return matching_tags
@@ -169,6 +268,7 @@ class Tags(Cog):
 
         Only search for tags that has ALL the keywords.
         """
+        self.reload_tags_if_due()
         matching_tags = self._get_tags_via_content(all, keywords, ctx.author)
         await self._send_matching_tags(ctx, keywords, matching_tags)
 
@@ -179,6 +279,7 @@ class Tags(Cog):
 
         Search for tags that has ANY of the keywords.
         """
+        self.reload_tags_if_due()
         matching_tags = self._get_tags_via_content(any, keywords or 'any', ctx.author)
         await self._send_matching_tags(ctx, keywords, matching_tags)
 
@@ -214,13 +315,16 @@ class Tags(Cog):
             )
             return
 
+        self.reload_tags_if_due()
+        role_names = self.get_role_names(ctx.author)
+
         if tag_name is not None:
             temp_founds = self._get_tag(tag_name)
 
             founds = []
 
             for found_tag in temp_founds:
-                if self.check_accessibility(ctx.author, found_tag):
+                if self.check_accessibility(role_names, found_tag):
                     founds.append(found_tag)
 
             if len(founds) == 1:
@@ -262,7 +366,7 @@ class Tags(Cog):
                 await LinePaginator.paginate(
                     sorted(
                         f"**»**   {tag['title']}" for tag in tags
-                        if self.check_accessibility(ctx.author, tag)
+                        if self.check_accessibility(role_names, tag)
                     ),
                     ctx,
                     embed,
@@ -5,10 +5,12 @@ from datetime import datetime
 from enum import Enum
 
 import discord
+from async_rediscache import RedisCache
 from discord.ext.commands import Cog
 
 from bot.bot import Bot
 from bot.constants import Channels, Colours, Emojis, Guild, Webhooks
+from bot.utils.bulk import BulkExecutor
 from bot.utils.messages import sub_clyde
 
 log = logging.getLogger(__name__)
@@ -18,8 +20,9 @@ log = logging.getLogger(__name__)
 # something has likely gone very wrong
 CRAWL_LIMIT = 50
 
-# Seconds for `crawl_task` to sleep after adding reactions to a message
-CRAWL_SLEEP = 2
+# Amount of messages for `crawl_task` to add signals to at once - discord.py paces the requests
+# by the rate limit of the reaction endpoint, so this only needs to keep its bucket saturated
+CRAWL_CONCURRENCY = 5
 
 
 class Signal(Enum):
@@ -154,6 +157,7 @@ class Incidents(Cog):
 
     On start-up:
         * Crawl #incidents and add missing `Signal` emoji where appropriate
+        * Only messages sent after the last signalled incident are crawled
         * This is to retro-actively add the available options for messages which
           were sent while the bot wasn't listening
         * Pinned messages and message starting with # do not qualify as incidents
@@ -178,10 +182,19 @@ class Incidents(Cog):
     Please refer to function docstrings for implementation details.
     """
 
+    # RedisCache["last_signalled", message.id]
+    # The id of the newest incident up to which all incidents have their signals
+    crawl_state = RedisCache()
+
     def __init__(self, bot: Bot) -> None:
         """Prepare `event_lock` and schedule `crawl_task` on start-up."""
         self.bot = bot
 
+        self.last_signalled: t.Optional[int] = None
+        # Incidents which failed to receive their signals; the mark isn't advanced past them
+        self.failed_incidents: t.Set[int] = set()
+        self.bulk_executor = BulkExecutor(self.__class__.__name__)
+
         self.event_lock = asyncio.Lock()
         self.crawl_task = self.bot.loop.create_task(self.crawl_incidents())
 
@@ -190,32 +203,86 @@ class Incidents(Cog):
         Crawl #incidents and add missing emoji where necessary.
 
         This is to catch-up should an incident be reported while the bot wasn't listening.
-        After adding each reaction, we take a short break to avoid drowning in ratelimits.
+
+        Only messages sent after the `last_signalled` message are crawled, or the most recent
+        messages if it isn't known yet. Signals are added to the incidents which lack them
+        concurrently, with discord.py pacing the requests by the endpoint's rate limit.
+        The `last_signalled` mark is then advanced over the crawled messages, up until the first
+        incident which failed to receive its signals, so that it's crawled again on the next start.
 
         Once this task is scheduled, listeners that change messages should await it.
         The crawl assumes that the channel history doesn't change as we go over it.
 
-        Behaviour is configured by: `CRAWL_LIMIT`, `CRAWL_SLEEP`.
+        Behaviour is configured by: `CRAWL_LIMIT`, `CRAWL_CONCURRENCY`.
         """
         await self.bot.wait_until_guild_available()
         incidents: discord.TextChannel = self.bot.get_channel(Channels.incidents)
 
-        log.debug(f"Crawling messages in #incidents: {CRAWL_LIMIT=}, {CRAWL_SLEEP=}")
-        async for message in incidents.history(limit=CRAWL_LIMIT):
+        self.last_signalled = await self.crawl_state.get("last_signalled")
+        after = discord.Object(self.last_signalled) if self.last_signalled else None
 
+        log.debug(f"Crawling messages in #incidents: {CRAWL_LIMIT=}, {self.last_signalled=}")
+        messages = [message async for message in incidents.history(limit=CRAWL_LIMIT, after=after)]
+        messages.sort(key=lambda message: message.id)
+
+        if len(messages) == CRAWL_LIMIT and after is not None:
+            log.warning(f"More than {CRAWL_LIMIT} messages were sent to #incidents since the last crawl")
+
+        unsignalled = []
+        for message in messages:
             if not is_incident(message):
                 log.trace(f"Skipping message {message.id}: not an incident")
-                continue
-
-            if has_signals(message):
+            elif has_signals(message):
                 log.trace(f"Skipping message {message.id}: already has all signals")
-                continue
-
-            await add_signals(message)
-            await asyncio.sleep(CRAWL_SLEEP)
+            else:
+                unsignalled.append(message)
+
+        signalled = set()
+
+        async def signal(incident: discord.Message) -> None:
+            try:
+                await add_signals(incident)
+            except discord.NotFound:
+                # A deleted incident doesn't need signals, so it mustn't hold the mark back
+                log.trace(f"Incident {incident.id} was deleted before it received its signals")
+            signalled.add(incident.id)
+
+        if unsignalled:
+            result = await self.bulk_executor.run(unsignalled, signal, CRAWL_CONCURRENCY)
+            if result.exception is not None:
+                log.error("Crawl task failed to add signals", exc_info=result.exception)
+
+        failed = {message.id for message in unsignalled} - signalled
+        self.failed_incidents.update(failed)
+        crawled = None
+        for message in messages:
+            if message.id in failed:
+                log.info(f"Failed to add signals to incident {message.id}, it will be crawled on the next start")
+                break
+            crawled = message.id
+
+        if crawled is not None:
+            await self.advance_last_signalled(crawled)
 
         log.debug("Crawl task finished!")
 
+    async def advance_last_signalled(self, message_id: int) -> None:
+        """
+        Persist `message_id` as the `last_signalled` message if it is newer than the current one.
+
+        The mark isn't advanced past an incident which failed to receive its signals, so that the
+        incident is crawled again on the next start.
+        """
+        if self.last_signalled is not None and message_id <= self.last_signalled:
+            return
+
+        if self.failed_incidents and message_id > min(self.failed_incidents):
+            log.trace(f"Not advancing the last signalled message to {message_id}: an earlier incident failed")
+            return
+
+        self.last_signalled = message_id
+        await self.crawl_state.set("last_signalled", message_id)
+
     async def archive(self, incident: discord.Message, outcome: Signal, actioned_by: discord.Member) -> bool:
         """
         Relay an embed representation of `incident` to the #incidents-archive channel.
@@ -402,9 +469,32 @@ class Incidents(Cog):
 
     @Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
-        """Pass `message` to `add_signals` if and only if it satisfies `is_incident`."""
+        """
+        Pass `message` to `add_signals` if and only if it satisfies `is_incident`.
+
+        Once the crawl has finished, `message` then becomes the `last_signalled` message.
+        Until then, the mark is left for the crawl to advance over the messages it handles.
+        If adding the signals fails, the mark is kept before `message` for the next crawl,
+        unless it failed because `message` was already deleted.
+        """
         if is_incident(message):
-            await add_signals(message)
+            try:
+                await add_signals(message)
+            except discord.NotFound:
+                log.trace(f"Incident {message.id} was deleted before it received its signals")
+            except Exception:
+                self.failed_incidents.add(message.id)
+                raise
+
+            if self.crawl_task.done():
+                await self.advance_last_signalled(message.id)
+
+    @Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        """Stop holding the `last_signalled` mark back for an incident which failed to get signals once it's deleted."""
+        if payload.message_id in self.failed_incidents:
+            log.trace(f"Failed incident {payload.message_id} was deleted, it no longer holds the mark back")
+            self.failed_incidents.discard(payload.message_id)
 
 
 def setup(bot: Bot) -> None:
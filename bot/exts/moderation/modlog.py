@@ -1,10 +1,13 @@
 import asyncio
+import collections.abc
 import difflib
-import itertools
+import json
 import logging
+import textwrap
+import time
 import typing as t
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime
-from itertools import zip_longest
 
 import discord
 from dateutil.relativedelta import relativedelta
@@ -14,7 +17,9 @@ from discord.abc import GuildChannel
 from discord.ext.commands import Cog, Context
 
 from bot.bot import Bot
-from bot.constants import Categories, Channels, Colours, Emojis, Event, Guild as GuildConstant, Icons, URLs
+from bot.constants import (
+    Categories, Channels, Colours, Emojis, Event, Guild as GuildConstant, Icons, URLs
+)
 from bot.utils.messages import format_user
 from bot.utils.time import humanize_delta
 
@@ -32,53 +37,141 @@ VOICE_STATE_ATTRIBUTES = {
     "self_video": "Broadcasting",
 }
 
+# Edits with more words than this aren't diffed; the contents are shortened to the width instead.
+EDIT_DIFF_WORD_LIMIT = 300
+EDIT_DIFF_SHORTEN_WIDTH = 800
+
+# Seconds after which an ignored ID expires if the event it was ignored for never arrived.
+IGNORED_EVENT_TTL = 10 * 60
+
+
+class LogEntry(t.NamedTuple):
+    """A log message waiting in a channel's outgoing queue."""
+
+    content: t.Optional[str]
+    embed: t.Optional[discord.Embed]
+    files: t.Optional[t.List[discord.File]]
+    allowed_mentions: t.Optional[discord.AllowedMentions]
+    future: asyncio.Future
+    enqueued_at: float
+
+
+async def _aiter(iterable: t.Iterable) -> t.AsyncIterator:
+    """Asynchronously yield the items of the synchronous `iterable`."""
+    for item in iterable:
+        yield item
+
+
+class IgnoredEvents:
+    """
+    A registry of IDs for which the next emission of an event should be suppressed.
+
+    Each ID expires `ttl` seconds after it was last ignored. Adding, checking, and expiring IDs are
+    all O(1) per ID, since IDs are kept in order of expiry.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._ignored: t.Dict[Event, t.OrderedDict[int, float]] = {event: OrderedDict() for event in Event}
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._ignored.values())
+
+    def add(self, event: Event, items: t.Iterable[int]) -> None:
+        """Ignore the next `event` for each ID in `items`, refreshing the expiry of already ignored IDs."""
+        ids = self._ignored[event]
+        self._expire(ids)
+
+        expiry = time.monotonic() + self.ttl
+        for item in items:
+            ids[item] = expiry
+            ids.move_to_end(item)
+
+    def pop(self, event: Event, item: int) -> bool:
+        """Stop ignoring `event` for `item` and return True if it was being ignored."""
+        expiry = self._ignored[event].pop(item, None)
+        return expiry is not None and expiry > time.monotonic()
+
+    @staticmethod
+    def _expire(ids: t.OrderedDict[int, float]) -> None:
+        """Remove expired IDs, which are all at the start of `ids`."""
+        now = time.monotonic()
+        while ids and next(iter(ids.values())) <= now:
+            ids.popitem(last=False)
+
 
 class ModLog(Cog, name="ModLog"):
     """Logging for server events and staff actions."""
 
     def __init__(self, bot: Bot):
         self.bot = bot
-        self._ignored = {event: [] for event in Event}
+        self._ignored = IgnoredEvents(IGNORED_EVENT_TTL)
 
-        self._cached_deletes = []
-        self._cached_edits = []
+        self._log_queues: t.DefaultDict[int, t.Deque[LogEntry]] = defaultdict(deque)
+        self._log_workers: t.Dict[int, asyncio.Task] = {}
+
+    def cog_unload(self) -> None:
+        """Cancel the workers sending queued log messages."""
+        for worker in self._log_workers.copy().values():
+            worker.cancel()
 
     async def upload_log(
         self,
-        messages: t.Iterable[discord.Message],
+        messages: t.Union[t.Iterable[discord.Message], t.AsyncIterable[discord.Message]],
         actor_id: int,
         attachments: t.Iterable[t.List[str]] = None
     ) -> str:
-        """Upload message logs to the database and return a URL to a page for viewing the logs."""
-        if attachments is None:
-            attachments = []
+        """
+        Upload message logs to the database and return a URL to a page for viewing the logs.
+
+        `messages` may also be an async iterable. The request body is streamed, with each message
+        serialised as it's consumed, so the whole log is never held in memory at once.
+        """
+        if not isinstance(messages, collections.abc.AsyncIterable):
+            messages = _aiter(messages)
 
         response = await self.bot.api_client.post(
             'bot/deleted-messages',
-            json={
-                'actor': actor_id,
-                'creation': datetime.utcnow().isoformat(),
-                'deletedmessage_set': [
-                    {
-                        'id': message.id,
-                        'author': message.author.id,
-                        'channel_id': message.channel.id,
-                        'content': message.content.replace("\0", ""),  # Null chars cause 400.
-                        'embeds': [embed.to_dict() for embed in message.embeds],
-                        'attachments': attachment,
-                    }
-                    for message, attachment in zip_longest(messages, attachments, fillvalue=[])
-                ]
-            }
+            data=self._serialize_log(messages, actor_id, attachments),
+            headers={"Content-Type": "application/json"}
         )
 
         return f"{URLs.site_logs_view}/{response['id']}"
 
+    @staticmethod
+    async def _serialize_log(
+        messages: t.AsyncIterable[discord.Message],
+        actor_id: int,
+        attachments: t.Optional[t.Iterable[t.List[str]]]
+    ) -> t.AsyncIterator[bytes]:
+        """Yield the JSON body of a log of `messages` in parts, one message at a time."""
+        attachments = iter(attachments or ())
+        metadata = json.dumps({'actor': actor_id, 'creation': datetime.utcnow().isoformat()})
+        yield f'{metadata[:-1]}, "deletedmessage_set": ['.encode()
+
+        separator = ""
+        async for message in messages:
+            serialized = json.dumps({
+                'id': message.id,
+                'author': message.author.id,
+                'channel_id': message.channel.id,
+                'content': message.content.replace("\0", ""),  # Null chars cause 400.
+                'embeds': [embed.to_dict() for embed in message.embeds],
+                'attachments': next(attachments, []),
+            })
+            yield f"{separator}{serialized}".encode()
+            separator = ","
+
+        yield b"]}"
+
     def ignore(self, event: Event, *items: int) -> None:
         """Add event to ignored events to suppress log emission."""
-        for item in items:
-            if item not in self._ignored[event]:
-                self._ignored[event].append(item)
+        self.ignore_many(event, items)
+
+    def ignore_many(self, event: Event, items: t.Iterable[int]) -> None:
+        """Add event to ignored events for every ID in `items`; suited for large amounts of IDs."""
+        self._ignored.add(event, items)
+        self.bot.stats.gauge("modlog.ignored", len(self._ignored))
 
     async def send_log_message(
         self,
@@ -95,8 +188,14 @@ class ModLog(Cog, name="ModLog"):
         additional_embeds_msg: t.Optional[str] = None,
         timestamp_override: t.Optional[datetime] = None,
         footer: t.Optional[str] = None,
-    ) -> Context:
-        """Generate log embed and send to logging channel."""
+        return_context: bool = False,
+    ) -> t.Optional[Context]:
+        """
+        Generate log embed and send to logging channel.
+
+        The embed is added to the channel's outgoing queue, which sends its messages in order. Return a
+        `Context` of the sent log message if `return_context` is True.
+        """
         # Truncate string directly here to avoid removing newlines
         embed = discord.Embed(
             description=text[:2045] + "..." if len(text) > 2048 else text
@@ -125,20 +224,78 @@ class ModLog(Cog, name="ModLog"):
             content = content[:2000 - 3] + "..."
 
         channel = self.bot.get_channel(channel_id)
-        log_message = await channel.send(
-            content=content,
-            embed=embed,
-            files=files,
-            allowed_mentions=discord.AllowedMentions(everyone=True)
-        )
-
+        loop = asyncio.get_running_loop()
+
+        def make_entry(
+            content: t.Optional[str],
+            embed: t.Optional[discord.Embed],
+            files: t.Optional[t.List[discord.File]] = None,
+            allowed_mentions: t.Optional[discord.AllowedMentions] = None,
+        ) -> LogEntry:
+            """Return an entry for a message with `content`, `embed`, and `files`, waiting to be queued."""
+            return LogEntry(content, embed, files, allowed_mentions, loop.create_future(), time.monotonic())
+
+        entries = [make_entry(content, embed, files, discord.AllowedMentions(everyone=True))]
         if additional_embeds:
             if additional_embeds_msg:
-                await channel.send(additional_embeds_msg)
-            for additional_embed in additional_embeds:
-                await channel.send(embed=additional_embed)
+                entries.append(make_entry(additional_embeds_msg, None))
+            entries.extend(make_entry(None, additional_embed) for additional_embed in additional_embeds)
+
+        for entry in entries:
+            self._enqueue_log_entry(channel, entry)
+
+        # All entries are sent in order, so the first message is sent once the last entry is done.
+        log_message, *_ = await asyncio.gather(*(entry.future for entry in entries))
+
+        if return_context:
+            return await self.bot.get_context(log_message)  # Optionally return for use with antispam
 
-        return await self.bot.get_context(log_message)  # Optionally return for use with antispam
+    def _enqueue_log_entry(self, channel: discord.TextChannel, entry: LogEntry) -> None:
+        """Add `entry` to the outgoing queue of `channel` and start a worker for it if none is running."""
+        self._log_queues[channel.id].append(entry)
+
+        if channel.id not in self._log_workers:
+            self._log_workers[channel.id] = asyncio.create_task(self._send_queued_logs(channel))
+
+    async def _send_queued_logs(self, channel: discord.TextChannel) -> None:
+        """
+        Send all queued log entries for `channel` in order, one message per entry.
+
+        Messages are sent one at a time, so the per-channel rate limit bucket of discord.py's HTTP
+        client paces the queue.
+        """
+        queue = self._log_queues[channel.id]
+
+        try:
+            while queue:
+                entry = queue.popleft()
+
+                lag = time.monotonic() - entry.enqueued_at
+                self.bot.stats.timing("modlog.queue_lag", lag * 1000)
+                self.bot.stats.gauge("modlog.queue_size", len(queue))
+
+                try:
+                    message = await channel.send(
+                        content=entry.content,
+                        embed=entry.embed,
+                        files=entry.files,
+                        allowed_mentions=entry.allowed_mentions
+                    )
+                except asyncio.CancelledError:
+                    entry.future.cancel()
+                    raise
+                except Exception as e:
+                    if not entry.future.done():
+                        entry.future.set_exception(e)
+                else:
+                    if not entry.future.done():
+                        entry.future.set_result(message)
+        finally:
+            # Remove the worker before anything else is awaited, so that new entries start a new worker.
+            del self._log_workers[channel.id]
+
+            while queue:
+                queue.popleft().future.cancel()
 
     @Cog.listener()
     async def on_guild_channel_create(self, channel: GUILD_CHANNEL) -> None:
@@ -195,8 +352,7 @@ class ModLog(Cog, name="ModLog"):
         if before.guild.id != GuildConstant.id:
             return
 
-        if before.id in self._ignored[Event.guild_channel_update]:
-            self._ignored[Event.guild_channel_update].remove(before.id)
+        if self._ignored.pop(Event.guild_channel_update, before.id):
             return
 
         # Two channel updates are sent for a single edit: 1 for topic and 1 for category change.
@@ -390,8 +546,7 @@ class ModLog(Cog, name="ModLog"):
         if guild.id != GuildConstant.id:
             return
 
-        if member.id in self._ignored[Event.member_ban]:
-            self._ignored[Event.member_ban].remove(member.id)
+        if self._ignored.pop(Event.member_ban, member.id):
             return
 
         await self.send_log_message(
@@ -428,8 +583,7 @@ class ModLog(Cog, name="ModLog"):
         if member.guild.id != GuildConstant.id:
             return
 
-        if member.id in self._ignored[Event.member_remove]:
-            self._ignored[Event.member_remove].remove(member.id)
+        if self._ignored.pop(Event.member_remove, member.id):
             return
 
         await self.send_log_message(
@@ -445,8 +599,7 @@ class ModLog(Cog, name="ModLog"):
         if guild.id != GuildConstant.id:
             return
 
-        if member.id in self._ignored[Event.member_unban]:
-            self._ignored[Event.member_unban].remove(member.id)
+        if self._ignored.pop(Event.member_unban, member.id):
             return
 
         await self.send_log_message(
@@ -477,8 +630,7 @@ class ModLog(Cog, name="ModLog"):
         if before.guild.id != GuildConstant.id:
             return
 
-        if before.id in self._ignored[Event.member_update]:
-            self._ignored[Event.member_update].remove(before.id)
+        if self._ignored.pop(Event.member_update, before.id):
             return
 
         changes = self.get_role_diff(before.roles, after.roles)
@@ -535,10 +687,7 @@ class ModLog(Cog, name="ModLog"):
         if message.guild.id != GuildConstant.id or channel.id in GuildConstant.modlog_blacklist:
             return
 
-        self._cached_deletes.append(message.id)
-
-        if message.id in self._ignored[Event.message_delete]:
-            self._ignored[Event.message_delete].remove(message.id)
+        if self._ignored.pop(Event.message_delete, message.id):
             return
 
         if author.bot:
@@ -588,15 +737,11 @@ class ModLog(Cog, name="ModLog"):
         if event.guild_id != GuildConstant.id or event.channel_id in GuildConstant.modlog_blacklist:
             return
 
-        await asyncio.sleep(1)  # Wait here in case the normal event was fired
-
-        if event.message_id in self._cached_deletes:
-            # It was in the cache and the normal event was fired, so we can just ignore it
-            self._cached_deletes.remove(event.message_id)
+        if event.cached_message is not None:
+            # The message was cached, so it's logged by `on_message_delete`.
             return
 
-        if event.message_id in self._ignored[Event.message_delete]:
-            self._ignored[Event.message_delete].remove(event.message_id)
+        if self._ignored.pop(Event.message_delete, event.message_id):
             return
 
         channel = self.bot.get_channel(event.channel_id)
@@ -624,32 +769,82 @@ class ModLog(Cog, name="ModLog"):
         )
 
     @Cog.listener()
-    async def on_message_edit(self, msg_before: discord.Message, msg_after: discord.Message) -> None:
-        """Log message edit event to message change log."""
-        if (
-            not msg_before.guild
-            or msg_before.guild.id != GuildConstant.id
-            or msg_before.channel.id in GuildConstant.modlog_blacklist
-            or msg_before.author.bot
-        ):
+    async def on_raw_bulk_message_delete(self, event: discord.RawBulkMessageDeleteEvent) -> None:
+        """Log raw bulk message delete event to message change log as a single entry."""
+        if event.guild_id != GuildConstant.id or event.channel_id in GuildConstant.modlog_blacklist:
             return
 
-        self._cached_edits.append(msg_before.id)
+        message_ids = {
+            message_id for message_id in event.message_ids
+            if not self._ignored.pop(Event.message_delete, message_id)
+        }
+        if not message_ids:
+            return
 
-        if msg_before.content == msg_after.content:
+        cached_messages = [message for message in event.cached_messages if message.id in message_ids]
+        messages = sorted(
+            (message for message in cached_messages if not message.author.bot),
+            key=lambda message: message.id
+        )
+        uncached_count = len(message_ids) - len(cached_messages)
+
+        if not messages and not uncached_count:
             return
 
-        channel = msg_before.channel
+        channel = self.bot.get_channel(event.channel_id)
         channel_name = f"{channel.category}/#{channel.name}" if channel.category else f"#{channel.name}"
 
-        # Getting the difference per words and group them by type - add, remove, same
-        # Note that this is intended grouping without sorting
-        diff = difflib.ndiff(msg_before.clean_content.split(), msg_after.clean_content.split())
-        diff_groups = tuple(
-            (diff_type, tuple(s[2:] for s in diff_words))
-            for diff_type, diff_words in itertools.groupby(diff, key=lambda s: s[0])
+        response = (
+            f"**Channel:** {channel_name} (`{channel.id}`)\n"
+            f"**Messages deleted:** {len(message_ids)}\n"
+        )
+
+        if uncached_count:
+            response += f"**Not cached:** {uncached_count}\n"
+
+        if messages:
+            log_url = await self.upload_log(messages, actor_id=self.bot.user.id)
+            response += f"\nA log of the cached messages can be found [here]({log_url})."
+        else:
+            response += "\nNone of the messages were cached, so their content cannot be displayed."
+
+        await self.send_log_message(
+            Icons.message_bulk_delete, Colours.soft_red,
+            "Bulk message delete",
+            response,
+            channel_id=Channels.message_log
         )
 
+    @staticmethod
+    def get_content_diff(before: str, after: str) -> t.Tuple[str, str]:
+        """
+        Return the `before` and `after` contents, with changed words highlighted and unchanged ones elided.
+
+        If either content exceeds `EDIT_DIFF_WORD_LIMIT` words, return the truncated contents without a diff.
+        """
+        words_before = before.split()
+        words_after = after.split()
+
+        if len(words_before) > EDIT_DIFF_WORD_LIMIT or len(words_after) > EDIT_DIFF_WORD_LIMIT:
+            return (
+                textwrap.shorten(before, EDIT_DIFF_SHORTEN_WIDTH, placeholder="..."),
+                textwrap.shorten(after, EDIT_DIFF_SHORTEN_WIDTH, placeholder="..."),
+            )
+
+        # Group the words by type of difference - add, remove, same.
+        # Unlike `difflib.ndiff`, this doesn't compute intraline differences for replaced words.
+        diff_groups = []
+        matcher = difflib.SequenceMatcher(None, words_before, words_after, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                diff_groups.append((" ", words_before[i1:i2]))
+                continue
+
+            if tag in ("delete", "replace"):
+                diff_groups.append(("-", words_before[i1:i2]))
+            if tag in ("insert", "replace"):
+                diff_groups.append(("+", words_after[j1:j2]))
+
         content_before: t.List[str] = []
         content_after: t.List[str] = []
 
@@ -669,13 +864,34 @@ class ModLog(Cog, name="ModLog"):
                 content_before.append(sub)
                 content_after.append(sub)
 
+        return ' '.join(content_before), ' '.join(content_after)
+
+    @Cog.listener()
+    async def on_message_edit(self, msg_before: discord.Message, msg_after: discord.Message) -> None:
+        """Log message edit event to message change log."""
+        if (
+            not msg_before.guild
+            or msg_before.guild.id != GuildConstant.id
+            or msg_before.channel.id in GuildConstant.modlog_blacklist
+            or msg_before.author.bot
+        ):
+            return
+
+        if msg_before.content == msg_after.content:
+            return
+
+        channel = msg_before.channel
+        channel_name = f"{channel.category}/#{channel.name}" if channel.category else f"#{channel.name}"
+
+        content_before, content_after = self.get_content_diff(msg_before.clean_content, msg_after.clean_content)
+
         response = (
             f"**Author:** {format_user(msg_before.author)}\n"
             f"**Channel:** {channel_name} (`{channel.id}`)\n"
             f"**Message ID:** `{msg_before.id}`\n"
             "\n"
-            f"**Before**:\n{' '.join(content_before)}\n"
-            f"**After**:\n{' '.join(content_after)}\n"
+            f"**Before**:\n{content_before}\n"
+            f"**After**:\n{content_after}\n"
             "\n"
             f"[Jump to message]({msg_after.jump_url})"
         )
@@ -701,8 +917,16 @@ class ModLog(Cog, name="ModLog"):
     @Cog.listener()
     async def on_raw_message_edit(self, event: discord.RawMessageUpdateEvent) -> None:
         """Log raw message edit event to message change log."""
+        if event.cached_message is not None:
+            # The message was cached, so it's logged by `on_message_edit`.
+            return
+
+        channel_id = int(event.data["channel_id"])
+        if int(event.data.get("guild_id", 0)) != GuildConstant.id or channel_id in GuildConstant.modlog_blacklist:
+            return
+
         try:
-            channel = self.bot.get_channel(int(event.data["channel_id"]))
+            channel = self.bot.get_channel(channel_id)
             message = await channel.fetch_message(event.message_id)
         except discord.NotFound:  # Was deleted before we got the event
             return
@@ -715,13 +939,6 @@ class ModLog(Cog, name="ModLog"):
         ):
             return
 
-        await asyncio.sleep(1)  # Wait here in case the normal event was fired
-
-        if event.message_id in self._cached_edits:
-            # It was in the cache and the normal event was fired, so we can just ignore it
-            self._cached_edits.remove(event.message_id)
-            return
-
         channel = message.channel
         channel_name = f"{channel.category}/#{channel.name}" if channel.category else f"#{channel.name}"
 
@@ -765,8 +982,7 @@ class ModLog(Cog, name="ModLog"):
         ):
             return
 
-        if member.id in self._ignored[Event.voice_state_update]:
-            self._ignored[Event.voice_state_update].remove(member.id)
+        if self._ignored.pop(Event.voice_state_update, member.id):
             return
 
         # Exclude all channel attributes except the name.
@@ -1,8 +1,10 @@
 import asyncio
+import heapq
 import logging
 import typing as t
 from contextlib import suppress
 from datetime import datetime, timedelta
+from enum import IntEnum
 
 import discord
 from async_rediscache import RedisCache
@@ -14,6 +16,7 @@ from bot import constants
 from bot.bot import Bot
 from bot.decorators import has_no_roles, in_whitelist
 from bot.exts.moderation.modlog import ModLog
+from bot.utils.bulk import BulkExecutor
 from bot.utils.checks import InWhitelistCheckFailure, has_no_roles_check
 from bot.utils.messages import format_user
 
@@ -74,6 +77,16 @@ You will be kicked if you don't verify within `{constants.Verification.kicked_af
 # An async function taking a Member param
 Request = t.Callable[[discord.Member], t.Awaitable]
 
+# The amount of `update_unverified_members` runs after which the unverified member index is rebuilt
+FULL_SCAN_INTERVAL = 48  # Once a day at the default interval of 30 minutes
+
+
+class DeadlineAction(IntEnum):
+    """The action to take once a deadline of an unverified member passes."""
+
+    ROLE = 0
+    KICK = 1
+
 
 class StopExecution(Exception):
     """Signals that a task should halt immediately & alert admins."""
@@ -83,13 +96,6 @@ class StopExecution(Exception):
         self.reason = reason
 
 
-class Limit(t.NamedTuple):
-    """Composition over config for throttling requests."""
-
-    batch_size: int  # Amount of requests after which to pause
-    sleep_secs: int  # Sleep this many seconds after each batch
-
-
 def mention_role(role_id: int) -> discord.AllowedMentions:
     """Construct an allowed mentions instance that allows pinging `role_id`."""
     return discord.AllowedMentions(roles=[discord.Object(role_id)])
@@ -143,7 +149,8 @@ class Verification(Cog):
     Statistics are collected in the 'verification.' namespace.
 
     Moderators+ can use the `verification` command group to start or stop both internal
-    tasks, if necessary. Settings are persisted in Redis across sessions.
+    tasks, if necessary. Stopping the tasks also pauses any kicks or role grants in progress.
+    Settings are persisted in Redis across sessions.
 
     Additionally, this cog offers the !accept, !subscribe and !unsubscribe commands,
     and keeps the verification channel clean by deleting messages.
@@ -159,6 +166,15 @@ class Verification(Cog):
     def __init__(self, bot: Bot) -> None:
         """Start internal tasks."""
         self.bot = bot
+
+        # Paused until the tasks are started.
+        self.bulk_executor = BulkExecutor(self.__class__.__name__, paused=True)
+
+        # Join dates of unverified members by their IDs, and a heap of their role and kick deadlines
+        self.unverified_members: t.Dict[int, datetime] = {}
+        self.deadlines: t.List[t.Tuple[datetime, int, DeadlineAction]] = []
+        self._checks_since_scan = 0
+
         self.bot.loop.create_task(self._maybe_start_tasks())
 
     def cog_unload(self) -> None:
@@ -185,6 +201,7 @@ class Verification(Cog):
 
         if setting:
             log.trace("Background tasks will be started")
+            self.bulk_executor.resume()
             self.update_unverified_members.start()
             self.ping_unverified.start()
 
@@ -193,9 +210,11 @@ class Verification(Cog):
         Stop the update users & ping @Unverified tasks.
 
         If `gracefully` is True, the tasks will be able to finish their current iteration.
-        Otherwise, they are cancelled immediately.
+        Otherwise, they are cancelled immediately. Either way, kicks and role grants in
+        progress stop sending further requests.
         """
         log.info(f"Stopping internal tasks ({gracefully=})")
+        self.bulk_executor.pause()
         if gracefully:
             self.update_unverified_members.stop()
             self.ping_unverified.stop()
@@ -293,9 +312,15 @@ class Verification(Cog):
             allowed_mentions=mention_role(constants.Roles.admins),
         )
 
-    async def _send_requests(self, members: t.Collection[discord.Member], request: Request, limit: Limit) -> int:
+    async def _send_requests(
+        self,
+        members: t.Collection[discord.Member],
+        request: Request,
+        name: str,
+        max_concurrency: int,
+    ) -> int:
         """
-        Pass `members` one by one to `request` handling Discord exceptions.
+        Pass `members` to `request` concurrently, handling Discord exceptions.
 
         This coroutine serves as a generic `request` executor for kicking members and adding
         roles, as it allows us to define the error handling logic in one place only.
@@ -303,44 +328,39 @@ class Verification(Cog):
         Any `request` has the ability to completely abort the execution by raising `StopExecution`.
         In such a case, the @Admins will be alerted of the reason attribute.
 
-        To avoid rate-limits, pass a `limit` configuring the batch size and the amount of seconds
-        to sleep between batches.
+        Up to `max_concurrency` requests are sent at once; discord.py paces them according to the
+        rate limits Discord reports. The throughput is reported as the `name` stat.
 
         Returns the amount of successful requests. Failed requests are logged at info level.
         """
         log.trace(f"Sending {len(members)} requests")
-        n_success, bad_statuses = 0, set()
 
-        for progress, member in enumerate(members, start=1):
-            if is_verified(member):  # Member could have verified in the meantime
-                continue
-            try:
-                await request(member)
-            except StopExecution as stop_execution:
-                await self._alert_admins(stop_execution.reason)
-                await self.task_cache.set("tasks_running", 0)
-                self._stop_tasks(gracefully=True)  # Gracefully finish current iteration, then stop
-                break
-            except discord.HTTPException as http_exc:
-                bad_statuses.add(http_exc.status)
-            else:
-                n_success += 1
+        # Members could have verified in the meantime.
+        pending = (member for member in members if not is_verified(member))
+        result = await self.bulk_executor.run(pending, request, max_concurrency)
 
-            if progress % limit.batch_size == 0:
-                log.trace(f"Processed {progress} requests, pausing for {limit.sleep_secs} seconds")
-                await asyncio.sleep(limit.sleep_secs)
+        if isinstance(result.exception, StopExecution):
+            await self._alert_admins(result.exception.reason)
+            await self.task_cache.set("tasks_running", 0)
+            self._stop_tasks(gracefully=True)  # Gracefully finish current iteration, then stop
+        elif result.exception is not None:
+            raise result.exception
+        elif result.paused:
+            log.info(f"Requests were paused after {result.n_success + result.n_failed} of {len(members)} members")
 
-        if bad_statuses:
-            log.info(f"Failed to send {len(members) - n_success} requests due to following statuses: {bad_statuses}")
+        if result.failed_statuses:
+            statuses = set(result.failed_statuses)
+            log.info(f"Failed to send {result.n_failed} requests due to following statuses: {statuses}")
 
-        return n_success
+        self.bot.stats.gauge(f"verification.{name}.throughput", result.throughput)
+        return result.n_success
 
     async def _kick_members(self, members: t.Collection[discord.Member]) -> int:
         """
         Kick `members` from the PyDis guild.
 
-        Due to strict ratelimits on sending messages (120 requests / 60 secs), we sleep for a second
-        after each 2 requests to allow breathing room for other features.
+        Due to strict ratelimits on sending messages (120 requests / 60 secs), only a few members are
+        processed at once to allow breathing room for other features.
 
         Note that this is a potentially destructive operation. Returns the amount of successful requests.
         """
@@ -354,7 +374,7 @@ class Verification(Cog):
                 raise StopExecution(reason=suspicious_exception)
             await member.kick(reason=f"User has not verified in {constants.Verification.kicked_after} days")
 
-        n_kicked = await self._send_requests(members, kick_request, Limit(batch_size=2, sleep_secs=1))
+        n_kicked = await self._send_requests(members, kick_request, "kicks", max_concurrency=2)
         self.bot.stats.incr("verification.kicked", count=n_kicked)
 
         return n_kicked
@@ -363,8 +383,6 @@ class Verification(Cog):
         """
         Give `role` to all `members`.
 
-        We pause for a second after batches of 25 requests to ensure ratelimits aren't exceeded.
-
         Returns the amount of successful requests.
         """
         log.info(
@@ -376,7 +394,42 @@ class Verification(Cog):
             """Add `role` to `member`."""
             await member.add_roles(role, reason=f"Not verified after {constants.Verification.unverified_after} days")
 
-        return await self._send_requests(members, role_request, Limit(batch_size=25, sleep_secs=1))
+        return await self._send_requests(members, role_request, "role_grants", max_concurrency=10)
+
+    def _index_member(self, member: discord.Member) -> None:
+        """
+        Add `member` to the unverified member index if they're unverified.
+
+        Two deadlines are pushed for each member: when they should be given the @Unverified role,
+        and when they should be kicked. Entries of members which verify or leave are not removed
+        from the heap, they're skipped once popped.
+        """
+        # Skip verified members, bots, and members for which we do not know their join date,
+        # this should be extremely rare but docs mention that it can happen
+        if is_verified(member) or member.bot or member.joined_at is None:
+            return
+
+        self.unverified_members[member.id] = member.joined_at
+
+        role_deadline = member.joined_at + timedelta(days=constants.Verification.unverified_after)
+        kick_deadline = member.joined_at + timedelta(days=constants.Verification.kicked_after)
+        heapq.heappush(self.deadlines, (role_deadline, member.id, DeadlineAction.ROLE))
+        heapq.heappush(self.deadlines, (kick_deadline, member.id, DeadlineAction.KICK))
+
+    def _unindex_member(self, member: discord.Member) -> None:
+        """Remove `member` from the unverified member index."""
+        self.unverified_members.pop(member.id, None)
+
+    def _build_index(self, guild: discord.Guild) -> None:
+        """Rebuild the unverified member index from all members of `guild`."""
+        log.debug("Indexing verification status of guild members")
+
+        self.unverified_members.clear()
+        self.deadlines.clear()
+        for member in guild.members:
+            self._index_member(member)
+
+        log.debug(f"Indexed {len(self.unverified_members)} unverified members")
 
     async def _check_members(self) -> t.Tuple[t.Set[discord.Member], t.Set[discord.Member]]:
         """
@@ -387,37 +440,45 @@ class Verification(Cog):
         * Not verified after configured `kicked_after` days, should be kicked from the guild
 
         These sets are always disjoint, i.e. share no common members.
+
+        Only the deadlines which passed since the last check are popped from the index. Every
+        `FULL_SCAN_INTERVAL` checks, the index is rebuilt from all guild members to correct any
+        drift from missed events and to pick up members whose requests failed.
         """
         await self.bot.wait_until_guild_available()  # Ensure cache is ready
         pydis = self.bot.get_guild(constants.Guild.id)
 
+        if self._checks_since_scan % FULL_SCAN_INTERVAL == 0:
+            self._build_index(pydis)
+        self._checks_since_scan += 1
+
         unverified = pydis.get_role(constants.Roles.unverified)
         current_dt = datetime.utcnow()  # Discord timestamps are UTC
 
         # Users to be given the @Unverified role, and those to be kicked, these should be entirely disjoint
         for_role, for_kick = set(), set()
 
-        log.debug("Checking verification status of guild members")
-        for member in pydis.members:
+        log.debug("Checking verification status of members with passed deadlines")
+        while self.deadlines and self.deadlines[0][0] < current_dt:
+            _, member_id, action = heapq.heappop(self.deadlines)
+            member = pydis.get_member(member_id)
 
-            # Skip verified members, bots, and members for which we do not know their join date,
-            # this should be extremely rare but docs mention that it can happen
-            if is_verified(member) or member.bot or member.joined_at is None:
+            # Skip entries of members who left, verified, or rejoined since the entry was pushed
+            if (
+                member is None
+                or is_verified(member)
+                or self.unverified_members.get(member_id) != member.joined_at
+            ):
                 continue
 
-            # At this point, we know that `member` is an unverified user, and we will decide what
-            # to do with them based on time passed since their join date
-            since_join = current_dt - member.joined_at
-
-            if since_join > timedelta(days=constants.Verification.kicked_after):
+            if action is DeadlineAction.KICK:
                 for_kick.add(member)  # User should be removed from the guild
-
-            elif (
-                since_join > timedelta(days=constants.Verification.unverified_after)
-                and unverified not in member.roles
-            ):
+            elif unverified not in member.roles:
                 for_role.add(member)  # User should be given the @Unverified role
 
+        # A member whose both deadlines passed since the last check only needs to be kicked
+        for_role -= for_kick
+
         log.debug(f"Found {len(for_role)} users for {unverified} role, {len(for_kick)} users to be kicked")
         return for_role, for_kick
 
@@ -446,6 +507,8 @@ class Verification(Cog):
             kick_report = "Found no users to be kicked."
         elif not await self._verify_kick(len(for_kick)):
             kick_report = f"Not authorized to kick `{len(for_kick)}` members."
+            for member in for_kick:
+                self._index_member(member)  # Ask again on the next run
         else:
             n_kicks = await self._kick_members(for_kick)
             kick_report = f"Kicked `{n_kicks}`/`{len(for_kick)}` members from the guild."
@@ -515,16 +578,35 @@ class Verification(Cog):
 
     @Cog.listener()
     async def on_member_join(self, member: discord.Member) -> None:
-        """Attempt to send initial direct message to each new member."""
+        """Index each new member and attempt to send them the initial direct message."""
         if member.guild.id != constants.Guild.id:
             return  # Only listen for PyDis events
 
+        self._index_member(member)
+
         log.trace(f"Sending on join message to new member: {member.id}")
         try:
             await safe_dm(member.send(ON_JOIN_MESSAGE))
         except discord.HTTPException:
             log.exception("DM dispatch failed on unexpected error code")
 
+    @Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        """Remove members who gained a role which verifies them from the unverified member index."""
+        if after.guild.id != constants.Guild.id:
+            return  # Only listen for PyDis events
+
+        if after.id in self.unverified_members and is_verified(after):
+            self._unindex_member(after)
+
+    @Cog.listener()
+    async def on_member_remove(self, member: discord.Member) -> None:
+        """Remove members who left the guild from the unverified member index."""
+        if member.guild.id != constants.Guild.id:
+            return  # Only listen for PyDis events
+
+        self._unindex_member(member)
+
     @Cog.listener()
     async def on_message(self, message: discord.Message) -> None:
         """Check new message event for messages to the checkpoint channel & process."""
@@ -625,6 +707,7 @@ class Verification(Cog):
     async def start_cmd(self, ctx: Context) -> None:
         """Start verification tasks if they are not already running."""
         log.info("Starting verification tasks")
+        self.bulk_executor.resume()
 
         if not self.update_unverified_members.is_running():
             self.update_unverified_members.start()
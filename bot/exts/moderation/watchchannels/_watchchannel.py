@@ -5,7 +5,8 @@ import textwrap
 from abc import abstractmethod
 from collections import defaultdict, deque
 from dataclasses import dataclass
-from typing import Optional
+from datetime import datetime
+from typing import Deque, List, Optional, Tuple
 
 import dateutil.parser
 import discord
@@ -15,8 +16,7 @@ from discord.ext.commands import Cog, Context
 from bot.api import ResponseCodeError
 from bot.bot import Bot
 from bot.constants import BigBrother as BigBrotherConfig, Guild as GuildConfig, Icons
-from bot.exts.filters.token_remover import TokenRemover
-from bot.exts.filters.webhook_remover import WEBHOOK_URL_RE
+from bot.exts.filters.token_remover import scan_message
 from bot.exts.moderation.modlog import ModLog
 from bot.pagination import LinePaginator
 from bot.utils import CogABCMeta, messages
@@ -26,6 +26,9 @@ log = logging.getLogger(__name__)
 
 URL_RE = re.compile(r"(https?://[^\s]+)")
 
+# The maximum length of the content of a single webhook message.
+MAX_CONTENT_LENGTH = 2000
+
 
 @dataclass
 class MessageHistory:
@@ -185,10 +188,10 @@ class WatchChannel(metaclass=CogABCMeta):
         for user_channel_queues in self.consumption_queue.values():
             for channel_queue in user_channel_queues.values():
                 while channel_queue:
-                    msg = channel_queue.popleft()
+                    msgs, contents = self.take_batch(channel_queue)
 
-                    self.log.trace(f"Consuming message {msg.id} ({len(msg.attachments)} attachments)")
-                    await self.relay_message(msg)
+                    self.log.trace(f"Consuming {len(msgs)} messages, the last of which is {msgs[-1].id}")
+                    await self.relay_messages(msgs, contents)
 
         self.consumption_queue.clear()
 
@@ -204,49 +207,113 @@ class WatchChannel(metaclass=CogABCMeta):
         username: Optional[str] = None,
         avatar_url: Optional[str] = None,
         embed: Optional[Embed] = None,
+        embeds: Optional[List[Embed]] = None,
     ) -> None:
         """Sends a message to the webhook with the specified kwargs."""
         username = messages.sub_clyde(username)
+        if embed is not None:
+            embeds = [embed]
+
         try:
-            await self.webhook.send(content=content, username=username, avatar_url=avatar_url, embed=embed)
+            await self.webhook.send(content=content, username=username, avatar_url=avatar_url, embeds=embeds)
         except discord.HTTPException as exc:
             self.log.exception(
                 "Failed to send a message to the webhook",
                 exc_info=exc
             )
 
-    async def relay_message(self, msg: Message) -> None:
-        """Relays the message to the relevant watch channel."""
-        limit = BigBrotherConfig.header_message_limit
-
-        if (
+    def needs_header(self, msg: Message) -> bool:
+        """Return True if a header has to be relayed before the `msg`."""
+        return (
             msg.author.id != self.message_history.last_author
             or msg.channel.id != self.message_history.last_channel
-            or self.message_history.message_count >= limit
-        ):
-            self.message_history = MessageHistory(last_author=msg.author.id, last_channel=msg.channel.id)
+            or self.message_history.message_count >= BigBrotherConfig.header_message_limit
+        )
+
+    def take_batch(self, channel_queue: Deque[Message]) -> Tuple[List[Message], List[str]]:
+        """
+        Pop the messages which can be relayed together from the start of the `channel_queue`.
+
+        All messages in the queue are from the same author and channel. Their contents are combined up to
+        the maximum content length of a single message, and a batch doesn't span more than one header.
+        A batch ends with the first message which has attachments, so they're relayed right after its content.
+
+        Return the popped messages and their non-empty cleaned contents.
+        """
+        limit = BigBrotherConfig.header_message_limit
+        if self.needs_header(channel_queue[0]):
+            remaining = limit
+        else:
+            remaining = limit - self.message_history.message_count
+
+        msgs = []
+        contents = []
+        length = 0
+        while channel_queue and len(msgs) < remaining:
+            content = self.clean_content(channel_queue[0])
+
+            # The contents are separated by newlines.
+            added_length = len(content) + bool(contents) if content else 0
+            if msgs and length + added_length > MAX_CONTENT_LENGTH:
+                break
+
+            msg = channel_queue.popleft()
+            msgs.append(msg)
+            if content:
+                contents.append(content)
+                length += added_length
 
-            await self.send_header(msg)
+            if msg.attachments:
+                break
 
-        if TokenRemover.find_token_in_message(msg) or WEBHOOK_URL_RE.search(msg.content):
-            cleaned_content = "Content is censored because it contains a bot or webhook token."
-        elif cleaned_content := msg.clean_content:
+        return msgs, contents
+
+    @staticmethod
+    def clean_content(msg: Message) -> str:
+        """Return the content of `msg` with tokens censored and with non-media URLs in code blocks."""
+        if scan_message(msg).found:
+            return "Content is censored because it contains a bot or webhook token."
+
+        cleaned_content = msg.clean_content
+        if cleaned_content:
             # Put all non-media URLs in a code block to prevent embeds
             media_urls = {embed.url for embed in msg.embeds if embed.type in ("image", "video")}
             for url in URL_RE.findall(cleaned_content):
                 if url not in media_urls:
                     cleaned_content = cleaned_content.replace(url, f"`{url}`")
 
-        if cleaned_content:
+        return cleaned_content
+
+    async def relay_messages(self, msgs: List[Message], contents: List[str]) -> None:
+        """
+        Relay a batch of messages to the relevant watch channel.
+
+        The header, if needed, is sent first with its own webhook message, since Discord renders the content
+        of a message above its embeds. The combined `contents` are sent with a single webhook message and the
+        attachments of the last message are re-uploaded afterwards. Discord.py paces the requests according to
+        the webhook's rate limit headers.
+        """
+        first = msgs[0]
+        last = msgs[-1]
+
+        if self.needs_header(first):
+            self.message_history = MessageHistory(last_author=first.author.id, last_channel=first.channel.id)
             await self.webhook_send(
-                cleaned_content,
-                username=msg.author.display_name,
-                avatar_url=msg.author.avatar_url
+                embed=self.build_header(first),
+                username=first.author.display_name,
+                avatar_url=first.author.avatar_url,
             )
 
-        if msg.attachments:
+        if contents:
+            await self.webhook_send(
+                "\n".join(contents),
+                username=first.author.display_name,
+                avatar_url=first.author.avatar_url,
+            )
+
+        if last.attachments:
             try:
-                await messages.send_attachments(msg, self.webhook)
+                await messages.send_attachments(last, self.webhook, self.bot.http_session)
             except (errors.Forbidden, errors.NotFound):
                 e = Embed(
                     description=":x: **This message contained an attachment, but it could not be retrieved**",
@@ -254,8 +321,8 @@ class WatchChannel(metaclass=CogABCMeta):
                 )
                 await self.webhook_send(
                     embed=e,
-                    username=msg.author.display_name,
-                    avatar_url=msg.author.avatar_url
+                    username=last.author.display_name,
+                    avatar_url=last.author.avatar_url
                 )
             except discord.HTTPException as exc:
                 self.log.exception(
@@ -263,10 +330,16 @@ class WatchChannel(metaclass=CogABCMeta):
                     exc_info=exc
                 )
 
-        self.message_history.message_count += 1
+        self.message_history.message_count += len(msgs)
+
+        # The first message of the batch has waited the longest.
+        self.bot.stats.timing(
+            f"watchchannels.{self.__class__.__name__.lower()}.relay_lag",
+            datetime.utcnow() - first.created_at
+        )
 
-    async def send_header(self, msg: Message) -> None:
-        """Sends a header embed with information about the relayed messages to the watch channel."""
+    def build_header(self, msg: Message) -> Embed:
+        """Return a header embed with information about the relayed messages."""
         user_id = msg.author.id
 
         guild = self.bot.get_guild(GuildConfig.id)
@@ -289,7 +362,7 @@ class WatchChannel(metaclass=CogABCMeta):
         embed = Embed(description=f"{msg.author.mention} {message_jump}")
         embed.set_footer(text=textwrap.shorten(footer, width=128, placeholder="..."))
 
-        await self.webhook_send(embed=embed, username=msg.author.display_name, avatar_url=msg.author.avatar_url)
+        return embed
 
     async def list_watched_users(
         self, ctx: Context, oldest_first: bool = False, update_cache: bool = True
@@ -1,22 +1,35 @@
 import ast
+import hashlib
 import logging
+import multiprocessing
 import re
 import time
-from typing import Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional, Tuple, TypeVar
 
 from discord import Embed, Message, RawMessageUpdateEvent, TextChannel
 from discord.ext.commands import Cog, Context, command, group, has_any_role
 
 from bot.bot import Bot
 from bot.constants import Categories, Channels, DEBUG_MODE, Guild, MODERATION_ROLES, Roles, URLs
-from bot.exts.filters.token_remover import TokenRemover
-from bot.exts.filters.webhook_remover import WEBHOOK_URL_RE
+from bot.exts.filters.token_remover import scan_message
 from bot.utils.messages import wait_for_deletion
 
 log = logging.getLogger(__name__)
 
 RE_MARKDOWN = re.compile(r'([*_~`|>])')
 
+# Seconds after sending formatting instructions to a channel during which no more are sent there
+CODEBLOCK_COOLDOWN = 300
+# Messages longer than this are analysed in a separate process
+MAX_INLINE_LENGTH = 1000
+# The amount of analysis results kept for message contents
+ANALYSIS_CACHE_SIZE = 256
+
+T = TypeVar("T")
+
 
 class BotCog(Cog, name="Bot"):
     """Bot information commands."""
@@ -37,6 +50,16 @@ class BotCog(Cog, name="Bot"):
         # Stores improperly formatted Python codeblock message ids and the corresponding bot message
         self.codeblock_message_ids = {}
 
+        # Results of analysing message contents, by the analysis function and a hash of the content
+        self.analysis_cache: Dict[Tuple[str, bytes], object] = OrderedDict()
+        # Created once the first long message is analysed
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def cog_unload(self) -> None:
+        """Shut down the process analysing long messages."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+
     @group(invoke_without_command=True, name="bot", hidden=True)
     @has_any_role(Roles.verified)
     async def botinfo_group(self, ctx: Context) -> None:
@@ -81,7 +104,8 @@ class BotCog(Cog, name="Bot"):
         else:
             await channel.send(embed=embed)
 
-    def codeblock_stripping(self, msg: str, bad_ticks: bool) -> Optional[Tuple[Tuple[str, ...], str]]:
+    @staticmethod
+    def codeblock_stripping(msg: str, bad_ticks: bool) -> Optional[Tuple[Tuple[str, ...], str]]:
         """
         Strip msg in order to find Python code.
 
@@ -135,12 +159,12 @@ class BotCog(Cog, name="Bot"):
                 old = content.strip()
 
                 # Strips REPL code out of the message if there is any.
-                content, repl_code = self.repl_stripping(old)
+                content, repl_code = BotCog.repl_stripping(old)
                 if old != content:
                     return (content, old), repl_code
 
                 # Try to apply indentation fixes to the code.
-                content = self.fix_indentation(content)
+                content = BotCog.fix_indentation(content)
 
                 # Check if the code contains backticks, if it does ignore the message.
                 if "`" in content:
@@ -150,7 +174,8 @@ class BotCog(Cog, name="Bot"):
                     log.trace(f"Returning message.\n\n{content}\n\n")
                     return (content,), repl_code
 
-    def fix_indentation(self, msg: str) -> str:
+    @staticmethod
+    def fix_indentation(msg: str) -> str:
         """Attempts to fix badly indented code."""
         def unindent(code: str, skip_spaces: int = 0) -> str:
             """Unindents all code down to the number of spaces given in skip_spaces."""
@@ -189,7 +214,8 @@ class BotCog(Cog, name="Bot"):
             msg = f"{first_line}\n{unindent(code, 4)}"
         return msg
 
-    def repl_stripping(self, msg: str) -> Tuple[str, bool]:
+    @staticmethod
+    def repl_stripping(msg: str) -> Tuple[str, bool]:
         """
         Strip msg in order to extract Python code out of REPL output.
 
@@ -209,15 +235,158 @@ class BotCog(Cog, name="Bot"):
             log.trace(f"Found REPL code in \n\n{msg}\n\n")
             return final.rstrip(), True
 
-    def has_bad_ticks(self, msg: Message) -> bool:
-        """Check to see if msg contains ticks that aren't '`'."""
+    @staticmethod
+    def has_bad_ticks(content: str) -> bool:
+        """Check to see if content contains ticks that aren't '`'."""
         not_backticks = [
             "'''", '"""', "\u00b4\u00b4\u00b4", "\u2018\u2018\u2018", "\u2019\u2019\u2019",
             "\u2032\u2032\u2032", "\u201c\u201c\u201c", "\u201d\u201d\u201d", "\u2033\u2033\u2033",
             "\u3003\u3003\u3003"
         ]
 
-        return msg.content[:3] in not_backticks
+        return content[:3] in not_backticks
+
+    @staticmethod
+    def get_howto(message_content: str) -> str:
+        """
+        Return instructions to format the poorly formatted Python code in `message_content`.
+
+        An empty string is returned if no poorly formatted code is found.
+        """
+        content = message_content
+        try:
+            if BotCog.has_bad_ticks(content):
+                ticks = content[:3]
+                content = BotCog.codeblock_stripping(f"```{content[3:-3]}```", True)
+                if content is None:
+                    return ""
+
+                content, repl_code = content
+
+                if len(content) == 2:
+                    content = content[1]
+                else:
+                    content = content[0]
+
+                space_left = 204
+                if len(content) >= space_left:
+                    current_length = 0
+                    lines_walked = 0
+                    for line in content.splitlines(keepends=True):
+                        if current_length + len(line) > space_left or lines_walked == 10:
+                            break
+                        current_length += len(line)
+                        lines_walked += 1
+                    content = content[:current_length] + "#..."
+                content_escaped_markdown = RE_MARKDOWN.sub(r'\\\1', content)
+                return (
+                    "It looks like you are trying to paste code into this channel.\n\n"
+                    "You seem to be using the wrong symbols to indicate where the codeblock should start. "
+                    f"The correct symbols would be \\`\\`\\`, not `{ticks}`.\n\n"
+                    "**Here is an example of how it should look:**\n"
+                    f"\\`\\`\\`python\n{content_escaped_markdown}\n\\`\\`\\`\n\n"
+                    "**This will result in the following:**\n"
+                    f"```python\n{content}\n```"
+                )
+
+            content = BotCog.codeblock_stripping(content, False)
+            if content is None:
+                return ""
+
+            content, repl_code = content
+            # Attempts to parse the message into an AST node.
+            # Invalid Python code will raise a SyntaxError.
+            tree = ast.parse(content[0])
+
+            # Multiple lines of single words could be interpreted as expressions.
+            # This check is to avoid all nodes being parsed as expressions.
+            # (e.g. words over multiple lines)
+            if all(isinstance(node, ast.Expr) for node in tree.body) and not repl_code:
+                log.trace("The code consists only of expressions, not sending instructions")
+                return ""
+
+            # Shorten the code to 10 lines and/or 204 characters.
+            space_left = 204
+            if content and repl_code:
+                content = content[1]
+            else:
+                content = content[0]
+
+            if len(content) >= space_left:
+                current_length = 0
+                lines_walked = 0
+                for line in content.splitlines(keepends=True):
+                    if current_length + len(line) > space_left or lines_walked == 10:
+                        break
+                    current_length += len(line)
+                    lines_walked += 1
+                content = content[:current_length] + "#..."
+
+            content_escaped_markdown = RE_MARKDOWN.sub(r'\\\1', content)
+            return (
+                "It looks like you're trying to paste code into this channel.\n\n"
+                "Discord has support for Markdown, which allows you to post code with full "
+                "syntax highlighting. Please use these whenever you paste code, as this "
+                "helps improve the legibility and makes it easier for us to help you.\n\n"
+                f"**To do this, use the following method:**\n"
+                f"\\`\\`\\`python\n{content_escaped_markdown}\n\\`\\`\\`\n\n"
+                "**This will result in the following:**\n"
+                f"```python\n{content}\n```"
+            )
+
+        except SyntaxError:
+            log.trace(
+                "When we tried to parse a message in a help channel as Python code, ast.parse raised a "
+                "SyntaxError. This probably just means it wasn't Python code. "
+                f"The message that was posted was:\n\n{message_content}\n\n"
+            )
+            return ""
+
+    @staticmethod
+    def is_formatted(content: str) -> bool:
+        """Return True if `content` has no poorly formatted Python code."""
+        return BotCog.codeblock_stripping(content, BotCog.has_bad_ticks(content)) is None
+
+    async def analyse(self, func: Callable[[str], T], content: str) -> Optional[T]:
+        """
+        Return the result of `func` for the message `content`.
+
+        Content longer than `MAX_INLINE_LENGTH` is analysed in a separate process to not block the
+        event loop. Results are cached by a hash of the content, so edits which don't change the
+        content, or repeated messages, aren't analysed again.
+
+        Return None if the analysing process died; the process is recreated for the next analysis.
+        """
+        key = (func.__name__, hashlib.sha256(content.encode("utf-8")).digest())
+        if key in self.analysis_cache:
+            self.analysis_cache.move_to_end(key)
+            return self.analysis_cache[key]
+
+        if len(content) > MAX_INLINE_LENGTH:
+            if self.executor is None:
+                # Forking the bot's process could deadlock the child on a lock held by another thread,
+                # like the log listener's, so the process is spawned instead.
+                self.executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+
+            try:
+                result = await self.bot.loop.run_in_executor(self.executor, func, content)
+            except BrokenProcessPool:
+                log.warning("The process analysing long messages died; skipping the analysis.")
+                self.executor.shutdown(wait=False)
+                self.executor = None
+                return None
+        else:
+            result = func(content)
+
+        self.analysis_cache[key] = result
+        if len(self.analysis_cache) > ANALYSIS_CACHE_SIZE:
+            self.analysis_cache.popitem(last=False)
+
+        return result
+
+    def is_on_cooldown(self, channel_id: int) -> bool:
+        """Return True if instructions were sent to the channel with `channel_id` too recently."""
+        return not DEBUG_MODE and (time.time() - self.channel_cooldowns.get(channel_id, 0)) < CODEBLOCK_COOLDOWN
 
     @Cog.listener()
     async def on_message(self, msg: Message) -> None:
@@ -238,120 +407,34 @@ class BotCog(Cog, name="Bot"):
                 or msg.channel.id in self.channel_whitelist
             )
             and not msg.author.bot
+            # Check the cooldown first to skip all parsing when no instructions would be sent
+            and not self.is_on_cooldown(msg.channel.id)
             and len(msg.content.splitlines()) > 3
-            and not TokenRemover.find_token_in_message(msg)
-            and not WEBHOOK_URL_RE.search(msg.content)
+            and not scan_message(msg).found
         )
+        if not parse_codeblock:
+            return
 
-        if parse_codeblock:  # no token in the msg
-            on_cooldown = (time.time() - self.channel_cooldowns.get(msg.channel.id, 0)) < 300
-            if not on_cooldown or DEBUG_MODE:
-                try:
-                    if self.has_bad_ticks(msg):
-                        ticks = msg.content[:3]
-                        content = self.codeblock_stripping(f"```{msg.content[3:-3]}```", True)
-                        if content is None:
-                            return
-
-                        content, repl_code = content
-
-                        if len(content) == 2:
-                            content = content[1]
-                        else:
-                            content = content[0]
-
-                        space_left = 204
-                        if len(content) >= space_left:
-                            current_length = 0
-                            lines_walked = 0
-                            for line in content.splitlines(keepends=True):
-                                if current_length + len(line) > space_left or lines_walked == 10:
-                                    break
-                                current_length += len(line)
-                                lines_walked += 1
-                            content = content[:current_length] + "#..."
-                        content_escaped_markdown = RE_MARKDOWN.sub(r'\\\1', content)
-                        howto = (
-                            "It looks like you are trying to paste code into this channel.\n\n"
-                            "You seem to be using the wrong symbols to indicate where the codeblock should start. "
-                            f"The correct symbols would be \\`\\`\\`, not `{ticks}`.\n\n"
-                            "**Here is an example of how it should look:**\n"
-                            f"\\`\\`\\`python\n{content_escaped_markdown}\n\\`\\`\\`\n\n"
-                            "**This will result in the following:**\n"
-                            f"```python\n{content}\n```"
-                        )
+        howto = await self.analyse(BotCog.get_howto, msg.content)
+        # Instructions may have been sent to the channel while the message was being analysed
+        if not howto or self.is_on_cooldown(msg.channel.id):
+            return
 
-                    else:
-                        howto = ""
-                        content = self.codeblock_stripping(msg.content, False)
-                        if content is None:
-                            return
-
-                        content, repl_code = content
-                        # Attempts to parse the message into an AST node.
-                        # Invalid Python code will raise a SyntaxError.
-                        tree = ast.parse(content[0])
-
-                        # Multiple lines of single words could be interpreted as expressions.
-                        # This check is to avoid all nodes being parsed as expressions.
-                        # (e.g. words over multiple lines)
-                        if not all(isinstance(node, ast.Expr) for node in tree.body) or repl_code:
-                            # Shorten the code to 10 lines and/or 204 characters.
-                            space_left = 204
-                            if content and repl_code:
-                                content = content[1]
-                            else:
-                                content = content[0]
-
-                            if len(content) >= space_left:
-                                current_length = 0
-                                lines_walked = 0
-                                for line in content.splitlines(keepends=True):
-                                    if current_length + len(line) > space_left or lines_walked == 10:
-                                        break
-                                    current_length += len(line)
-                                    lines_walked += 1
-                                content = content[:current_length] + "#..."
-
-                            content_escaped_markdown = RE_MARKDOWN.sub(r'\\\1', content)
-                            howto += (
-                                "It looks like you're trying to paste code into this channel.\n\n"
-                                "Discord has support for Markdown, which allows you to post code with full "
-                                "syntax highlighting. Please use these whenever you paste code, as this "
-                                "helps improve the legibility and makes it easier for us to help you.\n\n"
-                                f"**To do this, use the following method:**\n"
-                                f"\\`\\`\\`python\n{content_escaped_markdown}\n\\`\\`\\`\n\n"
-                                "**This will result in the following:**\n"
-                                f"```python\n{content}\n```"
-                            )
-
-                            log.debug(f"{msg.author} posted something that needed to be put inside python code "
-                                      "blocks. Sending the user some instructions.")
-                        else:
-                            log.trace("The code consists only of expressions, not sending instructions")
-
-                    if howto != "":
-                        # Increase amount of codeblock correction in stats
-                        self.bot.stats.incr("codeblock_corrections")
-                        howto_embed = Embed(description=howto)
-                        bot_message = await msg.channel.send(f"Hey {msg.author.mention}!", embed=howto_embed)
-                        self.codeblock_message_ids[msg.id] = bot_message.id
-
-                        self.bot.loop.create_task(
-                            wait_for_deletion(bot_message, (msg.author.id,), self.bot)
-                        )
-                    else:
-                        return
+        log.debug(f"{msg.author} posted something that needed to be put inside python code "
+                  "blocks. Sending the user some instructions.")
 
-                    if msg.channel.id not in self.channel_whitelist:
-                        self.channel_cooldowns[msg.channel.id] = time.time()
+        # Increase amount of codeblock correction in stats
+        self.bot.stats.incr("codeblock_corrections")
+        howto_embed = Embed(description=howto)
+        bot_message = await msg.channel.send(f"Hey {msg.author.mention}!", embed=howto_embed)
+        self.codeblock_message_ids[msg.id] = bot_message.id
+
+        self.bot.loop.create_task(
+            wait_for_deletion(bot_message, (msg.author.id,), self.bot)
+        )
 
-                except SyntaxError:
-                    log.trace(
-                        f"{msg.author} posted in a help channel, and when we tried to parse it as Python code, "
-                        "ast.parse raised a SyntaxError. This probably just means it wasn't Python code. "
-                        f"The message that was posted was:\n\n{msg.content}\n\n"
-                    )
+        if msg.channel.id not in self.channel_whitelist:
+            self.channel_cooldowns[msg.channel.id] = time.time()
 
     @Cog.listener()
     async def on_raw_message_edit(self, payload: RawMessageUpdateEvent) -> None:
@@ -366,19 +449,16 @@ class BotCog(Cog, name="Bot"):
         ):
             return
 
-        # Retrieve channel and message objects for use later
-        channel = self.bot.get_channel(int(payload.data.get("channel_id")))
-        user_message = await channel.fetch_message(payload.message_id)
-
-        #  Checks to see if the user has corrected their codeblock.  If it's fixed, has_fixed_codeblock will be None
-        has_fixed_codeblock = self.codeblock_stripping(payload.data.get("content"), self.has_bad_ticks(user_message))
+        #  Checks to see if the user has corrected their codeblock.
+        if not await self.analyse(BotCog.is_formatted, payload.data["content"]):
+            return
 
         # If the message is fixed, delete the bot message and the entry from the id dictionary
-        if has_fixed_codeblock is None:
-            bot_message = await channel.fetch_message(self.codeblock_message_ids[payload.message_id])
-            await bot_message.delete()
-            del self.codeblock_message_ids[payload.message_id]
-            log.trace("User's incorrect code block has been fixed. Removing bot formatting message.")
+        channel = self.bot.get_channel(int(payload.data.get("channel_id")))
+        bot_message = await channel.fetch_message(self.codeblock_message_ids[payload.message_id])
+        await bot_message.delete()
+        del self.codeblock_message_ids[payload.message_id]
+        log.trace("User's incorrect code block has been fixed. Removing bot formatting message.")
 
 
 def setup(bot: Bot) -> None:
@@ -1,11 +1,16 @@
+import asyncio
+import itertools
 import logging
 import random
 import re
-from typing import Iterable, Optional
+from datetime import datetime, timedelta
+from operator import attrgetter
+from typing import Callable, Iterable, List, Optional
 
-from discord import Colour, Embed, Message, TextChannel, User
+from discord import Colour, Embed, Message, NotFound, TextChannel, User
 from discord.ext import commands
 from discord.ext.commands import Cog, Context, group, has_any_role
+from discord.utils import time_snowflake
 
 from bot.bot import Bot
 from bot.constants import (
@@ -15,6 +20,12 @@ from bot.exts.moderation.modlog import ModLog
 
 log = logging.getLogger(__name__)
 
+# Messages older than this can't be deleted in bulk.
+BULK_DELETE_MAX_AGE = timedelta(days=14)
+
+# Maximum amount of messages which can be deleted in a single bulk delete request.
+BULK_DELETE_LIMIT = 100
+
 
 class Clean(Cog):
     """
@@ -36,6 +47,73 @@ class Clean(Cog):
         """Get currently loaded ModLog cog instance."""
         return self.bot.get_cog("ModLog")
 
+    async def _delete_messages(self, channel: TextChannel, messages: List[Message]) -> None:
+        """
+        Delete `messages` from `channel` without them being logged by the mod log.
+
+        All messages are deleted in a single request, so there must be at most 100 messages,
+        all newer than 14 days.
+        """
+        self.mod_log.ignore_many(Event.message_delete, (message.id for message in messages))
+        await channel.delete_messages(messages)
+
+    async def _delete_old_message(self, message: Message) -> None:
+        """Delete a single `message`, which is too old to be bulk deleted, without it being logged by the mod log."""
+        self.mod_log.ignore(Event.message_delete, message.id)
+
+        try:
+            await message.delete()
+        except NotFound:
+            log.info(f"Tried to delete message `{message.id}`, but message could not be found.")
+
+    async def _clean_channel(
+        self,
+        channel: TextChannel,
+        amount: int,
+        predicate: Optional[Callable[[Message], bool]],
+        until_message: Optional[Message],
+    ) -> List[Message]:
+        """
+        Delete the messages matching `predicate` among the latest `amount` messages in `channel`.
+
+        The channel's history is only fetched once; matching messages are deleted in chunks of
+        `BULK_DELETE_LIMIT` while it is being traversed. Messages older than 14 days can't be deleted
+        in bulk, so they are deleted one by one. Return the deleted messages in chronological order.
+        """
+        deleted = []
+        pending = []
+        bulk_delete_after = time_snowflake(datetime.utcnow() - BULK_DELETE_MAX_AGE)
+
+        async for message in channel.history(limit=amount):
+            # If at any point the cancel command is invoked, we should stop.
+            if not self.cleaning:
+                break
+
+            # We could use IDs here, however in case the message we are looking for gets deleted,
+            # we won't have a way to figure that out, thus checking for datetime is more reliable.
+            if until_message and message.created_at < until_message.created_at:
+                break
+
+            if predicate is not None and not predicate(message):
+                continue
+
+            if message.id > bulk_delete_after:
+                pending.append(message)
+
+                if len(pending) == BULK_DELETE_LIMIT:
+                    await self._delete_messages(channel, pending)
+                    deleted.extend(pending)
+                    pending = []
+            else:
+                await self._delete_old_message(message)
+                deleted.append(message)
+
+        if pending:
+            await self._delete_messages(channel, pending)
+            deleted.extend(pending)
+
+        return sorted(deleted, key=attrgetter("id"))
+
     async def _clean_messages(
         self,
         amount: int,
@@ -57,27 +135,20 @@ class Clean(Cog):
 
         def predicate_regex(message: Message) -> bool:
             """Check if the regex provided in _clean_messages matches the message content or any embed attributes."""
-            content = [message.content]
+            if message.content and pattern.search(message.content):
+                return True
 
-            # Add the content for all embed attributes
             for embed in message.embeds:
-                content.append(embed.title)
-                content.append(embed.description)
-                content.append(embed.footer.text)
-                content.append(embed.author.name)
+                attributes = [embed.title, embed.description, embed.footer.text, embed.author.name]
                 for field in embed.fields:
-                    content.append(field.name)
-                    content.append(field.value)
+                    attributes.append(field.name)
+                    attributes.append(field.value)
 
-            # Get rid of empty attributes and turn it into a string
-            content = [attr for attr in content if attr]
-            content = "\n".join(content)
+                # Embed attributes which aren't set are `Embed.Empty`, which is falsy.
+                if any(attr and pattern.search(attr) for attr in attributes):
+                    return True
 
-            # Now let's see if there's a regex match
-            if not content:
-                return False
-            else:
-                return bool(re.search(regex.lower(), content.lower()))
+            return False
 
         # Is this an acceptable amount of messages to clean?
         if amount > CleanMessages.message_limit:
@@ -105,6 +176,7 @@ class Clean(Cog):
         elif user:
             predicate = predicate_specific_user  # Delete messages from specific user
         elif regex:
+            pattern = re.compile(regex, re.IGNORECASE)
             predicate = predicate_regex          # Delete messages that match regex
         else:
             predicate = None                     # Delete all messages
@@ -117,53 +189,20 @@ class Clean(Cog):
         self.mod_log.ignore(Event.message_delete, ctx.message.id)
         await ctx.message.delete()
 
-        messages = []
-        message_ids = []
+        # Clean all channels concurrently. discord.py's HTTP client paces the requests according to
+        # each channel's rate limits.
         self.cleaning = True
+        try:
+            deleted_per_channel = await asyncio.gather(*(
+                self._clean_channel(channel, amount, predicate, until_message)
+                for channel in channels
+            ))
+        finally:
+            self.cleaning = False
 
-        # Find the IDs of the messages to delete. IDs are needed in order to ignore mod log events.
-        for channel in channels:
-            async for message in channel.history(limit=amount):
-
-                # If at any point the cancel command is invoked, we should stop.
-                if not self.cleaning:
-                    return
-
-                # If we are looking for specific message.
-                if until_message:
-
-                    # we could use ID's here however in case if the message we are looking for gets deleted,
-                    # we won't have a way to figure that out thus checking for datetime should be more reliable
-                    if message.created_at < until_message.created_at:
-                        # means we have found the message until which we were supposed to be deleting.
-                        break
-
-                    # Since we will be using `delete_messages` method of a TextChannel and we need message objects to
-                    # use it as well as to send logs we will start appending messages here instead adding them from
-                    # purge.
-                    messages.append(message)
-
-                # If the message passes predicate, let's save it.
-                if predicate is None or predicate(message):
-                    message_ids.append(message.id)
-
-        self.cleaning = False
-
-        # Now let's delete the actual messages with purge.
-        self.mod_log.ignore(Event.message_delete, *message_ids)
-        for channel in channels:
-            if until_message:
-                for i in range(0, len(messages), 100):
-                    # while purge automatically handles the amount of messages
-                    # delete_messages only allows for up to 100 messages at once
-                    # thus we need to paginate the amount to always be <= 100
-                    await channel.delete_messages(messages[i:i + 100])
-            else:
-                messages += await channel.purge(limit=amount, check=predicate)
+        messages = list(itertools.chain.from_iterable(deleted_per_channel))
 
-        # Reverse the list to restore chronological order
         if messages:
-            messages = reversed(messages)
             log_url = await self.mod_log.upload_log(messages, ctx.author.id)
         else:
             # Can't build an embed, nothing to clean!
@@ -178,7 +217,7 @@ class Clean(Cog):
         target_channels = ", ".join(channel.mention for channel in channels)
 
         message = (
-            f"**{len(message_ids)}** messages deleted in {target_channels} by "
+            f"**{len(messages)}** messages deleted in {target_channels} by "
             f"{ctx.author.mention}\n\n"
             f"A log of the deleted messages can be found [here]({log_url})."
         )
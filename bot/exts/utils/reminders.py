@@ -3,6 +3,7 @@ import logging
 import random
 import textwrap
 import typing as t
+from collections import defaultdict
 from datetime import datetime, timedelta
 from operator import itemgetter
 
@@ -27,6 +28,10 @@ NAMESPACE = "reminder"  # Used for the mutually_exclusive decorator; constant to
 WHITELISTED_CHANNELS = Guild.reminder_whitelist
 MAXIMUM_REMINDERS = 5
 
+# Only reminders due within the horizon are scheduled. The reminders which come within it are fetched
+# every half a horizon, so a reminder is always scheduled well before it's due.
+REMINDER_HORIZON = timedelta(days=1)
+
 Mentionable = t.Union[discord.Member, discord.Role]
 
 
@@ -37,29 +42,81 @@ class Reminders(Cog):
         self.bot = bot
         self.scheduler = Scheduler(self.__class__.__name__)
 
-        self.bot.loop.create_task(self.reschedule_reminders())
+        # Reminders due before this time are scheduled.
+        self.horizon = datetime.min
+
+        # The IDs of each user's active reminders and the authors of those reminders.
+        # They're None until all active reminders are fetched.
+        self.user_reminders: t.Optional[t.DefaultDict[int, t.Set[int]]] = None
+        self.reminder_authors: t.Optional[t.Dict[int, int]] = None
+
+        self.reschedule_task = self.bot.loop.create_task(self.reschedule_reminders())
 
     def cog_unload(self) -> None:
         """Cancel scheduled tasks."""
+        self.reschedule_task.cancel()
         self.scheduler.cancel_all()
 
     async def reschedule_reminders(self) -> None:
-        """Get all current reminders from the API and reschedule them."""
+        """
+        Get all current reminders from the API and reschedule the ones due within the horizon.
+
+        Afterwards, the reminders which come within the horizon are periodically fetched and scheduled.
+        """
         await self.bot.wait_until_guild_available()
+
+        self.horizon = datetime.utcnow() + REMINDER_HORIZON
         response = await self.bot.api_client.get(
             'bot/reminders',
             params={'active': 'true'}
         )
 
+        self.user_reminders = defaultdict(set)
+        self.reminder_authors = {}
+        for reminder in response:
+            self.index_reminder(reminder)
+
+        await self.schedule_due_reminders(response)
+
+        while True:
+            await asyncio.sleep(REMINDER_HORIZON.total_seconds() / 2)
+
+            # A failed refresh mustn't stop the later ones, or reminders would stop being scheduled.
+            try:
+                await self.refresh_reminders()
+            except Exception:
+                log.exception("Failed to refresh the reminders due within the horizon.")
+
+    async def refresh_reminders(self) -> None:
+        """Move the horizon forward and schedule the reminders which came within it."""
+        self.horizon = datetime.utcnow() + REMINDER_HORIZON
+        response = await self.bot.api_client.get(
+            'bot/reminders',
+            params={'active': 'true', 'expiration__lte': self.horizon.isoformat()}
+        )
+        await self.schedule_due_reminders(response)
+
+    async def schedule_due_reminders(self, reminders: t.List[dict]) -> None:
+        """
+        Schedule the `reminders` due within the horizon which aren't scheduled yet.
+
+        Overdue reminders are sent immediately, and invalid reminders are deleted together.
+        """
         now = datetime.utcnow()
+        invalid_reminders = []
+
+        for reminder in reminders:
+            remind_at = isoparse(reminder['expiration']).replace(tzinfo=None)
+
+            # The API doesn't have to support filtering by expiration.
+            if remind_at > self.horizon or reminder['id'] in self.scheduler:
+                continue
 
-        for reminder in response:
             is_valid, *_ = self.ensure_valid_reminder(reminder)
             if not is_valid:
+                invalid_reminders.append(reminder['id'])
                 continue
 
-            remind_at = isoparse(reminder['expiration']).replace(tzinfo=None)
-
             # If the reminder is already overdue ...
             if remind_at < now:
                 late = relativedelta(now, remind_at)
@@ -67,8 +124,10 @@ class Reminders(Cog):
             else:
                 self.schedule_reminder(reminder)
 
+        await self.delete_reminders(invalid_reminders)
+
     def ensure_valid_reminder(self, reminder: dict) -> t.Tuple[bool, discord.User, discord.TextChannel]:
-        """Ensure reminder author and channel can be fetched otherwise delete the reminder."""
+        """Ensure reminder author and channel can be fetched; the caller is responsible for deleting it otherwise."""
         user = self.bot.get_user(reminder['author'])
         channel = self.bot.get_channel(reminder['channel_id'])
         is_valid = True
@@ -78,10 +137,53 @@ class Reminders(Cog):
                 f"Reminder {reminder['id']} invalid: "
                 f"User {reminder['author']}={user}, Channel {reminder['channel_id']}={channel}."
             )
-            asyncio.create_task(self.bot.api_client.delete(f"bot/reminders/{reminder['id']}"))
 
         return is_valid, user, channel
 
+    async def delete_reminders(self, reminder_ids: t.Collection[int]) -> None:
+        """Delete the reminders with `reminder_ids` concurrently and remove them from the index."""
+        if not reminder_ids:
+            return
+
+        log.debug(f"Deleting {len(reminder_ids)} reminders.")
+        await asyncio.gather(*(self.bot.api_client.delete(f"bot/reminders/{id_}") for id_ in reminder_ids))
+
+        for id_ in reminder_ids:
+            self.unindex_reminder(id_)
+
+    def index_reminder(self, reminder: dict) -> None:
+        """Add the `reminder` to the index of each user's reminders, if the index is built."""
+        if self.user_reminders is None:
+            return
+
+        self.user_reminders[reminder['author']].add(reminder['id'])
+        self.reminder_authors[reminder['id']] = reminder['author']
+
+    def unindex_reminder(self, reminder_id: int) -> None:
+        """Remove the reminder with `reminder_id` from the index of each user's reminders."""
+        if self.user_reminders is None:
+            return
+
+        author_id = self.reminder_authors.pop(reminder_id, None)
+        if author_id is not None:
+            self.user_reminders[author_id].discard(reminder_id)
+            if not self.user_reminders[author_id]:
+                del self.user_reminders[author_id]
+
+    async def count_reminders(self, user_id: int) -> int:
+        """Return the amount of active reminders of the user with `user_id`."""
+        if self.user_reminders is not None:
+            return len(self.user_reminders.get(user_id, ()))
+
+        # Fall back to the API until the index is built.
+        reminders = await self.bot.api_client.get(
+            'bot/reminders',
+            params={
+                'author__id': str(user_id)
+            }
+        )
+        return len(reminders)
+
     @staticmethod
     async def _send_confirmation(
         ctx: Context,
@@ -145,8 +247,16 @@ class Reminders(Cog):
                 yield mentionable
 
     def schedule_reminder(self, reminder: dict) -> None:
-        """A coroutine which sends the reminder once the time is reached, and cancels the running task."""
+        """
+        A coroutine which sends the reminder once the time is reached, and cancels the running task.
+
+        Reminders which aren't due within the horizon are scheduled when they come within it instead.
+        """
         reminder_datetime = isoparse(reminder['expiration']).replace(tzinfo=None)
+        if reminder_datetime > self.horizon:
+            log.trace(f"Not scheduling reminder #{reminder['id']}; it isn't due within the horizon.")
+            return
+
         self.scheduler.schedule_at(reminder_datetime, reminder["id"], self.send_reminder(reminder))
 
     async def _edit_reminder(self, reminder_id: int, payload: dict) -> dict:
@@ -164,8 +274,10 @@ class Reminders(Cog):
 
     async def _reschedule_reminder(self, reminder: dict) -> None:
         """Reschedule a reminder object."""
-        log.trace(f"Cancelling old task #{reminder['id']}")
-        self.scheduler.cancel(reminder["id"])
+        # Reminders which aren't due within the horizon aren't scheduled.
+        if reminder["id"] in self.scheduler:
+            log.trace(f"Cancelling old task #{reminder['id']}")
+            self.scheduler.cancel(reminder["id"])
 
         log.trace(f"Scheduling new task #{reminder['id']}")
         self.schedule_reminder(reminder)
@@ -176,6 +288,7 @@ class Reminders(Cog):
         is_valid, user, channel = self.ensure_valid_reminder(reminder)
         if not is_valid:
             # No need to cancel the task too; it'll simply be done once this coroutine returns.
+            await self.delete_reminders([reminder['id']])
             return
 
         embed = discord.Embed()
@@ -205,6 +318,7 @@ class Reminders(Cog):
 
         log.debug(f"Deleting reminder #{reminder['id']} (the user has been reminded).")
         await self.bot.api_client.delete(f"bot/reminders/{reminder['id']}")
+        self.unindex_reminder(reminder['id'])
 
     @group(name="remind", aliases=("reminder", "reminders", "remindme"), invoke_without_command=True)
     async def remind_group(
@@ -230,17 +344,9 @@ class Reminders(Cog):
                 await send_denial(ctx, "Sorry, you can't do that here!")
                 return
 
-            # Get their current active reminders
-            active_reminders = await self.bot.api_client.get(
-                'bot/reminders',
-                params={
-                    'author__id': str(ctx.author.id)
-                }
-            )
-
             # Let's limit this, so we don't get 10 000
             # reminders from kip or something like that :P
-            if len(active_reminders) > MAXIMUM_REMINDERS:
+            if await self.count_reminders(ctx.author.id) > MAXIMUM_REMINDERS:
                 await send_denial(ctx, "You have too many active reminders!")
                 return
 
@@ -283,6 +389,7 @@ class Reminders(Cog):
             delivery_dt=expiration,
         )
 
+        self.index_reminder(reminder)
         self.schedule_reminder(reminder)
 
     @remind_group.command(name="list")
@@ -405,7 +512,9 @@ class Reminders(Cog):
             return
 
         await self.bot.api_client.delete(f"bot/reminders/{id_}")
-        self.scheduler.cancel(id_)
+        self.unindex_reminder(id_)
+        if id_ in self.scheduler:
+            self.scheduler.cancel(id_)
 
         await self._send_confirmation(
             ctx,
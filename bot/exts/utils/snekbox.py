@@ -1,12 +1,16 @@
+import ast
 import asyncio
 import contextlib
 import datetime
+import hashlib
 import logging
 import re
 import textwrap
+import time
+from collections import Counter, OrderedDict, deque
 from functools import partial
 from signal import Signals
-from typing import Optional, Tuple
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
 
 from discord import HTTPException, Message, NotFound, Reaction, User
 from discord.ext.commands import Cog, Context, command, guild_only
@@ -50,6 +54,142 @@ SIGKILL = 9
 REEVAL_EMOJI = '\U0001f501'  # :repeat:
 REEVAL_TIMEOUT = 30
 
+# Limits on the eval jobs sent to snekbox at once, in total and from a single channel
+MAX_JOBS = 3
+MAX_CHANNEL_JOBS = 1
+
+# Results of deterministic code are reused for repeated evals of the same code within the TTL
+RESULT_CACHE_TTL = 60
+RESULT_CACHE_SIZE = 128
+# Code mentioning any of these names may give a different result each time it's run.
+# Sets are included because their iteration order depends on hash randomisation.
+NON_DETERMINISTIC_REGEX = re.compile(
+    r"\b(?:random|secrets|uuid|time|datetime|os|sys|id|hash|input|set|frozenset)\b"
+)
+# Memory addresses, e.g. in the default repr of objects, differ between runs
+MEMORY_ADDRESS_REGEX = re.compile(r"\b0x[0-9a-fA-F]{6,}\b")
+# Return codes of jobs which ran to completion, as opposed to timeouts and sandbox errors
+CACHEABLE_RETURN_CODES = (0, 1)
+
+
+class JobQueue:
+    """
+    A FIFO queue of eval jobs, which lets a job start while below a global and a per-channel limit.
+
+    Jobs from a channel at its limit don't hold up jobs from other channels queued after them.
+    """
+
+    def __init__(self, max_jobs: int, max_channel_jobs: int):
+        self.max_jobs = max_jobs
+        self.max_channel_jobs = max_channel_jobs
+
+        self._waiting: Deque[Tuple[int, asyncio.Future]] = deque()
+        self._running: Dict[int, int] = Counter()
+        self._n_running = 0
+
+    def enqueue(self, channel_id: int) -> asyncio.Future:
+        """Queue a job from `channel_id` and return a future which is done once the job can start."""
+        job = asyncio.get_running_loop().create_future()
+        self._waiting.append((channel_id, job))
+        self._start_jobs()
+        return job
+
+    def position(self, job: asyncio.Future) -> int:
+        """Return the 1-based position of the waiting `job` in the queue."""
+        for position, (_, waiting_job) in enumerate(self._waiting, 1):
+            if waiting_job is job:
+                return position
+        raise ValueError("The job isn't waiting in the queue.")
+
+    def release(self, channel_id: int) -> None:
+        """Mark a job from `channel_id` as finished and start the next jobs which can run."""
+        self._running[channel_id] -= 1
+        if not self._running[channel_id]:
+            del self._running[channel_id]
+        self._n_running -= 1
+        self._start_jobs()
+
+    def discard(self, channel_id: int, job: asyncio.Future) -> None:
+        """Remove `job` from the queue, releasing its slot if it had already been started."""
+        if job.done() and not job.cancelled():
+            self.release(channel_id)
+        else:
+            job.cancel()
+            self._start_jobs()
+
+    def _start_jobs(self) -> None:
+        """Start waiting jobs in order of their queueing for as long as the limits allow."""
+        for item in list(self._waiting):
+            if self._n_running >= self.max_jobs:
+                break
+
+            channel_id, job = item
+            if job.cancelled():
+                self._waiting.remove(item)
+            elif self._running[channel_id] < self.max_channel_jobs:
+                self._waiting.remove(item)
+                self._running[channel_id] += 1
+                self._n_running += 1
+                job.set_result(None)
+
+
+class ResultCache:
+    """A cache of eval results keyed by a hash of the code, with entries expiring `ttl` seconds after being added."""
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._results: Dict[str, Tuple[float, dict]] = OrderedDict()
+
+    @staticmethod
+    def get_key(code: str) -> str:
+        """Return a hash of `code`, normalized to ignore trailing whitespace and blank lines."""
+        normalized = "\n".join(line.rstrip() for line in code.strip("\n").splitlines())
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def uses_set_literals(code: str) -> bool:
+        """Return True if `code` contains a set display or set comprehension."""
+        try:
+            tree = ast.parse(code)
+        except (SyntaxError, ValueError):
+            # Code which doesn't compile fails the same way every time
+            return False
+        return any(isinstance(node, (ast.Set, ast.SetComp)) for node in ast.walk(tree))
+
+    @classmethod
+    def is_cacheable(cls, code: str, results: dict) -> bool:
+        """Return True if the `results` of `code` would be the same every time it's run."""
+        return (
+            results["returncode"] in CACHEABLE_RETURN_CODES
+            and not NON_DETERMINISTIC_REGEX.search(code)
+            and not MEMORY_ADDRESS_REGEX.search(results.get("stdout", ""))
+            and not cls.uses_set_literals(code)
+        )
+
+    def get(self, code: str) -> Optional[dict]:
+        """Return the cached results of `code`, if any."""
+        self._expire()
+        entry = self._results.get(self.get_key(code))
+        return entry[1] if entry else None
+
+    def set(self, code: str, results: dict) -> None:
+        """Cache the `results` of `code` if they're deterministic."""
+        if not self.is_cacheable(code, results):
+            return
+
+        key = self.get_key(code)
+        self._results[key] = (time.monotonic() + self.ttl, results)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+
+    def _expire(self) -> None:
+        """Remove expired results, which are all at the start of the cache."""
+        now = time.monotonic()
+        while self._results and next(iter(self._results.values()))[0] <= now:
+            self._results.popitem(last=False)
+
 
 class Snekbox(Cog):
     """Safe evaluation of Python code using Snekbox."""
@@ -57,6 +197,58 @@ class Snekbox(Cog):
     def __init__(self, bot: Bot):
         self.bot = bot
         self.jobs = {}
+        self.queue = JobQueue(MAX_JOBS, MAX_CHANNEL_JOBS)
+        self.result_cache = ResultCache(RESULT_CACHE_TTL, RESULT_CACHE_SIZE)
+
+    @contextlib.asynccontextmanager
+    async def job_slot(self, ctx: Context) -> AsyncIterator[None]:
+        """
+        Wait until the eval job from `ctx` can be sent to snekbox and hold its slot in the queue.
+
+        If the job has to wait, the author is told their position in the queue.
+        """
+        queued_at = time.monotonic()
+        job = self.queue.enqueue(ctx.channel.id)
+        notice = None
+
+        try:
+            if not job.done():
+                position = self.queue.position(job)
+                log.trace(f"{ctx.author}'s job is queued at position {position}")
+                notice = await ctx.send(
+                    f"{ctx.author.mention} Your eval job is queued at position {position}, "
+                    f"it will run once the jobs before it finish."
+                )
+                await job
+        except BaseException:
+            self.queue.discard(ctx.channel.id, job)
+            raise
+        finally:
+            if notice:
+                with contextlib.suppress(HTTPException):
+                    await notice.delete()
+
+        self.bot.stats.timing("snekbox.queue_wait", (time.monotonic() - queued_at) * 1000)
+        try:
+            yield
+        finally:
+            self.queue.release(ctx.channel.id)
+
+    async def eval_job(self, ctx: Context, code: str) -> dict:
+        """Return the results of evaluating `code`, reusing cached results of deterministic code."""
+        results = self.result_cache.get(code)
+        if results is not None:
+            log.trace("Using cached results of the code")
+            self.bot.stats.incr("snekbox.cache_hits")
+            return results
+
+        async with self.job_slot(ctx):
+            start = time.monotonic()
+            results = await self.post_eval(code)
+            self.bot.stats.timing("snekbox.eval_time", (time.monotonic() - start) * 1000)
+
+        self.result_cache.set(code, results)
+        return results
 
     async def post_eval(self, code: str) -> dict:
         """Send a POST request to the Snekbox API to evaluate code and return the results."""
@@ -185,7 +377,7 @@ class Snekbox(Cog):
         Return the bot response.
         """
         async with ctx.typing():
-            results = await self.post_eval(code)
+            results = await self.eval_job(ctx, code)
             msg, error = self.get_results_message(results)
 
             if error:
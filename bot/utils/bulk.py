@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+import typing as t
+from collections import Counter
+from dataclasses import dataclass, field
+
+import discord
+
+T = t.TypeVar("T")
+
+# The amount of times a request is attempted if it keeps being rate limited despite discord.py's own retries.
+MAX_ATTEMPTS = 3
+
+
+@dataclass
+class BulkResult:
+    """The outcome of a `BulkExecutor.run`."""
+
+    n_success: int = 0
+    failed_statuses: t.Counter[int] = field(default_factory=Counter)
+    elapsed: float = 0
+    paused: bool = False  # True if the run was paused before all items were processed.
+    exception: t.Optional[Exception] = None  # The exception which aborted the run, if any.
+
+    @property
+    def n_failed(self) -> int:
+        """Return the amount of requests which failed with an HTTP error."""
+        return sum(self.failed_statuses.values())
+
+    @property
+    def throughput(self) -> float:
+        """Return the amount of successful requests per second."""
+        return self.n_success / self.elapsed if self.elapsed else 0
+
+
+class BulkExecutor:
+    """
+    Send a request for each of many items concurrently.
+
+    Discord.py holds a lock for each rate limit bucket and sleeps on it according to the rate limit
+    headers, so concurrent requests to the same bucket are paced by Discord's live limits while
+    requests to different buckets, such as DMs to different users, are sent in parallel. Requests
+    which still fail with a 429 are retried after the time given in their Retry-After header.
+
+    An executor can be paused with `pause`; runs then stop taking new items and return once their
+    in-flight requests are done. `resume` allows the next runs to process their items again.
+    """
+
+    def __init__(self, name: str, paused: bool = False):
+        self.name = name
+        self.paused = paused
+
+        self._log = logging.getLogger(f"{__name__}.{name}")
+
+    def pause(self) -> None:
+        """Stop the current and future runs from sending further requests."""
+        self._log.info("Pausing bulk requests.")
+        self.paused = True
+
+    def resume(self) -> None:
+        """Allow runs to send requests again."""
+        self._log.info("Resuming bulk requests.")
+        self.paused = False
+
+    async def run(
+        self,
+        items: t.Iterable[T],
+        request: t.Callable[[T], t.Awaitable[None]],
+        max_concurrency: int,
+    ) -> BulkResult:
+        """
+        Call `request` for each of the `items` with up to `max_concurrency` requests in flight.
+
+        `items` is consumed lazily, so it can skip items which no longer need a request. HTTP errors are
+        counted in the result by their status. Any other exception raised by a request aborts the run
+        and is stored in the result.
+        """
+        items = iter(items)
+        result = BulkResult()
+        start = time.perf_counter()
+
+        async def worker() -> None:
+            while True:
+                if self.paused:
+                    result.paused = True
+                    return
+
+                try:
+                    item = next(items)
+                except StopIteration:
+                    return
+
+                await self._send(item, request, result)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(max_concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        except Exception as e:
+            result.exception = e
+        finally:
+            for task in workers:
+                task.cancel()
+
+        result.elapsed = time.perf_counter() - start
+
+        self._log.info(
+            f"Sent {result.n_success} successful requests in {result.elapsed:.1f} seconds "
+            f"({result.throughput:.1f}/s); {result.n_failed} failed."
+        )
+        return result
+
+    async def _send(self, item: T, request: t.Callable[[T], t.Awaitable[None]], result: BulkResult) -> None:
+        """Send the `request` for `item`, retrying it if it's rate limited, and record its outcome."""
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                await request(item)
+            except discord.HTTPException as e:
+                if e.status == 429 and attempt < MAX_ATTEMPTS:
+                    retry_after = float(e.response.headers.get("Retry-After", 1))
+                    self._log.debug(f"Request for {item} was rate limited; retrying in {retry_after} seconds.")
+                    await asyncio.sleep(retry_after)
+                    continue
+
+                result.failed_statuses[e.status] += 1
+            else:
+                result.n_success += 1
+
+            return
@@ -1,7 +1,7 @@
-import importlib
-import inspect
+import ast
 import pkgutil
-from typing import Iterator, NoReturn
+from pathlib import Path
+from typing import Iterable, Iterator
 
 from bot import exts
 
@@ -11,20 +11,40 @@ def unqualify(name: str) -> str:
     return name.rsplit(".", maxsplit=1)[-1]
 
 
-def walk_extensions() -> Iterator[str]:
-    """Yield extension names from the bot.exts subpackage."""
+def _defines_setup(package_path: Path) -> bool:
+    """
+    Return True if the `__init__` module of the package at `package_path` has a top-level `setup` function.
+
+    The module's source is parsed rather than imported, so finding extensions doesn't import
+    the packages and all their dependencies.
+    """
+    tree = ast.parse((package_path / "__init__.py").read_text(encoding="utf-8"))
+    return any(
+        isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == "setup"
+        for node in tree.body
+    )
 
-    def on_error(name: str) -> NoReturn:
-        raise ImportError(name=name)  # pragma: no cover
 
-    for module in pkgutil.walk_packages(exts.__path__, f"{exts.__name__}.", onerror=on_error):
+def _walk_modules(paths: Iterable[str], prefix: str) -> Iterator[pkgutil.ModuleInfo]:
+    """Recursively yield the modules and packages found in `paths` without importing any of them."""
+    for module in pkgutil.iter_modules(paths, prefix):
+        yield module
+
+        if module.ispkg:
+            package_path = Path(module.module_finder.path, unqualify(module.name))
+            yield from _walk_modules([str(package_path)], f"{module.name}.")
+
+
+def walk_extensions() -> Iterator[str]:
+    """Yield extension names from the bot.exts subpackage."""
+    for module in _walk_modules(exts.__path__, f"{exts.__name__}."):
         if unqualify(module.name).startswith("_"):
             # Ignore module/package names starting with an underscore.
             continue
 
         if module.ispkg:
-            imported = importlib.import_module(module.name)
-            if not inspect.isfunction(getattr(imported, "setup", None)):
+            package_path = Path(module.module_finder.path, unqualify(module.name))
+            if not _defines_setup(package_path):
                 # If it lacks a setup function, it's not an extension.
                 continue
 
@@ -63,29 +63,29 @@ def lock(namespace: Hashable, resource_id: ResourceId, *, raise_error: bool = Fa
 
         @wraps(func)
         async def wrapper(*args, **kwargs) -> Any:
-            log.trace(f"{name}: mutually exclusive decorator called")
+            log.trace("%s: mutually exclusive decorator called", name)
 
             if callable(resource_id):
-                log.trace(f"{name}: binding args to signature")
+                log.trace("%s: binding args to signature", name)
                 bound_args = function.get_bound_args(func, args, kwargs)
 
-                log.trace(f"{name}: calling the given callable to get the resource ID")
+                log.trace("%s: calling the given callable to get the resource ID", name)
                 id_ = resource_id(bound_args)
 
                 if inspect.isawaitable(id_):
-                    log.trace(f"{name}: awaiting to get resource ID")
+                    log.trace("%s: awaiting to get resource ID", name)
                     id_ = await id_
             else:
                 id_ = resource_id
 
-            log.trace(f"{name}: getting lock for resource {id_!r} under namespace {namespace!r}")
+            log.trace("%s: getting lock for resource %r under namespace %r", name, id_, namespace)
 
             # Get the lock for the ID. Create a lock if one doesn't exist yet.
             locks = __lock_dicts[namespace]
             lock_guard = locks.setdefault(id_, LockGuard())
 
             if not lock_guard.locked:
-                log.debug(f"{name}: resource {namespace!r}:{id_!r} is free; acquiring it...")
+                log.debug("%s: resource %r:%r is free; acquiring it...", name, namespace, id_)
                 with lock_guard:
                     return await func(*args, **kwargs)
             else:
@@ -3,10 +3,13 @@ import contextlib
 import logging
 import random
 import re
+import tempfile
+from collections import deque
 from io import BytesIO
-from typing import List, Optional, Sequence, Union
+from typing import BinaryIO, Deque, List, Optional, Sequence, Tuple, Union
 
 import discord
+from aiohttp import ClientSession
 from discord.errors import HTTPException
 from discord.ext.commands import Context
 
@@ -14,6 +17,14 @@ from bot.constants import Emojis, NEGATIVE_REPLIES
 
 log = logging.getLogger(__name__)
 
+# The amount of attachments of a message which are downloaded ahead of their upload.
+MAX_CONCURRENT_ATTACHMENTS = 3
+# The maximum total size of the attachments being re-uploaded at the same time.
+MAX_IN_FLIGHT_BYTES = 64 * 1024 * 1024
+# Attachments larger than this are buffered on disk while they're re-uploaded.
+MAX_IN_MEMORY_SIZE = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
 
 async def wait_for_deletion(
     message: discord.Message,
@@ -53,9 +64,59 @@ async def wait_for_deletion(
         await message.delete()
 
 
+class _ByteBudget:
+    """
+    Limit the total size of the files held at the same time.
+
+    Sizes are granted in the order they're requested. A size larger than the limit is only
+    granted once nothing else is held.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+
+    def _fits(self, size: int) -> bool:
+        return self.in_use == 0 or self.in_use + size <= self.limit
+
+    async def acquire(self, size: int) -> None:
+        """Wait until `size` bytes can be held."""
+        if not self._waiters and self._fits(size):
+            self.in_use += size
+            return
+
+        waiter = (size, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            if waiter[1].cancelled():
+                self._waiters.remove(waiter)
+                self._wake_up()
+            else:
+                self.release(size)
+            raise
+
+    def release(self, size: int) -> None:
+        """Release `size` bytes and grant the sizes which fit now."""
+        self.in_use -= size
+        self._wake_up()
+
+    def _wake_up(self) -> None:
+        while self._waiters and self._fits(self._waiters[0][0]):
+            size, future = self._waiters.popleft()
+            self.in_use += size
+            future.set_result(None)
+
+
+_in_flight_bytes = _ByteBudget(MAX_IN_FLIGHT_BYTES)
+
+
 async def send_attachments(
     message: discord.Message,
     destination: Union[discord.TextChannel, discord.Webhook],
+    http_session: ClientSession,
     link_large: bool = True
 ) -> List[str]:
     """
@@ -64,41 +125,51 @@ async def send_attachments(
     Each attachment is sent as a separate message to more easily comply with the request/file size
     limit. If link_large is True, attachments which are too large are instead grouped into a single
     embed which links to them.
+
+    Up to `MAX_CONCURRENT_ATTACHMENTS` attachments are downloaded ahead of their upload with the
+    `http_session`, but they're uploaded in their original order. The attachments being re-uploaded
+    by all calls take up at most `MAX_IN_FLIGHT_BYTES`.
     """
     large = []
     urls = []
+    uploads = []
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_ATTACHMENTS)
+
     for attachment in message.attachments:
-        failure_msg = (
-            f"Failed to re-upload attachment {attachment.filename} from message {message.id}"
-        )
+        # Allow 512 bytes of leeway for the rest of the request.
+        # This should avoid most files that are too large,
+        # but some may get through hence the try-catch.
+        if attachment.size <= destination.guild.filesize_limit - 512:
+            previous = uploads[-1][1] if uploads else None
+            upload = _reupload_attachment(message, attachment, destination, http_session, semaphore, previous)
+            uploads.append((attachment, asyncio.ensure_future(upload)))
+        elif link_large:
+            large.append(attachment)
+        else:
+            log.info(
+                f"Failed to re-upload attachment {attachment.filename} from message {message.id} "
+                f"because it's too large."
+            )
 
-        try:
-            # Allow 512 bytes of leeway for the rest of the request.
-            # This should avoid most files that are too large,
-            # but some may get through hence the try-catch.
-            if attachment.size <= destination.guild.filesize_limit - 512:
-                with BytesIO() as file:
-                    await attachment.save(file, use_cached=True)
-                    attachment_file = discord.File(file, filename=attachment.filename)
-
-                    if isinstance(destination, discord.TextChannel):
-                        msg = await destination.send(file=attachment_file)
-                        urls.append(msg.attachments[0].url)
-                    else:
-                        await destination.send(
-                            file=attachment_file,
-                            username=sub_clyde(message.author.display_name),
-                            avatar_url=message.author.avatar_url
-                        )
-            elif link_large:
-                large.append(attachment)
-            else:
-                log.info(f"{failure_msg} because it's too large.")
-        except HTTPException as e:
-            if link_large and e.status == 413:
-                large.append(attachment)
+    try:
+        for attachment, upload in uploads:
+            try:
+                msg = await upload
+            except HTTPException as e:
+                if link_large and e.status == 413:
+                    large.append(attachment)
+                else:
+                    log.warning(
+                        f"Failed to re-upload attachment {attachment.filename} from message {message.id} "
+                        f"with status {e.status}.",
+                        exc_info=e
+                    )
             else:
-                log.warning(f"{failure_msg} with status {e.status}.", exc_info=e)
+                if isinstance(destination, discord.TextChannel):
+                    urls.append(msg.attachments[0].url)
+    finally:
+        for _, upload in uploads:
+            upload.cancel()
 
     if link_large and large:
         desc = "\n".join(f"[{attachment.filename}]({attachment.url})" for attachment in large)
@@ -117,6 +188,68 @@ async def send_attachments(
     return urls
 
 
+async def _reupload_attachment(
+    message: discord.Message,
+    attachment: discord.Attachment,
+    destination: Union[discord.TextChannel, discord.Webhook],
+    http_session: ClientSession,
+    semaphore: asyncio.Semaphore,
+    previous: Optional[asyncio.Future],
+) -> Optional[discord.Message]:
+    """Download the `attachment` and upload it to the `destination` once the `previous` upload is done."""
+    async with semaphore:
+        await _in_flight_bytes.acquire(attachment.size)
+        try:
+            with await _download_attachment(attachment, http_session) as file:
+                if previous is not None:
+                    await asyncio.wait([previous])
+
+                attachment_file = discord.File(file, filename=attachment.filename)
+                if isinstance(destination, discord.TextChannel):
+                    return await destination.send(file=attachment_file)
+                else:
+                    return await destination.send(
+                        file=attachment_file,
+                        username=sub_clyde(message.author.display_name),
+                        avatar_url=message.author.avatar_url
+                    )
+        finally:
+            _in_flight_bytes.release(attachment.size)
+
+
+async def _download_attachment(attachment: discord.Attachment, http_session: ClientSession) -> BinaryIO:
+    """
+    Stream the `attachment` from the CDN into a file and return the file positioned at its start.
+
+    Small attachments are kept in memory; larger ones are written to a temporary file on disk.
+    Disk I/O is done in the default executor to not block the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    in_memory = attachment.size <= MAX_IN_MEMORY_SIZE
+    file = BytesIO() if in_memory else await loop.run_in_executor(None, tempfile.TemporaryFile)
+    try:
+        async with http_session.get(attachment.proxy_url) as response:
+            if response.status == 403:
+                raise discord.Forbidden(response, "cannot retrieve attachment")
+            elif response.status == 404:
+                raise discord.NotFound(response, "attachment not found")
+            elif response.status != 200:
+                raise HTTPException(response, "failed to get attachment")
+
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                if in_memory:
+                    file.write(chunk)
+                else:
+                    await loop.run_in_executor(None, file.write, chunk)
+
+        file.seek(0)
+    except BaseException:
+        file.close()
+        raise
+
+    return file
+
+
 def sub_clyde(username: Optional[str]) -> Optional[str]:
     """
     Replace "e"/"E" in any "clyde" in `username` with a Cyrillic "е"/"E" and return the new string.
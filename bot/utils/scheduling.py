@@ -41,13 +41,13 @@ class Scheduler:
         If a task with `task_id` already exists, close `coroutine` instead of scheduling it. This
         prevents unawaited coroutine warnings. Don't pass a coroutine that'll be re-used elsewhere.
         """
-        self._log.trace(f"Scheduling task #{task_id}...")
+        self._log.trace("Scheduling task #%s...", task_id)
 
         msg = f"Cannot schedule an already started coroutine for #{task_id}"
         assert inspect.getcoroutinestate(coroutine) == "CORO_CREATED", msg
 
         if task_id in self._scheduled_tasks:
-            self._log.debug(f"Did not schedule task #{task_id}; task was already scheduled.")
+            self._log.debug("Did not schedule task #%s; task was already scheduled.", task_id)
             coroutine.close()
             return
 
@@ -55,7 +55,7 @@ class Scheduler:
         task.add_done_callback(partial(self._task_done_callback, task_id))
 
         self._scheduled_tasks[task_id] = task
-        self._log.debug(f"Scheduled task #{task_id} {id(task)}.")
+        self._log.debug("Scheduled task #%s %s.", task_id, id(task))
 
     def schedule_at(self, time: datetime, task_id: t.Hashable, coroutine: t.Coroutine) -> None:
         """
@@ -83,7 +83,7 @@ class Scheduler:
 
     def cancel(self, task_id: t.Hashable) -> None:
         """Unschedule the task identified by `task_id`. Log a warning if the task doesn't exist."""
-        self._log.trace(f"Cancelling task #{task_id}...")
+        self._log.trace("Cancelling task #%s...", task_id)
 
         try:
             task = self._scheduled_tasks.pop(task_id)
@@ -92,7 +92,7 @@ class Scheduler:
         else:
             task.cancel()
 
-            self._log.debug(f"Unscheduled task #{task_id} {id(task)}.")
+            self._log.debug("Unscheduled task #%s %s.", task_id, id(task))
 
     def cancel_all(self) -> None:
         """Unschedule all known tasks."""
@@ -104,11 +104,11 @@ class Scheduler:
     async def _await_later(self, delay: t.Union[int, float], task_id: t.Hashable, coroutine: t.Coroutine) -> None:
         """Await `coroutine` after the given `delay` number of seconds."""
         try:
-            self._log.trace(f"Waiting {delay} seconds before awaiting coroutine for #{task_id}.")
+            self._log.trace("Waiting %s seconds before awaiting coroutine for #%s.", delay, task_id)
             await asyncio.sleep(delay)
 
             # Use asyncio.shield to prevent the coroutine from cancelling itself.
-            self._log.trace(f"Done waiting for #{task_id}; now awaiting the coroutine.")
+            self._log.trace("Done waiting for #%s; now awaiting the coroutine.", task_id)
             await asyncio.shield(coroutine)
         finally:
             # Close it to prevent unawaited coroutine warnings,
@@ -117,10 +117,10 @@ class Scheduler:
             # coroutine may cancel this task, which would also trigger the finally block.
             state = inspect.getcoroutinestate(coroutine)
             if state == "CORO_CREATED":
-                self._log.debug(f"Explicitly closing the coroutine for #{task_id}.")
+                self._log.debug("Explicitly closing the coroutine for #%s.", task_id)
                 coroutine.close()
             else:
-                self._log.debug(f"Finally block reached for #{task_id}; {state=}")
+                self._log.debug("Finally block reached for #%s; state=%r", task_id, state)
 
     def _task_done_callback(self, task_id: t.Hashable, done_task: asyncio.Task) -> None:
         """
@@ -129,20 +129,20 @@ class Scheduler:
         If `done_task` and the task associated with `task_id` are different, then the latter
         will not be deleted. In this case, a new task was likely rescheduled with the same ID.
         """
-        self._log.trace(f"Performing done callback for task #{task_id} {id(done_task)}.")
+        self._log.trace("Performing done callback for task #%s %s.", task_id, id(done_task))
 
         scheduled_task = self._scheduled_tasks.get(task_id)
 
         if scheduled_task and done_task is scheduled_task:
             # A task for the ID exists and is the same as the done task.
             # Since this is the done callback, the task is already done so no need to cancel it.
-            self._log.trace(f"Deleting task #{task_id} {id(done_task)}.")
+            self._log.trace("Deleting task #%s %s.", task_id, id(done_task))
             del self._scheduled_tasks[task_id]
         elif scheduled_task:
             # A new task was likely rescheduled with the same ID.
             self._log.debug(
-                f"The scheduled task #{task_id} {id(scheduled_task)} "
-                f"and the done task {id(done_task)} differ."
+                "The scheduled task #%s %s and the done task %s differ.",
+                task_id, id(scheduled_task), id(done_task)
             )
         elif not done_task.cancelled():
             self._log.warning(
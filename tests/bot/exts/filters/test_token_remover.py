@@ -21,7 +21,7 @@ class TokenRemoverTests(unittest.IsolatedAsyncioTestCase):
         self.bot = MockBot()
         self.cog = TokenRemover(bot=self.bot)
 
-        self.msg = MockMessage(id=555, content="hello world")
+        self.msg = MockMessage(id=555, content="hello.world.foobarbazquxquuxcorgegrault")
         self.msg.channel.mention = "#lemonade-stand"
         self.msg.guild.get_member.return_value.bot = False
         self.msg.guild.get_member.return_value.__str__.return_value = "Woody"
@@ -228,6 +228,22 @@ class TokenRemoverTests(unittest.IsolatedAsyncioTestCase):
         self.assertIsNone(return_value)
         token_re.finditer.assert_called_once_with(self.msg.content)
 
+    @autospec("bot.exts.filters.token_remover", "TOKEN_RE")
+    def test_find_token_skips_messages_without_dots(self, token_re):
+        """The regex shouldn't run for messages which can't contain the three parts of a token."""
+        self.msg.content = "hello world."
+
+        self.assertIsNone(TokenRemover.find_token_in_message(self.msg))
+        token_re.finditer.assert_not_called()
+
+    @autospec("bot.exts.filters.token_remover", "TOKEN_RE")
+    def test_find_token_skips_messages_without_base64_runs(self, token_re):
+        """The regex shouldn't run for sentences without a run of characters as long as a token's parts."""
+        self.msg.content = "Hello there. I tried os.path.join but it didn't work."
+
+        self.assertIsNone(TokenRemover.find_token_in_message(self.msg))
+        token_re.finditer.assert_not_called()
+
     def test_regex_invalid_tokens(self):
         """Messages without anything looking like a token are not matched."""
         tokens = (
@@ -394,6 +410,33 @@ class TokenRemoverTests(unittest.IsolatedAsyncioTestCase):
         self.msg.channel.send.assert_not_awaited()
 
 
+class ScanMessageTests(unittest.TestCase):
+    """Tests for the shared scan of messages for tokens and webhook URLs."""
+
+    @autospec(TokenRemover, "find_token_in_message")
+    def test_scan_is_reused_for_same_message(self, find_token_in_message):
+        """The scan should only be repeated for the same message if its content changed."""
+        msg = MockMessage(content="foo")
+
+        first = token_remover.scan_message(msg)
+        self.assertIs(token_remover.scan_message(msg), first)
+        find_token_in_message.assert_called_once_with(msg)
+
+        msg.content = "bar"
+        token_remover.scan_message(msg)
+        self.assertEqual(find_token_in_message.call_count, 2)
+
+    def test_scan_finds_redacted_webhook_url(self):
+        """A webhook URL should be found with its token redacted."""
+        msg = MockMessage(content="See https://DISCORD.com/api/webhooks/123/secret-token please")
+
+        scan = token_remover.scan_message(msg)
+
+        self.assertTrue(scan.found)
+        self.assertIsNone(scan.token)
+        self.assertEqual(scan.webhook_url, "https://DISCORD.com/api/webhooks/123/xxx")
+
+
 class TokenRemoverExtensionTests(unittest.TestCase):
     """Tests for the token_remover extension."""
 
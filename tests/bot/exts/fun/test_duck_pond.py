@@ -0,0 +1,157 @@
+import asyncio
+import unittest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+
+from bot import constants
+from bot.exts.fun import duck_pond
+from bot.exts.fun.duck_pond import DuckPond, DuckReactions
+from tests.helpers import FakeRedisCache, MockBot, MockMember, MockMessage, MockReaction, MockRole, MockTextChannel
+
+DUCK = "\U0001f986"
+
+
+class DuckReactionsTests(unittest.TestCase):
+    """Tests for counting the staff members who reacted with ducks."""
+
+    def test_reactors_are_counted_once(self):
+        """A reactor should count once for all their duck reactions, until all of them are removed."""
+        reactions = DuckReactions()
+        reactions.add(1, DUCK)
+        reactions.add(1, "<:ducky_yellow:2>")
+        reactions.add(3, DUCK)
+        reactions.add(3, DUCK)
+        self.assertEqual(reactions.n_reactors, 2)
+
+        reactions.remove(1, DUCK)
+        self.assertEqual(reactions.n_reactors, 2)
+        reactions.remove_emoji("<:ducky_yellow:2>")
+        self.assertEqual(reactions.n_reactors, 1)
+
+    def test_json_round_trip(self):
+        """The reactions loaded from their JSON representation should be counted the same."""
+        reactions = DuckReactions({(1, DUCK), (1, "<:ducky_yellow:2>"), (3, DUCK)})
+
+        loaded = DuckReactions.from_json(reactions.to_json())
+
+        self.assertEqual(loaded.reactions, reactions.reactions)
+        self.assertEqual(loaded.n_reactors, 2)
+
+
+@patch("bot.exts.fun.duck_pond.constants.DuckPond.threshold", 2)
+class DuckReactionEventTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for keeping the duck reactions of messages up to date from reaction events."""
+
+    def setUp(self):
+        self.bot = MockBot()
+        self.bot.loop.create_task = MagicMock(side_effect=lambda coro: coro.close())
+        self.cog = DuckPond(self.bot)
+        self.cog.duck_reactions = FakeRedisCache()
+        self.cog.locked_relay = AsyncMock()
+
+        self.staff_role = MockRole(id=constants.STAFF_ROLES[0])
+        self.staff = [MockMember(bot=False, roles=[self.staff_role]) for _ in range(2)]
+
+        self.message = MockMessage(author=MockMember(bot=False, roles=[self.staff_role]))
+        self.reaction = MockReaction(emoji=DUCK, users=[self.staff[0]])
+        self.message.reactions = [self.reaction]
+
+        self.channel = MockTextChannel()
+        self.channel.fetch_message = AsyncMock(return_value=self.message)
+        self.bot.get_all_channels.return_value = [self.channel]
+
+    def make_payload(self, member: MockMember) -> MagicMock:
+        """Return a payload for a duck reaction by `member` to the message."""
+        return MagicMock(
+            guild_id=constants.Guild.id,
+            channel_id=self.channel.id,
+            message_id=self.message.id,
+            user_id=member.id,
+            member=member,
+            emoji=discord.PartialEmoji(name=DUCK),
+        )
+
+    async def test_reactions_are_fetched_once(self):
+        """Reactors should be fetched from the API for the first reaction only, and counted from events after."""
+        await self.cog.on_raw_reaction_add(self.make_payload(self.staff[0]))
+        self.reaction.users.assert_called_once()
+        self.cog.locked_relay.assert_not_awaited()
+
+        await self.cog.on_raw_reaction_add(self.make_payload(self.staff[1]))
+        self.reaction.users.assert_called_once()
+        self.cog.locked_relay.assert_awaited_once_with(self.message)
+
+    async def test_reactions_by_non_staff_are_ignored(self):
+        """Reactions by members who aren't staff shouldn't fetch anything."""
+        await self.cog.on_raw_reaction_add(self.make_payload(MockMember(bot=False)))
+
+        self.channel.fetch_message.assert_not_awaited()
+        self.assertEqual(self.cog.duck_reactions.data, {})
+
+    async def test_removed_reactions_are_not_counted(self):
+        """Removing a duck reaction should remove the reactor from the stored reactions."""
+        await self.cog.on_raw_reaction_add(self.make_payload(self.staff[0]))
+        await self.cog.on_raw_reaction_remove(self.make_payload(self.staff[0]))
+        await self.cog.on_raw_reaction_add(self.make_payload(self.staff[1]))
+
+        stored = DuckReactions.from_json(self.cog.duck_reactions.data[self.message.id])
+        self.assertEqual(stored.n_reactors, 1)
+        self.cog.locked_relay.assert_not_awaited()
+
+    async def test_messages_by_non_staff_are_fetched_once(self):
+        """Messages by authors who aren't staff should be marked as ineligible instead of fetched again."""
+        self.message.author = MockMember(bot=False)
+
+        await self.cog.on_raw_reaction_add(self.make_payload(self.staff[0]))
+        await self.cog.on_raw_reaction_add(self.make_payload(self.staff[1]))
+
+        self.channel.fetch_message.assert_awaited_once()
+        self.assertEqual(self.cog.duck_reactions.data[self.message.id], duck_pond.INELIGIBLE)
+        self.cog.locked_relay.assert_not_awaited()
+
+    async def test_relayed_messages_are_no_longer_tracked(self):
+        """The reactions of a relayed message shouldn't be stored anymore."""
+        await self.cog.on_raw_reaction_add(self.make_payload(self.staff[0]))
+        await self.cog.on_raw_reaction_add(self.make_payload(self.staff[1]))
+        self.cog.locked_relay.assert_awaited_once_with(self.message)
+
+        self.assertEqual(self.cog.duck_reactions.data[self.message.id], duck_pond.INELIGIBLE)
+
+    async def test_slow_fetch_does_not_block_other_messages(self):
+        """Reactions to a message should be handled while the message of another reaction is being fetched."""
+        fetch_started = asyncio.Event()
+        release_fetch = asyncio.Event()
+
+        async def fetch_message(message_id: int) -> MockMessage:
+            fetch_started.set()
+            await release_fetch.wait()
+            return self.message
+
+        self.channel.fetch_message = AsyncMock(side_effect=fetch_message)
+        other_id = self.message.id + 1
+        self.cog.duck_reactions.data[other_id] = DuckReactions().to_json()
+
+        slow = asyncio.create_task(self.cog.on_raw_reaction_add(self.make_payload(self.staff[0])))
+        await fetch_started.wait()
+
+        other_payload = self.make_payload(self.staff[1])
+        other_payload.message_id = other_id
+        await asyncio.wait_for(self.cog.on_raw_reaction_add(other_payload), timeout=1)
+        self.assertEqual(DuckReactions.from_json(self.cog.duck_reactions.data[other_id]).n_reactors, 1)
+
+        release_fetch.set()
+        await slow
+
+    @patch("bot.exts.fun.duck_pond.asyncio.sleep", AsyncMock(side_effect=asyncio.CancelledError))
+    async def test_old_reactions_are_pruned(self):
+        """The stored reactions of messages older than the TTL should be deleted."""
+        old_id = discord.utils.time_snowflake(datetime.utcnow() - duck_pond.DUCK_REACTIONS_TTL * 2)
+        new_id = discord.utils.time_snowflake(datetime.utcnow())
+        self.cog.duck_reactions.data.update({old_id: duck_pond.INELIGIBLE, new_id: DuckReactions().to_json()})
+
+        with self.assertRaises(asyncio.CancelledError):
+            await self.cog.prune_duck_reactions()
+
+        self.assertEqual(list(self.cog.duck_reactions.data), [new_id])
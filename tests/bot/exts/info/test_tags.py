@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Callable
+from unittest.mock import patch
+
+from bot.exts.info.tags import TAGS_RELOAD_INTERVAL, Tags
+from tests.helpers import MockBot, MockMember, MockRole
+
+
+class TagsTests(unittest.TestCase):
+    """Tests for loading and searching tags."""
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = Path(temp_dir.name)
+
+        patcher = patch("bot.exts.info.tags.TAGS_PATH", self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.write_tag("foo", "The quick brown fox.")
+        self.write_tag("bar", "Jumps over the lazy dog.")
+        self.write_tag("baz", "A quick dog, restricted.", directory="moderators")
+
+        self.cog = Tags(MockBot())
+        self.member = MockMember(roles=[MockRole(name="Developers")])
+
+    def write_tag(self, name: str, content: str, directory: str = "") -> Path:
+        """Write a tag file with `content`, and give it a new modification time."""
+        file = self.path / directory / f"{name}.md"
+        file.parent.mkdir(exist_ok=True)
+        file.write_text(content, encoding="utf8")
+
+        mtime = file.stat().st_mtime + 10
+        os.utime(file, (mtime, mtime))
+        return file
+
+    def search(self, check: Callable, keywords: str) -> list:
+        """Return the titles of the tags found for `keywords` by the member."""
+        return sorted(tag["title"] for tag in self.cog._get_tags_via_content(check, keywords, self.member))
+
+    def test_search_matches_substrings(self):
+        """Keywords should match anywhere in the tags' contents, even within words."""
+        self.assertEqual(self.search(all, "uick bro"), ["foo"])
+        self.assertEqual(self.search(all, "the, dog"), ["bar"])
+        self.assertEqual(self.search(any, "fox,LAZY"), ["bar", "foo"])
+        self.assertEqual(self.search(all, "brown dog"), [])
+
+    def test_search_finds_keywords_within_words_when_others_start_with_them(self):
+        """A keyword should match in the middle of a word even when another tag has a word starting with it."""
+        self.write_tag("qux", "Use a class to group functions.")
+        self.write_tag("quux", "An assert statement checks a condition.")
+        self.cog.get_tags()
+
+        self.assertEqual(self.cog._find_words("ass"), ["assert", "class"])
+        self.assertEqual(self.search(all, "ass"), ["quux", "qux"])
+        self.assertEqual(self.search(all, "qui, laz"), [])
+        self.assertEqual(self.search(any, "qui, laz"), ["bar", "foo"])
+
+    def test_search_only_finds_accessible_tags(self):
+        """Tags restricted to roles the member doesn't have should not be found."""
+        self.assertEqual(self.search(any, "quick"), ["foo"])
+
+        self.member.roles.append(MockRole(name="Moderators"))
+        self.assertEqual(self.search(any, "quick"), ["baz", "foo"])
+
+    def test_modified_files_are_reloaded(self):
+        """Modified, new, and deleted tag files should be reflected after reloading the tags."""
+        self.write_tag("foo", "The slow brown fox.")
+        self.write_tag("qux", "A quick cat.")
+        (self.path / "bar.md").unlink()
+
+        self.cog.get_tags()
+
+        self.assertEqual(self.search(any, "quick"), ["qux"])
+        self.assertEqual(self.search(any, "slow, dog"), ["foo"])
+        self.assertNotIn("bar", self.cog._cache)
+
+    def test_tags_are_only_reloaded_after_interval(self):
+        """Tag commands should only check the tag files for changes once the reload interval passed."""
+        self.write_tag("qux", "A quick cat.")
+
+        self.cog.reload_tags_if_due()
+        self.assertNotIn("qux", self.cog._cache)
+
+        with patch("bot.exts.info.tags.time.monotonic", return_value=self.cog._last_reload + TAGS_RELOAD_INTERVAL):
+            self.cog.reload_tags_if_due()
+        self.assertIn("qux", self.cog._cache)
+
+    def test_suggestions_use_title_index(self):
+        """Suggestions should be found for misspelt titles, and follow reloaded tags."""
+        self.assertEqual([tag["title"] for tag in self.cog._get_suggestions("fo")], ["foo"])
+
+        (self.path / "foo.md").unlink()
+        self.cog.get_tags()
+
+        self.assertEqual(self.cog._get_suggestions("fo"), [])
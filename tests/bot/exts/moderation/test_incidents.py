@@ -11,6 +11,7 @@ import discord
 from bot.constants import Colours
 from bot.exts.moderation import incidents
 from tests.helpers import (
+    FakeRedisCache,
     MockAsyncWebhook,
     MockAttachment,
     MockBot,
@@ -291,9 +292,9 @@ class TestIncidents(unittest.IsolatedAsyncioTestCase):
         is being mocked. The `crawl_task` attribute will end up being None.
         """
         self.cog_instance = incidents.Incidents(MockBot())
+        self.cog_instance.crawl_state = FakeRedisCache()
 
 
-@patch("asyncio.sleep", AsyncMock())  # Prevent the coro from sleeping to speed up the test
 class TestCrawlIncidents(TestIncidents):
     """
     Tests for the `Incidents.crawl_incidents` coroutine.
@@ -313,9 +314,15 @@ class TestCrawlIncidents(TestIncidents):
         """For each test, ensure `bot.get_channel` returns a channel with 1 arbitrary message."""
         super().setUp()  # First ensure we get `cog_instance` from parent
 
-        incidents_history = MagicMock(return_value=MockAsyncIterable([MockMessage()]))
+        incidents_history = MagicMock(return_value=MockAsyncIterable([MockMessage(id=1)]))
         self.cog_instance.bot.get_channel = MagicMock(return_value=MockTextChannel(history=incidents_history))
 
+    def set_history(self, *messages: MockMessage) -> MagicMock:
+        """Make the channel's history consist of `messages`, and return the `history` mock."""
+        history = MagicMock(return_value=MockAsyncIterable(messages))
+        self.cog_instance.bot.get_channel.return_value.history = history
+        return history
+
     async def test_crawl_incidents_waits_until_cache_ready(self):
         """
         The coroutine will await the `wait_until_guild_available` event.
@@ -350,6 +357,62 @@ class TestCrawlIncidents(TestIncidents):
         await self.cog_instance.crawl_incidents()
         incidents.add_signals.assert_awaited_once()
 
+    @patch("bot.exts.moderation.incidents.add_signals", AsyncMock())
+    @patch("bot.exts.moderation.incidents.is_incident", MagicMock(return_value=True))
+    @patch("bot.exts.moderation.incidents.has_signals", MagicMock(return_value=True))
+    async def test_crawl_incidents_resumes_after_last_signalled(self):
+        """Only messages after the `last_signalled` mark are crawled, and the mark is advanced over them."""
+        self.cog_instance.crawl_state.data["last_signalled"] = 10
+        history = self.set_history(MockMessage(id=12), MockMessage(id=11))
+
+        await self.cog_instance.crawl_incidents()
+
+        self.assertEqual(history.call_args.kwargs["after"].id, 10)
+        self.assertEqual(self.cog_instance.crawl_state.data["last_signalled"], 12)
+
+    @patch("bot.exts.moderation.incidents.is_incident", MagicMock(return_value=True))
+    @patch("bot.exts.moderation.incidents.has_signals", MagicMock(return_value=False))
+    async def test_crawl_incidents_mark_stops_before_failed_incident(self):
+        """The mark should only be advanced up to the first incident which failed to receive its signals."""
+        failed = MockMessage(id=2)
+
+        async def add_signals(incident: MockMessage) -> None:
+            if incident is failed:
+                raise discord.HTTPException(MagicMock(status=500), "Internal error")
+
+        self.set_history(MockMessage(id=3), failed, MockMessage(id=1))
+
+        with patch("bot.exts.moderation.incidents.add_signals", AsyncMock(side_effect=add_signals)) as mock:
+            await self.cog_instance.crawl_incidents()
+
+        self.assertEqual(mock.await_count, 3)
+        self.assertEqual(self.cog_instance.crawl_state.data["last_signalled"], 1)
+
+        # Incidents signalled afterwards mustn't advance the mark past the failed incident either.
+        self.cog_instance.crawl_task = MagicMock(done=MagicMock(return_value=True))
+        with patch("bot.exts.moderation.incidents.add_signals", AsyncMock()):
+            await self.cog_instance.on_message(MockMessage(id=4))
+        self.assertEqual(self.cog_instance.crawl_state.data["last_signalled"], 1)
+
+
+    @patch("bot.exts.moderation.incidents.is_incident", MagicMock(return_value=True))
+    @patch("bot.exts.moderation.incidents.has_signals", MagicMock(return_value=False))
+    async def test_crawl_incidents_mark_passes_deleted_incident(self):
+        """An incident deleted before it received its signals shouldn't hold the mark back."""
+        deleted = MockMessage(id=2)
+
+        async def add_signals(incident: MockMessage) -> None:
+            if incident is deleted:
+                raise discord.NotFound(MagicMock(status=404), "Unknown Message")
+
+        self.set_history(MockMessage(id=3), deleted, MockMessage(id=1))
+
+        with patch("bot.exts.moderation.incidents.add_signals", AsyncMock(side_effect=add_signals)):
+            await self.cog_instance.crawl_incidents()
+
+        self.assertEqual(self.cog_instance.crawl_state.data["last_signalled"], 3)
+        self.assertEqual(self.cog_instance.failed_incidents, set())
+
 
 class TestArchive(TestIncidents):
     """Tests for the `Incidents.archive` coroutine."""
@@ -751,6 +814,11 @@ class TestOnMessage(TestIncidents):
     function is tested in `TestIsIncident` - here we do not worry about it.
     """
 
+    def setUp(self):
+        """Assign a `crawl_task` which has not finished yet."""
+        super().setUp()
+        self.cog_instance.crawl_task = MagicMock(done=MagicMock(return_value=False))
+
     @patch("bot.exts.moderation.incidents.is_incident", MagicMock(return_value=True))
     async def test_on_message_incident(self):
         """Messages qualifying as incidents are passed to `add_signals`."""
@@ -761,6 +829,56 @@ class TestOnMessage(TestIncidents):
 
         mock_add_signals.assert_called_once_with(incident)
 
+    @patch("bot.exts.moderation.incidents.is_incident", MagicMock(return_value=True))
+    @patch("bot.exts.moderation.incidents.add_signals", AsyncMock())
+    async def test_on_message_advances_last_signalled_after_crawl(self):
+        """Incidents signalled after the crawl has finished become the `last_signalled` message."""
+        await self.cog_instance.on_message(MockMessage(id=5))
+        self.assertNotIn("last_signalled", self.cog_instance.crawl_state.data)
+
+        self.cog_instance.crawl_task.done.return_value = True
+        await self.cog_instance.on_message(MockMessage(id=6))
+        self.assertEqual(self.cog_instance.crawl_state.data["last_signalled"], 6)
+
+    @patch("bot.exts.moderation.incidents.is_incident", MagicMock(return_value=True))
+    async def test_on_message_failed_incident_keeps_mark(self):
+        """Later incidents mustn't advance the mark past an incident which failed to receive its signals."""
+        self.cog_instance.crawl_task.done.return_value = True
+        error = discord.HTTPException(MagicMock(status=500), "Internal error")
+
+        with patch("bot.exts.moderation.incidents.add_signals", AsyncMock(side_effect=[error, None])):
+            with self.assertRaises(discord.HTTPException):
+                await self.cog_instance.on_message(MockMessage(id=5))
+            await self.cog_instance.on_message(MockMessage(id=6))
+
+        self.assertNotIn("last_signalled", self.cog_instance.crawl_state.data)
+
+    @patch("bot.exts.moderation.incidents.is_incident", MagicMock(return_value=True))
+    async def test_on_message_deleted_incident_advances_mark(self):
+        """An incident deleted before it received its signals shouldn't hold the mark back."""
+        self.cog_instance.crawl_task.done.return_value = True
+        error = discord.NotFound(MagicMock(status=404), "Unknown Message")
+
+        with patch("bot.exts.moderation.incidents.add_signals", AsyncMock(side_effect=[error, None])):
+            await self.cog_instance.on_message(MockMessage(id=5))
+            await self.cog_instance.on_message(MockMessage(id=6))
+
+        self.assertEqual(self.cog_instance.crawl_state.data["last_signalled"], 6)
+
+    @patch("bot.exts.moderation.incidents.is_incident", MagicMock(return_value=True))
+    async def test_deleting_failed_incident_releases_mark(self):
+        """Once a failed incident is deleted, later incidents should advance the mark again."""
+        self.cog_instance.crawl_task.done.return_value = True
+        error = discord.HTTPException(MagicMock(status=500), "Internal error")
+
+        with patch("bot.exts.moderation.incidents.add_signals", AsyncMock(side_effect=[error, None])):
+            with self.assertRaises(discord.HTTPException):
+                await self.cog_instance.on_message(MockMessage(id=5))
+            await self.cog_instance.on_raw_message_delete(MagicMock(message_id=5))
+            await self.cog_instance.on_message(MockMessage(id=6))
+
+        self.assertEqual(self.cog_instance.crawl_state.data["last_signalled"], 6)
+
     @patch("bot.exts.moderation.incidents.is_incident", MagicMock(return_value=False))
     async def test_on_message_non_incident(self):
         """Messages not qualifying as incidents are ignored."""
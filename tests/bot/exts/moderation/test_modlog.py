@@ -1,9 +1,13 @@
+import asyncio
+import json
 import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import discord
 
-from bot.exts.moderation.modlog import ModLog
-from tests.helpers import MockBot, MockTextChannel
+from bot.constants import Event, Guild as GuildConstant
+from bot.exts.moderation.modlog import EDIT_DIFF_SHORTEN_WIDTH, EDIT_DIFF_WORD_LIMIT, IgnoredEvents, ModLog
+from tests.helpers import MockBot, MockMember, MockMessage, MockTextChannel
 
 
 class ModLogTests(unittest.IsolatedAsyncioTestCase):
@@ -27,3 +31,241 @@ class ModLogTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(
             embed.description, ("foo bar" * 3000)[:2045] + "..."
         )
+
+    async def test_log_entries_sent_concurrently_are_sent_in_order(self):
+        """Embeds queued for the same channel should each be sent in their own message, in order."""
+        self.bot.get_channel.return_value = self.channel
+
+        await asyncio.gather(
+            self.cog.send_log_message(icon_url="foo", colour=discord.Colour.blue(), title="bar", text="first"),
+            self.cog.send_log_message(
+                icon_url="foo", colour=discord.Colour.blue(), title="bar", text="second", content="baz"
+            ),
+        )
+
+        self.assertEqual(self.channel.send.call_count, 2)
+        contents = [call[1]["content"] for call in self.channel.send.call_args_list]
+        descriptions = [call[1]["embed"].description for call in self.channel.send.call_args_list]
+        self.assertEqual(contents, [None, "baz"])
+        self.assertEqual(descriptions, ["first", "second"])
+
+    async def test_additional_embeds_are_sent_after_log_embed(self):
+        """Additional embeds should follow the log embed and their message, one embed per message."""
+        self.bot.get_channel.return_value = self.channel
+        additional_embeds = [discord.Embed() for _ in range(3)]
+
+        await self.cog.send_log_message(
+            icon_url="foo",
+            colour=discord.Colour.blue(),
+            title="bar",
+            text="foo",
+            additional_embeds=additional_embeds,
+            additional_embeds_msg="baz",
+        )
+
+        calls = self.channel.send.call_args_list
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(calls[0][1]["embed"].description, "foo")
+        self.assertEqual((calls[1][1]["content"], calls[1][1]["embed"]), ("baz", None))
+        self.assertEqual([call[1]["embed"] for call in calls[2:]], additional_embeds)
+
+    async def test_context_only_built_when_requested(self):
+        """`get_context` should only be called for the sent message if `return_context` is True."""
+        self.bot.get_channel.return_value = self.channel
+
+        for return_context in (False, True):
+            self.bot.get_context.reset_mock()
+
+            with self.subTest(return_context=return_context):
+                ctx = await self.cog.send_log_message(
+                    icon_url="foo",
+                    colour=discord.Colour.blue(),
+                    title="bar",
+                    text="foo",
+                    return_context=return_context,
+                )
+
+                if return_context:
+                    self.bot.get_context.assert_awaited_once_with(self.channel.send.return_value)
+                    self.assertEqual(ctx, self.bot.get_context.return_value)
+                else:
+                    self.bot.get_context.assert_not_called()
+                    self.assertIsNone(ctx)
+
+    async def test_send_error_is_raised_to_caller(self):
+        """An exception raised when sending a queued message should propagate to the caller."""
+        self.bot.get_channel.return_value = self.channel
+        self.channel.send.side_effect = discord.HTTPException(MagicMock(), "")
+
+        with self.assertRaises(discord.HTTPException):
+            await self.cog.send_log_message(icon_url="foo", colour=discord.Colour.blue(), title="bar", text="foo")
+
+        self.assertNotIn(self.channel.id, self.cog._log_workers)
+
+    def test_content_diff_highlights_changed_words(self):
+        """Changed words should be highlighted and long unchanged runs elided."""
+        before, after = ModLog.get_content_diff(
+            "one two three four five six",
+            "one two three four five seven"
+        )
+
+        self.assertEqual(before, " ... five [six](http://o.hi)")
+        self.assertEqual(after, " ... five [seven](http://o.hi)")
+
+    def test_content_diff_skipped_for_long_content(self):
+        """Content over the word limit should be shortened instead of diffed."""
+        before = "word " * (EDIT_DIFF_WORD_LIMIT + 1)
+
+        diff_before, diff_after = ModLog.get_content_diff(before, "short")
+
+        self.assertNotIn("http://o.hi", diff_before)
+        self.assertLessEqual(len(diff_before), EDIT_DIFF_SHORTEN_WIDTH)
+        self.assertEqual(diff_after, "short")
+
+    async def test_bulk_delete_is_logged_as_one_entry(self):
+        """A bulk deletion should upload the cached messages and send a single log message."""
+        self.bot.get_channel.return_value = self.channel
+        self.cog.upload_log = AsyncMock(return_value="url")
+        self.cog.send_log_message = AsyncMock()
+
+        messages = [MockMessage(id=i, author=MockMember(bot=False)) for i in (3, 1, 2)]
+        self.cog.ignore(Event.message_delete, 2)
+        event = MagicMock(
+            guild_id=GuildConstant.id,
+            channel_id=self.channel.id,
+            message_ids={1, 2, 3, 4},
+            cached_messages=messages
+        )
+
+        await self.cog.on_raw_bulk_message_delete(event)
+
+        logged_messages, = self.cog.upload_log.call_args[0]
+        self.assertEqual([message.id for message in logged_messages], [1, 3])
+        self.cog.send_log_message.assert_awaited_once()
+
+        text = self.cog.send_log_message.call_args[0][3]
+        self.assertIn("**Messages deleted:** 3", text)
+        self.assertIn("**Not cached:** 1", text)
+
+    async def test_ignored_bulk_delete_is_not_logged(self):
+        """A bulk deletion of only ignored messages should not be logged."""
+        self.cog.send_log_message = AsyncMock()
+        self.cog.ignore_many(Event.message_delete, range(100))
+
+        event = MagicMock(guild_id=GuildConstant.id, message_ids=set(range(100)), cached_messages=[])
+        await self.cog.on_raw_bulk_message_delete(event)
+
+        self.cog.send_log_message.assert_not_called()
+        self.assertEqual(len(self.cog._ignored), 0)
+
+    async def test_cached_raw_events_are_skipped(self):
+        """Raw delete and edit events of cached messages should be left to the non-raw listeners."""
+        self.cog.send_log_message = AsyncMock()
+        event = MagicMock(guild_id=GuildConstant.id, channel_id=0, cached_message=MockMessage())
+
+        await self.cog.on_raw_message_delete(event)
+        await self.cog.on_raw_message_edit(event)
+
+        self.bot.get_channel.assert_not_called()
+        self.cog.send_log_message.assert_not_called()
+
+    @staticmethod
+    async def _read_body(call) -> dict:
+        """Return the JSON body streamed by an API client request `call`."""
+        return json.loads(b"".join([part async for part in call[1]["data"]]))
+
+    async def test_upload_log_streams_json(self):
+        """A log should be uploaded as a JSON body streamed with a single POST."""
+        self.bot.api_client.post.return_value = {"id": 42}
+        messages = [MockMessage(id=i, content=f"foo\0{i}", embeds=[]) for i in range(3)]
+
+        url = await self.cog.upload_log(messages, actor_id=7, attachments=[["a"]])
+
+        self.assertTrue(url.endswith("/42"))
+        self.bot.api_client.post.assert_awaited_once()
+
+        body = await self._read_body(self.bot.api_client.post.call_args)
+        self.assertEqual(body["actor"], 7)
+        self.assertEqual([message["content"] for message in body["deletedmessage_set"]], ["foo0", "foo1", "foo2"])
+        self.assertEqual([message["attachments"] for message in body["deletedmessage_set"]], [["a"], [], []])
+
+    async def test_upload_log_consumes_messages_while_streaming(self):
+        """Messages from an async iterable should only be consumed as the body is streamed."""
+        self.bot.api_client.post.return_value = {"id": 42}
+        consumed = []
+
+        async def messages():
+            for i in range(3):
+                consumed.append(i)
+                yield MockMessage(id=i, content="", embeds=[])
+
+        await self.cog.upload_log(messages(), actor_id=7)
+        self.assertEqual(consumed, [])
+
+        body = await self._read_body(self.bot.api_client.post.call_args)
+        self.assertEqual([message["id"] for message in body["deletedmessage_set"]], [0, 1, 2])
+
+    async def test_upload_log_without_messages(self):
+        """An empty log should still be valid JSON."""
+        self.bot.api_client.post.return_value = {"id": 42}
+
+        await self.cog.upload_log([], actor_id=7)
+
+        body = await self._read_body(self.bot.api_client.post.call_args)
+        self.assertEqual(body["deletedmessage_set"], [])
+
+
+class IgnoredEventsTests(unittest.TestCase):
+    """Tests for the registry of ignored events."""
+
+    def setUp(self):
+        self.ignored = IgnoredEvents(ttl=60)
+
+    def test_ignored_id_is_popped_once(self):
+        """An ignored ID should only suppress a single event."""
+        self.ignored.add(Event.message_delete, [1, 2])
+
+        self.assertTrue(self.ignored.pop(Event.message_delete, 1))
+        self.assertFalse(self.ignored.pop(Event.message_delete, 1))
+        self.assertTrue(self.ignored.pop(Event.message_delete, 2))
+        self.assertEqual(len(self.ignored), 0)
+
+    def test_ignored_ids_are_per_event(self):
+        """Ignoring an ID for one event should not suppress other events."""
+        self.ignored.add(Event.member_update, [1])
+
+        self.assertFalse(self.ignored.pop(Event.member_remove, 1))
+        self.assertTrue(self.ignored.pop(Event.member_update, 1))
+
+    def test_duplicate_ids_are_stored_once(self):
+        """Ignoring an already ignored ID should not add another entry."""
+        self.ignored.add(Event.message_delete, [1, 1])
+        self.ignored.add(Event.message_delete, [1])
+
+        self.assertEqual(len(self.ignored), 1)
+
+    @patch("bot.exts.moderation.modlog.time.monotonic")
+    def test_expired_ids_are_not_ignored(self, monotonic):
+        """IDs should stop being ignored after the TTL and be removed on the next addition."""
+        monotonic.return_value = 0
+        self.ignored.add(Event.message_delete, range(10_000))
+
+        monotonic.return_value = 61
+        self.assertFalse(self.ignored.pop(Event.message_delete, 0))
+
+        self.ignored.add(Event.message_delete, [10_000])
+        self.assertEqual(len(self.ignored), 1)
+
+    @patch("bot.exts.moderation.modlog.time.monotonic")
+    def test_readding_id_refreshes_expiry(self, monotonic):
+        """Ignoring an ID again should restart its TTL."""
+        monotonic.return_value = 0
+        self.ignored.add(Event.message_delete, [1, 2])
+
+        monotonic.return_value = 30
+        self.ignored.add(Event.message_delete, [1])
+
+        monotonic.return_value = 61
+        self.ignored.add(Event.message_delete, [3])
+        self.assertEqual(len(self.ignored), 2)
+        self.assertTrue(self.ignored.pop(Event.message_delete, 1))
@@ -0,0 +1,91 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from bot import constants
+from bot.exts.moderation import verification
+from tests.helpers import MockBot, MockGuild, MockMember, MockRole
+
+UNVERIFIED_AFTER = timedelta(days=constants.Verification.unverified_after)
+KICKED_AFTER = timedelta(days=constants.Verification.kicked_after)
+
+
+def make_member(joined_ago: timedelta, **kwargs) -> MockMember:
+    """Return an unverified member who joined `joined_ago`."""
+    return MockMember(joined_at=datetime.utcnow() - joined_ago, **kwargs)
+
+
+class UnverifiedIndexTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for the index of unverified members checked by `_check_members`."""
+
+    def setUp(self):
+        self.bot = MockBot()
+        self.bot.loop.create_task = MagicMock(side_effect=lambda coro: coro.close())
+        self.cog = verification.Verification(self.bot)
+
+        self.unverified_role = MockRole(id=constants.Roles.unverified)
+        self.guild = MockGuild(id=constants.Guild.id)
+        self.guild.get_role.return_value = self.unverified_role
+        self.guild.get_member.side_effect = lambda id_: next((m for m in self.guild.members if m.id == id_), None)
+        self.bot.get_guild.return_value = self.guild
+
+        self.verified = set()
+        patcher = patch("bot.exts.moderation.verification.is_verified", new=lambda member: member in self.verified)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def add_members(self, *members: MockMember) -> None:
+        """Add `members` to the guild."""
+        for member in members:
+            member.guild = self.guild
+        self.guild.members = list(members)
+
+    async def test_members_are_found_by_their_deadlines(self):
+        """Members should be given the role or kicked depending on which of their deadlines passed."""
+        new = make_member(timedelta(0))
+        for_role = make_member(UNVERIFIED_AFTER + timedelta(hours=1))
+        has_role = make_member(UNVERIFIED_AFTER + timedelta(hours=1), roles=[self.unverified_role])
+        for_kick = make_member(KICKED_AFTER + timedelta(hours=1))
+        verified = make_member(KICKED_AFTER + timedelta(hours=1))
+        self.verified.add(verified)
+        self.add_members(new, for_role, has_role, for_kick, verified)
+
+        self.assertEqual(await self.cog._check_members(), ({for_role}, {for_kick}))
+
+    async def test_only_passed_deadlines_are_popped(self):
+        """A member found once shouldn't be found again until their next deadline passes."""
+        member = make_member(UNVERIFIED_AFTER + timedelta(hours=1))
+        self.add_members(member)
+
+        self.assertEqual(await self.cog._check_members(), ({member}, set()))
+        self.assertEqual(await self.cog._check_members(), (set(), set()))
+        self.assertEqual(len(self.cog.deadlines), 1)
+
+    async def test_events_update_index(self):
+        """Members who join should be indexed, and members who verify or leave should be skipped."""
+        self.add_members()
+        await self.cog._check_members()  # Build the empty index
+
+        joined = make_member(KICKED_AFTER + timedelta(hours=1))
+        verified = make_member(KICKED_AFTER + timedelta(hours=1))
+        left = make_member(KICKED_AFTER + timedelta(hours=1))
+        self.add_members(joined, verified, left)
+        for member in self.guild.members:
+            await self.cog.on_member_join(member)
+
+        self.verified.add(verified)
+        await self.cog.on_member_update(verified, verified)
+        await self.cog.on_member_remove(left)
+
+        self.assertEqual(await self.cog._check_members(), (set(), {joined}))
+
+    async def test_index_is_rebuilt_periodically(self):
+        """The index should be rebuilt from all guild members every `FULL_SCAN_INTERVAL` checks."""
+        self.add_members()
+        for _ in range(verification.FULL_SCAN_INTERVAL):
+            await self.cog._check_members()
+
+        missed = make_member(KICKED_AFTER + timedelta(hours=1))
+        self.add_members(missed)
+
+        self.assertEqual(await self.cog._check_members(), (set(), {missed}))
@@ -0,0 +1,99 @@
+import logging
+import unittest
+from collections import deque
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.exts.moderation.watchchannels._watchchannel import MAX_CONTENT_LENGTH, WatchChannel
+from tests.helpers import MockAttachment, MockBot, MockMember, MockMessage, MockTextChannel
+
+
+class FooWatch(WatchChannel):
+    """A watch channel to test the relaying of messages with."""
+
+    def __init__(self, bot: MockBot):
+        super().__init__(bot, 1, 2, "bot/foo", {}, logging.getLogger(__name__))
+
+
+@patch("bot.exts.moderation.watchchannels._watchchannel.BigBrotherConfig.header_message_limit", 3)
+class WatchChannelRelayTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for the batched relaying of watched users' messages."""
+
+    def setUp(self):
+        self.bot = MockBot()
+        self.cog = FooWatch(self.bot)
+        self.cog.webhook = MagicMock(send=AsyncMock())
+        self.cog.build_header = MagicMock(return_value="header")
+
+        self.author = MockMember(id=3, display_name="foo")
+        self.channel = MockTextChannel(id=4)
+
+    def make_message(self, content: str, **kwargs) -> MockMessage:
+        """Return a message by the watched user with the given clean `content`."""
+        return MockMessage(
+            author=self.author,
+            channel=self.channel,
+            content=content,
+            clean_content=content,
+            embeds=[],
+            created_at=datetime.utcnow() - timedelta(seconds=5),
+            **kwargs
+        )
+
+    def test_batch_ends_at_header_limit(self):
+        """A batch shouldn't contain more messages than can be relayed under a single header."""
+        queue = deque(self.make_message(str(i)) for i in range(5))
+
+        msgs, contents = self.cog.take_batch(queue)
+
+        self.assertEqual(contents, ["0", "1", "2"])
+        self.assertEqual(len(queue), 2)
+
+    def test_batch_ends_at_content_length(self):
+        """The combined content of a batch should fit in a single message."""
+        queue = deque(self.make_message("a" * (MAX_CONTENT_LENGTH // 2)) for _ in range(3))
+
+        msgs, contents = self.cog.take_batch(queue)
+
+        self.assertEqual(len(msgs), 1)
+        self.assertEqual(len(queue), 2)
+
+    def test_batch_ends_with_attachments(self):
+        """A batch should end with the first message which has attachments."""
+        queue = deque([
+            self.make_message("foo"),
+            self.make_message("bar", attachments=[MockAttachment()]),
+            self.make_message("baz"),
+        ])
+
+        msgs, contents = self.cog.take_batch(queue)
+
+        self.assertEqual(contents, ["foo", "bar"])
+        self.assertEqual(len(queue), 1)
+
+    @patch("bot.exts.moderation.watchchannels._watchchannel.messages.send_attachments", new_callable=AsyncMock)
+    async def test_batch_is_relayed_after_header(self, send_attachments):
+        """The header should be sent first, then the batch's contents together, followed by the attachments."""
+        msgs = [self.make_message("foo"), self.make_message("bar", attachments=[MockAttachment()])]
+
+        await self.cog.relay_messages(msgs, ["foo", "bar"])
+
+        header_call, content_call = self.cog.webhook.send.call_args_list
+        self.assertEqual(header_call.kwargs["embeds"], ["header"])
+        self.assertIsNone(header_call.kwargs["content"])
+        self.assertEqual(content_call.kwargs["content"], "foo\nbar")
+        self.assertIsNone(content_call.kwargs["embeds"])
+        send_attachments.assert_awaited_once_with(msgs[1], self.cog.webhook, self.bot.http_session)
+
+        self.assertEqual(self.cog.message_history.message_count, 2)
+        name, lag = self.bot.stats.timing.call_args[0]
+        self.assertEqual(name, "watchchannels.foowatch.relay_lag")
+        self.assertGreaterEqual(lag, timedelta(seconds=5))
+
+    async def test_header_is_not_repeated(self):
+        """A batch following one from the same author and channel shouldn't get a header."""
+        await self.cog.relay_messages([self.make_message("foo")], ["foo"])
+        await self.cog.relay_messages([self.make_message("bar")], ["bar"])
+
+        embeds = [call.kwargs["embeds"] for call in self.cog.webhook.send.call_args_list]
+        self.assertEqual(embeds, [["header"], None, None])
@@ -0,0 +1,403 @@
+import asyncio
+import json
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from discord.utils import time_snowflake
+
+from bot import constants
+from bot.exts.help_channels import Activity, Claim, HelpChannels, MAX_CONCURRENT_INIT_MOVES
+from tests.helpers import FakeRedisCache, MockBot, MockMember, MockMessage, MockTextChannel
+
+
+class HelpChannelsTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for the claims of help channels."""
+
+    def setUp(self):
+        self.bot = MockBot()
+
+        with patch.object(HelpChannels, "init_cog", MagicMock()):
+            self.cog = HelpChannels(self.bot)
+
+        self.cog.claims = FakeRedisCache()
+        self.cog.channel_activity = FakeRedisCache()
+        self.cog.pin_wrapper = AsyncMock(return_value=True)
+        self.cog.move_to_in_use = AsyncMock()
+        self.cog.move_to_available = AsyncMock()
+        self.cog.revoke_send_permissions = AsyncMock()
+        self.cog.report_stats = MagicMock()
+        self.cog.ready.set()
+
+        self.channel = MockTextChannel(id=1)
+        self.channel.category.id = constants.Categories.help_available
+        self.claimant = MockMember(id=2, bot=False)
+
+    async def test_claim_is_stored_in_one_round_trip(self):
+        """Claiming a channel should store the whole claim with a single write."""
+        message = MockMessage(id=3, channel=self.channel, author=self.claimant)
+
+        await self.cog.on_message(message)
+
+        self.assertEqual(self.cog.claims.round_trips, 1)
+        claim = Claim.from_json(self.cog.claims.data[self.channel.id])
+        self.assertEqual(claim.claimant_id, self.claimant.id)
+        self.assertEqual(claim.question_message_id, message.id)
+        self.assertTrue(claim.unanswered)
+        self.bot.stats.timing.assert_called_once()
+        self.assertEqual(self.bot.stats.timing.call_args[0][0], "help.claim_lock")
+
+    async def test_different_channels_are_claimed_concurrently(self):
+        """A slow claim of one channel should not hold up the claim of another channel."""
+        slow_channel = MockTextChannel(id=5)
+        slow_channel.category.id = constants.Categories.help_available
+        release_slow_move = asyncio.Event()
+
+        async def move_to_in_use(channel: MockTextChannel) -> None:
+            if channel is slow_channel:
+                await release_slow_move.wait()
+
+        self.cog.move_to_in_use = AsyncMock(side_effect=move_to_in_use)
+
+        slow_claim = asyncio.create_task(
+            self.cog.on_message(MockMessage(id=7, channel=slow_channel, author=MockMember(id=6, bot=False)))
+        )
+        await asyncio.sleep(0)
+        await asyncio.wait_for(
+            self.cog.on_message(MockMessage(id=8, channel=self.channel, author=self.claimant)), timeout=1
+        )
+
+        self.assertIn(self.channel.id, self.cog.claims.data)
+        self.assertNotIn(slow_channel.id, self.cog.claims.data)
+
+        release_slow_move.set()
+        await slow_claim
+        self.assertIn(slow_channel.id, self.cog.claims.data)
+
+    async def test_channel_is_claimed_once(self):
+        """Messages sent while a channel is being claimed should not claim it again."""
+        messages = [MockMessage(id=i, channel=self.channel, author=MockMember(id=i, bot=False)) for i in range(3)]
+
+        async def move_to_in_use(_channel: MockTextChannel) -> None:
+            await asyncio.sleep(0)
+
+        self.cog.move_to_in_use = AsyncMock(side_effect=move_to_in_use)
+
+        await asyncio.gather(*(self.cog.on_message(message) for message in messages))
+
+        self.cog.move_to_in_use.assert_awaited_once()
+        self.cog.move_to_available.assert_awaited_once()
+        self.assertEqual(Claim.from_json(self.cog.claims.data[self.channel.id]).claimant_id, 0)
+
+    async def test_message_from_non_claimant_answers_channel(self):
+        """A message from anyone but the claimant should mark the claim as answered."""
+        self.channel.category.id = constants.Categories.help_in_use
+        self.cog.claims.data[self.channel.id] = Claim(self.claimant.id, 0).to_json()
+
+        for author, unanswered in ((self.claimant, True), (MockMember(id=4, bot=False), False)):
+            with self.subTest(author=author.id):
+                await self.cog.check_for_answer(MockMessage(channel=self.channel, author=author))
+
+                claim = Claim.from_json(self.cog.claims.data[self.channel.id])
+                self.assertEqual(claim.unanswered, unanswered)
+
+    async def test_dormant_channel_claim_is_removed(self):
+        """Making a channel dormant should remove its claim, unpin the question and report the session."""
+        self.cog.claims.data[self.channel.id] = Claim(self.claimant.id, 0, False, 5).to_json()
+        self.cog.move_to_bottom_position = AsyncMock()
+        self.cog.channel_queue = MagicMock()
+
+        await self.cog.move_to_dormant(self.channel, "command")
+
+        self.assertNotIn(self.channel.id, self.cog.claims.data)
+        self.cog.pin_wrapper.assert_awaited_once_with(5, self.channel, pin=False)
+        self.bot.stats.incr.assert_any_call("help.sessions.answered")
+
+    async def test_legacy_caches_are_migrated(self):
+        """Claims stored in the legacy caches should be merged into a single record per channel."""
+        self.cog.legacy_claimants = FakeRedisCache({1: 10, 2: 20})
+        self.cog.legacy_claim_times = FakeRedisCache({1: 100.0})
+        self.cog.legacy_unanswered = FakeRedisCache({1: False, 2: True})
+        self.cog.legacy_question_messages = FakeRedisCache({2: 200})
+
+        await self.cog.migrate_legacy_caches()
+
+        claims = {channel_id: json.loads(data) for channel_id, data in self.cog.claims.data.items()}
+        self.assertEqual(claims, {
+            1: {"claimant_id": 10, "claimed_at": 100.0, "unanswered": False, "question_message_id": None},
+            2: {"claimant_id": 20, "claimed_at": 0, "unanswered": True, "question_message_id": 200},
+        })
+        self.assertEqual(self.cog.legacy_claimants.data, {})
+
+
+class HelpChannelActivityTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for the activity tracked in in-use help channels."""
+
+    def setUp(self):
+        self.bot = MockBot()
+
+        with patch.object(HelpChannels, "init_cog", MagicMock()):
+            self.cog = HelpChannels(self.bot)
+
+        self.cog.claims = FakeRedisCache()
+        self.cog.channel_activity = FakeRedisCache()
+        self.cog.ready.set()
+
+        self.channel = MockTextChannel(id=1, last_message_id=None)
+        self.channel.category.id = constants.Categories.help_in_use
+        self.cog.category_channels[constants.Categories.help_in_use].add(self.channel.id)
+        self.bot.get_channel.return_value = self.channel
+
+    async def test_claim_records_activity(self):
+        """Claiming a channel should start tracking its activity with the claim message."""
+        self.channel.category.id = constants.Categories.help_available
+        self.cog.pin_wrapper = AsyncMock(return_value=True)
+        self.cog.move_to_in_use = AsyncMock()
+        self.cog.move_to_available = AsyncMock()
+        self.cog.revoke_send_permissions = AsyncMock()
+
+        await self.cog.on_message(MockMessage(id=3, channel=self.channel, author=MockMember(id=2, bot=False)))
+
+        self.assertEqual(self.cog.activity[self.channel.id], Activity(3, 3, 1))
+        self.assertEqual(Activity.from_json(self.cog.channel_activity.data[self.channel.id]), Activity(3, 3, 1))
+
+    async def test_messages_are_recorded(self):
+        """Messages should update the last message, and only users' messages should be counted."""
+        self.cog.activity[self.channel.id] = Activity(3, 3, 1)
+
+        self.cog.record_activity(MockMessage(id=4, channel=self.channel, author=MockMember(bot=False)))
+        self.cog.record_activity(MockMessage(id=5, channel=self.channel, author=MockMember(bot=True)))
+
+        self.assertEqual(self.cog.activity[self.channel.id], Activity(3, 5, 2))
+
+    async def test_recorded_activity_is_persisted_in_one_round_trip(self):
+        """Recorded messages should only be persisted when the changed activity is flushed."""
+        self.cog.activity[self.channel.id] = Activity(3, 3, 1)
+
+        for message_id in range(4, 14):
+            self.cog.record_activity(MockMessage(id=message_id, channel=self.channel, author=MockMember(bot=False)))
+        self.assertEqual(self.cog.channel_activity.round_trips, 0)
+
+        await self.cog.persist_activity()
+        await self.cog.persist_activity()
+
+        self.assertEqual(self.cog.channel_activity.round_trips, 1)
+        self.assertEqual(Activity.from_json(self.cog.channel_activity.data[self.channel.id]), Activity(3, 13, 11))
+
+    async def test_messages_in_untracked_channels_are_ignored(self):
+        """Messages in channels whose activity isn't tracked should not be recorded."""
+        self.cog.record_activity(MockMessage(id=4, channel=self.channel, author=MockMember(bot=False)))
+
+        self.assertEqual(self.cog.activity, {})
+        self.assertEqual(self.cog.channel_activity.round_trips, 0)
+
+    async def test_idle_time_uses_activity(self):
+        """The idle time of a tracked channel should be computed without fetching its history."""
+        last_message_id = time_snowflake(datetime.utcnow() - timedelta(minutes=5))
+        self.cog.activity[self.channel.id] = Activity(1, last_message_id, 1)
+
+        idle_time = await self.cog.get_idle_time(self.channel)
+
+        self.assertAlmostEqual(idle_time, 300, delta=2)
+        self.channel.history.assert_not_called()
+
+    async def test_idle_time_uses_newer_gateway_message(self):
+        """A newer last message ID from the gateway should take precedence over the recorded one."""
+        self.cog.activity[self.channel.id] = Activity(1, time_snowflake(datetime.utcnow() - timedelta(hours=1)), 1)
+        self.channel.last_message_id = time_snowflake(datetime.utcnow() - timedelta(minutes=1))
+
+        idle_time = await self.cog.get_idle_time(self.channel)
+
+        self.assertAlmostEqual(idle_time, 60, delta=2)
+
+    async def test_deleting_last_user_message_reschedules(self):
+        """Deleting the only user message should reschedule the channel to become dormant sooner."""
+        self.cog.activity[self.channel.id] = Activity(3, 3, 1)
+        self.cog.scheduler = MagicMock()
+        self.cog.move_idle_channel = MagicMock()
+        message = MockMessage(id=3, channel=self.channel, author=MockMember(bot=False))
+
+        await self.cog.on_raw_message_delete(MagicMock(channel_id=self.channel.id, cached_message=message))
+
+        self.assertEqual(self.cog.activity[self.channel.id].user_messages, 0)
+        self.cog.scheduler.cancel.assert_called_once_with(self.channel.id)
+        self.cog.scheduler.schedule_later.assert_called_once()
+        self.channel.history.assert_not_called()
+
+    async def test_deletions_outside_in_use_channels_are_ignored(self):
+        """Deletions in channels which aren't in-use help channels should return before doing any work."""
+        self.cog.is_empty = AsyncMock()
+
+        await self.cog.on_raw_message_delete(MagicMock(channel_id=2, cached_message=None))
+
+        self.bot.get_channel.assert_not_called()
+        self.cog.is_empty.assert_not_awaited()
+
+    async def test_deleting_message_from_before_claim_is_ignored(self):
+        """Messages sent before the channel was claimed should not affect its activity."""
+        self.cog.activity[self.channel.id] = Activity(3, 3, 1)
+        self.cog.scheduler = MagicMock()
+        message = MockMessage(id=2, channel=self.channel, author=MockMember(bot=False))
+
+        await self.cog.on_raw_message_delete(MagicMock(channel_id=self.channel.id, cached_message=message))
+
+        self.assertEqual(self.cog.activity[self.channel.id].user_messages, 1)
+        self.cog.scheduler.schedule_later.assert_not_called()
+
+    async def test_uncached_deletion_falls_back_to_history(self):
+        """Deleting an uncached message should stop tracking the channel and check its history instead."""
+        self.cog.activity[self.channel.id] = Activity(3, 3, 1)
+        self.cog.channel_activity.data[self.channel.id] = Activity(3, 3, 1).to_json()
+        self.cog.scheduler = MagicMock()
+        self.cog.is_empty = AsyncMock(return_value=False)
+
+        await self.cog.on_raw_message_delete(MagicMock(channel_id=self.channel.id, cached_message=None))
+
+        self.assertNotIn(self.channel.id, self.cog.activity)
+        self.assertNotIn(self.channel.id, self.cog.channel_activity.data)
+        self.cog.is_empty.assert_awaited_once_with(self.channel)
+        self.cog.scheduler.schedule_later.assert_not_called()
+
+
+class HelpChannelIndexTests(unittest.TestCase):
+    """Tests for the index of the channels in the help categories."""
+
+    def setUp(self):
+        self.bot = MockBot()
+
+        with patch.object(HelpChannels, "init_cog", MagicMock()):
+            self.cog = HelpChannels(self.bot)
+
+        self.available = MockTextChannel(id=1, name="help-lithium", category_id=constants.Categories.help_available)
+        self.dormant = MockTextChannel(id=2, name="help-sodium", category_id=constants.Categories.help_dormant)
+        self.other = MockTextChannel(id=3, name="off-topic", category_id=4)
+        self.excluded = MockTextChannel(
+            id=constants.Channels.how_to_get_help,
+            name="how-to-get-help",
+            category_id=constants.Categories.help_available,
+        )
+
+        channels = {channel.id: channel for channel in (self.available, self.dormant, self.other, self.excluded)}
+        self.bot.get_guild.return_value.channels = list(channels.values())
+        self.bot.get_channel.side_effect = channels.get
+
+        self.cog.index_channels()
+
+    def get_category_channels(self, category_id: int) -> list:
+        """Return the channels the cog yields for the category with `category_id`."""
+        return list(self.cog.get_category_channels(MagicMock(id=category_id)))
+
+    def test_channels_are_indexed_by_category(self):
+        """Only the help channels should be indexed, under their categories."""
+        self.assertEqual(self.get_category_channels(constants.Categories.help_available), [self.available])
+        self.assertEqual(self.get_category_channels(constants.Categories.help_dormant), [self.dormant])
+        self.assertEqual(self.get_category_channels(constants.Categories.help_in_use), [])
+        self.assertEqual(self.cog.get_used_names(), {"help-lithium", "help-sodium"})
+
+    def test_moved_channel_is_reindexed(self):
+        """A channel moved to another category should only be indexed under its new category."""
+        self.available.category_id = constants.Categories.help_in_use
+        self.cog.update_index(self.available)
+
+        self.assertEqual(self.get_category_channels(constants.Categories.help_available), [])
+        self.assertEqual(self.get_category_channels(constants.Categories.help_in_use), [self.available])
+
+    def test_channel_leaving_help_categories_is_removed(self):
+        """Deleted channels and channels moved out of the help categories should be removed from the index."""
+        self.available.category_id = self.other.category_id
+        self.cog.update_index(self.available)
+        self.cog.update_index(self.dormant, deleted=True)
+
+        self.assertFalse(any(self.cog.category_channels.values()))
+        self.assertEqual(self.cog.get_used_names(), set())
+
+    def test_created_channel_name_is_used(self):
+        """A channel created in a help category should have its name marked as used."""
+        channel = MockTextChannel(id=5, name="help-potassium", category_id=constants.Categories.help_dormant)
+        self.cog.update_index(channel)
+
+        self.assertIn("help-potassium", self.cog.get_used_names())
+        self.assertIn(channel.id, self.cog.category_channels[constants.Categories.help_dormant])
+
+
+class HelpChannelInitTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for the initialisation of the help channel system."""
+
+    def setUp(self):
+        self.bot = MockBot()
+
+        with patch.object(HelpChannels, "init_cog", MagicMock()):
+            self.cog = HelpChannels(self.bot)
+
+        self.cog.send_available_message = AsyncMock()
+        self.cog.report_stats = MagicMock()
+
+        self.category = MagicMock(id=constants.Categories.help_available, channels=[MockTextChannel(position=4)])
+        self.cog.try_get_channel = AsyncMock(return_value=self.category)
+        self.bot.http.bulk_channel_update = AsyncMock()
+
+    @patch("bot.exts.help_channels.constants.HelpChannels.max_available", 3)
+    async def test_missing_channels_are_moved_in_one_request(self):
+        """All missing available channels should be moved with a single bulk update."""
+        candidates = [MockTextChannel(id=i) for i in (10, 11, 12)]
+        self.cog.get_available_candidate = AsyncMock(side_effect=candidates)
+        self.cog.available_category = self.category
+
+        await self.cog.init_available()
+
+        self.bot.http.bulk_channel_update.assert_awaited_once()
+        payload = self.bot.http.bulk_channel_update.call_args[0][1]
+        self.assertEqual(
+            [(item["id"], item["position"]) for item in payload[1:]],
+            [(10, 5), (11, 6), (12, 7)]
+        )
+        self.assertEqual(self.cog.send_available_message.await_count, 3)
+
+    @patch("bot.exts.help_channels.constants.HelpChannels.max_available", 2)
+    async def test_channels_which_must_be_waited_for_are_moved_separately(self):
+        """Channels which aren't immediately available should be made available one at a time."""
+        self.cog.get_available_candidate = AsyncMock(side_effect=[MockTextChannel(id=10), None])
+        self.cog.move_to_available = AsyncMock()
+        self.cog.available_category = self.category
+
+        await self.cog.init_available()
+
+        self.bot.http.bulk_channel_update.assert_awaited_once()
+        self.cog.move_to_available.assert_awaited_once_with()
+
+    async def test_in_use_channels_are_handled_before_available_is_filled(self):
+        """Idle in-use channels should be made dormant, a few at a time, before the Available category is filled."""
+        in_use_channels = [MockTextChannel(id=i) for i in range(MAX_CONCURRENT_INIT_MOVES + 2)]
+        release_moves = asyncio.Event()
+        moving = []
+
+        async def move_idle_channel(channel: MockTextChannel, has_task: bool) -> None:
+            moving.append(channel)
+            await release_moves.wait()
+
+        for name in ("init_categories", "migrate_legacy_caches", "check_cooldowns", "init_available"):
+            setattr(self.cog, name, AsyncMock())
+        self.cog.index_channels = MagicMock()
+        self.cog.create_channel_queue = MagicMock()
+        self.cog.create_name_queue = MagicMock()
+        self.cog.get_category_channels = MagicMock(return_value=iter(in_use_channels))
+        self.cog.move_idle_channel = AsyncMock(side_effect=move_idle_channel)
+        self.cog.channel_activity = FakeRedisCache()
+        self.cog.flush_activity = MagicMock()
+
+        init_task = asyncio.create_task(self.cog.init_cog())
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        self.assertEqual(len(moving), MAX_CONCURRENT_INIT_MOVES)
+        self.cog.init_available.assert_not_awaited()
+        self.assertFalse(self.cog.ready.is_set())
+
+        release_moves.set()
+        await init_task
+
+        self.assertEqual(moving, in_use_channels)
+        self.cog.init_available.assert_awaited_once_with()
+        self.cog.flush_activity.start.assert_called_once_with()
+        self.assertTrue(self.cog.ready.is_set())
+        self.assertTrue(self.cog.close_command.enabled)
@@ -0,0 +1,70 @@
+import time
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot import constants
+from bot.exts.utils import bot
+from bot.exts.utils.bot import BotCog
+from tests.helpers import MockBot, MockMessage, MockTextChannel
+
+CODE = "for i in range(3):\n    print(i)\nx = 1\ny = 2"
+
+
+@patch("bot.exts.utils.bot.DEBUG_MODE", False)
+class CodeblockDetectionTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for detecting poorly formatted code in messages."""
+
+    def setUp(self):
+        self.bot = MockBot()
+        self.cog = BotCog(self.bot)
+        self.channel = MockTextChannel(id=constants.Channels.python_discussion)
+
+    async def test_instructions_are_sent_for_unformatted_code(self):
+        """Instructions should be sent for unformatted code, after which the channel is on cooldown."""
+        await self.cog.on_message(MockMessage(content=CODE, channel=self.channel))
+
+        self.channel.send.assert_awaited_once()
+        self.assertTrue(self.cog.is_on_cooldown(self.channel.id))
+
+    @patch.object(BotCog, "get_howto")
+    async def test_cooldown_is_checked_before_parsing(self, get_howto):
+        """Messages in a channel on cooldown shouldn't be parsed at all."""
+        self.cog.channel_cooldowns[self.channel.id] = time.time()
+
+        await self.cog.on_message(MockMessage(content=CODE, channel=self.channel))
+
+        get_howto.assert_not_called()
+        self.channel.send.assert_not_awaited()
+
+    async def test_unchanged_content_is_not_analysed_again(self):
+        """The result of analysing content should be cached by the content."""
+        is_formatted = MagicMock(return_value=False)
+        is_formatted.__name__ = "is_formatted"
+
+        self.assertFalse(await self.cog.analyse(is_formatted, CODE))
+        self.assertFalse(await self.cog.analyse(is_formatted, CODE))
+        is_formatted.assert_called_once_with(CODE)
+
+    async def test_long_content_is_analysed_in_executor(self):
+        """Content longer than `MAX_INLINE_LENGTH` should be analysed outside of the event loop."""
+        self.bot.loop.run_in_executor = AsyncMock(return_value="foo")
+        content = "x" * (bot.MAX_INLINE_LENGTH + 1)
+
+        self.assertEqual(await self.cog.analyse(BotCog.get_howto, content), "foo")
+        self.bot.loop.run_in_executor.assert_awaited_once_with(self.cog.executor, BotCog.get_howto, content)
+
+        self.cog.cog_unload()
+
+    async def test_broken_process_is_recreated(self):
+        """The analysis should be skipped if the analysing process died, and a new process used afterwards."""
+        self.bot.loop.run_in_executor = AsyncMock(side_effect=[BrokenProcessPool, "foo"])
+        content = "x" * (bot.MAX_INLINE_LENGTH + 1)
+
+        self.assertIsNone(await self.cog.analyse(BotCog.get_howto, content))
+        self.assertIsNone(self.cog.executor)
+
+        self.assertEqual(await self.cog.analyse(BotCog.get_howto, content), "foo")
+        self.assertIsNotNone(self.cog.executor)
+
+        self.cog.cog_unload()
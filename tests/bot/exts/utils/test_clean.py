@@ -0,0 +1,161 @@
+import asyncio
+import itertools
+import unittest
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Iterable, List
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+from discord.utils import time_snowflake
+
+from bot.exts.utils import clean
+from bot.exts.utils.clean import Clean
+from tests.helpers import MockBot, MockContext, MockMember, MockMessage, MockTextChannel
+
+OLD_AGE = clean.BULK_DELETE_MAX_AGE + timedelta(days=1)
+
+
+async def history(messages: Iterable[MockMessage]) -> AsyncIterator[MockMessage]:
+    """Yield `messages` like `TextChannel.history`."""
+    for message in messages:
+        yield message
+
+
+class CleanTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for deleting messages with the `Clean` cog."""
+
+    def setUp(self):
+        self.bot = MockBot()
+        self.mod_log = MagicMock(upload_log=AsyncMock(return_value="url"), send_log_message=AsyncMock())
+        self.bot.get_cog.return_value = self.mod_log
+
+        self.cog = Clean(self.bot)
+        self.channel = MockTextChannel()
+        self.ctx = MockContext(channel=self.channel, message=MockMessage())
+        self.ids = itertools.count()
+
+    def make_messages(self, amount: int, age: timedelta = timedelta(), **kwargs) -> List[MockMessage]:
+        """Return `amount` messages sent `age` ago, newest first like in a channel's history."""
+        created_at = datetime.utcnow() - age
+        messages = [
+            MockMessage(
+                id=time_snowflake(created_at) + next(self.ids),
+                created_at=created_at,
+                content="",
+                embeds=[],
+                **kwargs,
+            )
+            for _ in range(amount)
+        ]
+        return sorted(messages, key=lambda message: message.id, reverse=True)
+
+    def set_history(self, channel: MockTextChannel, messages: List[MockMessage]) -> None:
+        """Make `messages` the history of `channel`."""
+        channel.history = MagicMock(side_effect=lambda limit: history(messages[:limit]))
+
+    def bulk_deleted(self, channel: MockTextChannel) -> List[MockMessage]:
+        """Return the messages deleted in bulk from `channel`."""
+        return [message for call in channel.delete_messages.call_args_list for message in call[0][0]]
+
+    async def test_messages_are_bulk_deleted_in_chunks(self):
+        """Matching messages should be deleted in bulk, at most `BULK_DELETE_LIMIT` at a time."""
+        messages = self.make_messages(250)
+        self.set_history(self.channel, messages)
+        self.cog.cleaning = True
+
+        deleted = await self.cog._clean_channel(self.channel, 250, None, None)
+
+        chunk_sizes = [len(call[0][0]) for call in self.channel.delete_messages.call_args_list]
+        self.assertEqual(chunk_sizes, [100, 100, 50])
+        self.assertEqual(deleted, messages[::-1])
+        self.assertEqual(self.mod_log.ignore_many.call_count, 3)
+
+    async def test_old_messages_are_deleted_one_by_one(self):
+        """Messages too old to be deleted in bulk should be deleted individually."""
+        recent = self.make_messages(2)
+        old = self.make_messages(2, age=OLD_AGE)
+        self.set_history(self.channel, recent + old)
+        self.cog.cleaning = True
+
+        deleted = await self.cog._clean_channel(self.channel, 10, None, None)
+
+        self.assertEqual(self.bulk_deleted(self.channel), recent)
+        for message in old:
+            message.delete.assert_awaited_once()
+            self.mod_log.ignore.assert_any_call(clean.Event.message_delete, message.id)
+        self.assertEqual(deleted, (recent + old)[::-1])
+
+    async def test_predicates_select_messages(self):
+        """Only messages by bots, by the user, or matching the regex should be deleted."""
+        user = MockMember(bot=False)
+        bot_message, = self.make_messages(1, author=MockMember(bot=True))
+        user_message, = self.make_messages(1, author=user)
+        content_match, = self.make_messages(1, author=MockMember(bot=False))
+        content_match.content = "Hello FOO"
+        embed_match, = self.make_messages(1, author=MockMember(bot=False))
+        embed_match.embeds = [discord.Embed(title="bar").add_field(name="baz", value="a foo")]
+        messages = [bot_message, user_message, content_match, embed_match]
+
+        cases = (
+            ({"bots_only": True}, [bot_message]),
+            ({"user": user}, [user_message]),
+            ({"regex": "fo+"}, [content_match, embed_match]),
+            ({}, messages),
+        )
+        for kwargs, expected in cases:
+            with self.subTest(**kwargs):
+                self.channel.delete_messages.reset_mock()
+                self.set_history(self.channel, messages)
+
+                await self.cog._clean_messages(10, self.ctx, [self.channel], **kwargs)
+
+                self.assertCountEqual(self.bulk_deleted(self.channel), expected)
+
+    async def test_channels_are_cleaned_concurrently(self):
+        """The history of every channel should be traversed at the same time."""
+        first_started = asyncio.Event()
+        other_channel = MockTextChannel()
+        first_messages = self.make_messages(1)
+        other_messages = self.make_messages(1)
+
+        async def first_history(limit: int) -> AsyncIterator[MockMessage]:
+            first_started.set()
+            for message in first_messages:
+                yield message
+
+        async def other_history(limit: int) -> AsyncIterator[MockMessage]:
+            # Would never finish if the channels were cleaned one after another.
+            await first_started.wait()
+            for message in other_messages:
+                yield message
+
+        other_channel.history = MagicMock(side_effect=other_history)
+        self.channel.history = MagicMock(side_effect=first_history)
+
+        await asyncio.wait_for(self.cog._clean_messages(10, self.ctx, [other_channel, self.channel]), timeout=1)
+
+        self.assertEqual(self.bulk_deleted(self.channel), first_messages)
+        self.assertEqual(self.bulk_deleted(other_channel), other_messages)
+        logged_messages = self.mod_log.upload_log.call_args[0][0]
+        self.assertCountEqual(logged_messages, first_messages + other_messages)
+        self.assertFalse(self.cog.cleaning)
+
+    async def test_cancelling_stops_the_clean(self):
+        """Messages after the clean was cancelled shouldn't be deleted."""
+        before_cancel = self.make_messages(2)
+        after_cancel = self.make_messages(2, age=timedelta(minutes=1))
+
+        async def cancelled_history(limit: int) -> AsyncIterator[MockMessage]:
+            for message in before_cancel:
+                yield message
+            await self.cog.clean_cancel.callback(self.cog, MockContext())
+            for message in after_cancel:
+                yield message
+
+        self.channel.history = MagicMock(side_effect=cancelled_history)
+
+        await self.cog._clean_messages(10, self.ctx, [self.channel])
+
+        self.assertEqual(self.bulk_deleted(self.channel), before_cancel)
+        self.assertCountEqual(self.mod_log.upload_log.call_args[0][0], before_cancel)
+        self.assertFalse(self.cog.cleaning)
@@ -0,0 +1,128 @@
+import asyncio
+import unittest
+from collections import defaultdict
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.exts.utils.reminders import REMINDER_HORIZON, Reminders
+from tests.helpers import MockBot
+
+
+def make_reminder(id_: int, due_in: timedelta, author: int = 1) -> dict:
+    """Return a reminder due `due_in` from now, in the format returned by the API."""
+    return {
+        "id": id_,
+        "author": author,
+        "channel_id": 2,
+        "content": "foo",
+        "expiration": (datetime.utcnow() + due_in).isoformat(),
+        "mentions": [],
+    }
+
+
+class ReminderSchedulingTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for scheduling the reminders due within the horizon."""
+
+    def setUp(self):
+        self.bot = MockBot()
+        self.cog = Reminders(self.bot)
+        self.cog.scheduler = MagicMock()
+        self.cog.scheduler.__contains__.return_value = False
+        self.cog.scheduler.schedule_at.side_effect = lambda _time, _id, coroutine: coroutine.close()
+        self.cog.send_reminder = AsyncMock()
+        self.cog.horizon = datetime.utcnow() + REMINDER_HORIZON
+
+    async def test_only_reminders_within_horizon_are_scheduled(self):
+        """Reminders beyond the horizon should be left to be fetched later."""
+        await self.cog.schedule_due_reminders([
+            make_reminder(1, timedelta(hours=1)),
+            make_reminder(2, REMINDER_HORIZON * 2),
+        ])
+
+        self.cog.scheduler.schedule_at.assert_called_once()
+        self.assertEqual(self.cog.scheduler.schedule_at.call_args[0][1], 1)
+
+    async def test_overdue_reminders_are_sent(self):
+        """Overdue reminders should be sent immediately with how late they are."""
+        reminder = make_reminder(1, -timedelta(hours=1))
+
+        await self.cog.schedule_due_reminders([reminder])
+
+        self.cog.send_reminder.assert_awaited_once()
+        self.assertEqual(self.cog.send_reminder.call_args[0][0], reminder)
+        self.cog.scheduler.schedule_at.assert_not_called()
+
+    async def test_invalid_reminders_are_deleted_together(self):
+        """Reminders whose author or channel can't be found should be deleted concurrently."""
+        self.bot.get_user.return_value = None
+        self.cog.delete_reminders = AsyncMock()
+
+        await self.cog.schedule_due_reminders([make_reminder(i, timedelta(hours=1)) for i in range(3)])
+
+        self.cog.delete_reminders.assert_awaited_once_with([0, 1, 2])
+        self.cog.scheduler.schedule_at.assert_not_called()
+
+    async def test_reminders_beyond_horizon_are_not_scheduled_on_creation(self):
+        """A reminder due beyond the horizon should only be scheduled once it comes within it."""
+        self.cog.schedule_reminder(make_reminder(1, REMINDER_HORIZON * 2))
+
+        self.cog.scheduler.schedule_at.assert_not_called()
+
+    @patch("bot.exts.utils.reminders.asyncio.sleep", AsyncMock(side_effect=asyncio.CancelledError))
+    async def test_all_active_reminders_are_indexed(self):
+        """All active reminders should be indexed by their authors on startup."""
+        self.bot.api_client.get.return_value = [
+            make_reminder(1, timedelta(hours=1), author=10),
+            make_reminder(2, REMINDER_HORIZON * 2, author=10),
+            make_reminder(3, REMINDER_HORIZON * 2, author=20),
+        ]
+
+        with self.assertRaises(asyncio.CancelledError):
+            await self.cog.reschedule_reminders()
+
+        self.assertEqual(self.cog.user_reminders, {10: {1, 2}, 20: {3}})
+        self.cog.scheduler.schedule_at.assert_called_once()
+
+    async def test_failed_refresh_does_not_stop_later_refreshes(self):
+        """Reminders should still be scheduled by later refreshes after one of them fails."""
+        self.bot.api_client.get.side_effect = [
+            [],
+            Exception("API unavailable"),
+            [make_reminder(1, timedelta(hours=1))],
+        ]
+
+        sleep = AsyncMock(side_effect=[None, None, asyncio.CancelledError])
+        with patch("bot.exts.utils.reminders.asyncio.sleep", sleep), self.assertRaises(asyncio.CancelledError):
+            await self.cog.reschedule_reminders()
+
+        self.assertEqual(self.bot.api_client.get.await_count, 3)
+        self.cog.scheduler.schedule_at.assert_called_once()
+        self.assertEqual(self.cog.scheduler.schedule_at.call_args[0][1], 1)
+
+
+class ReminderCountTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for counting a user's active reminders."""
+
+    def setUp(self):
+        self.bot = MockBot()
+        self.cog = Reminders(self.bot)
+
+    async def test_count_falls_back_to_api_before_indexing(self):
+        """The API should be queried for the count until the index is built."""
+        self.bot.api_client.get.return_value = [make_reminder(1, timedelta(hours=1))]
+
+        self.assertEqual(await self.cog.count_reminders(1), 1)
+        self.bot.api_client.get.assert_awaited_once()
+
+    async def test_count_uses_index(self):
+        """The count should follow the reminders added to and removed from the index."""
+        self.cog.user_reminders = defaultdict(set)
+        self.cog.reminder_authors = {}
+
+        for id_ in range(3):
+            self.cog.index_reminder(make_reminder(id_, timedelta(hours=1)))
+        self.cog.unindex_reminder(0)
+
+        self.assertEqual(await self.cog.count_reminders(1), 2)
+        self.assertEqual(await self.cog.count_reminders(2), 0)
+        self.bot.api_client.get.assert_not_awaited()
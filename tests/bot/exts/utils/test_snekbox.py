@@ -1,7 +1,9 @@
 import asyncio
 import unittest
-from unittest.mock import AsyncMock, MagicMock, Mock, call, create_autospec, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, Mock, call, create_autospec, patch
 
+import aiohttp
+from aiohttp import web
 from discord.ext import commands
 
 from bot import constants
@@ -369,6 +371,183 @@ class SnekboxTests(unittest.IsolatedAsyncioTestCase):
                 self.assertEqual(actual, expected)
 
 
+class JobQueueTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for limiting the eval jobs running at once with `JobQueue`."""
+
+    def setUp(self):
+        self.queue = snekbox.JobQueue(max_jobs=2, max_channel_jobs=1)
+
+    async def test_jobs_wait_for_limits(self):
+        """Jobs should only start while below the global and their channel's limit."""
+        first, same_channel, other_channel, third_channel = (
+            self.queue.enqueue(channel_id) for channel_id in (1, 1, 2, 3)
+        )
+
+        self.assertTrue(first.done())
+        self.assertFalse(same_channel.done())
+        self.assertTrue(other_channel.done())
+        self.assertFalse(third_channel.done())
+        self.assertEqual(self.queue.position(same_channel), 1)
+        self.assertEqual(self.queue.position(third_channel), 2)
+
+        self.queue.release(1)
+        self.assertTrue(same_channel.done())
+        self.assertFalse(third_channel.done())
+
+        self.queue.release(2)
+        self.assertTrue(third_channel.done())
+
+    async def test_discarded_jobs_free_their_slot(self):
+        """Discarding a waiting job should remove it from the queue, and discarding a started one should release it."""
+        started = self.queue.enqueue(1)
+        waiting = self.queue.enqueue(1)
+        next_job = self.queue.enqueue(1)
+
+        self.queue.discard(1, waiting)
+        self.assertEqual(self.queue.position(next_job), 1)
+
+        self.queue.discard(1, started)
+        self.assertTrue(next_job.done())
+
+
+class ResultCacheTests(unittest.TestCase):
+    """Tests for caching the results of deterministic code."""
+
+    def setUp(self):
+        self.cache = snekbox.ResultCache(ttl=60, max_size=2)
+
+    def test_results_are_cached_by_normalized_code(self):
+        """Results should be found for code differing only by trailing whitespace."""
+        results = {"stdout": "1", "returncode": 0}
+        self.cache.set("print(1)\n", results)
+
+        self.assertIs(self.cache.get("\nprint(1)  "), results)
+        self.assertIsNone(self.cache.get("print(2)"))
+
+    def test_non_deterministic_results_are_not_cached(self):
+        """Results of code using non-deterministic functions, or which timed out, shouldn't be cached."""
+        cases = (
+            ("import random; print(random.random())", 0),
+            ("print(id(object()))", 0),
+            ("print(hash('a'))", 0),
+            ("print(set('abc'))", 0),
+            ("print(frozenset('abc'))", 0),
+            ("print({'a', 'b', 'c'})", 0),
+            ("print([x for x in {c for c in 'abc'}])", 0),
+            ("while True: pass", 128 + snekbox.SIGKILL),
+            ("print(1)", None),
+        )
+        for code, returncode in cases:
+            with self.subTest(code=code, returncode=returncode):
+                self.cache.set(code, {"stdout": "", "returncode": returncode})
+                self.assertIsNone(self.cache.get(code))
+
+    def test_results_with_memory_addresses_are_not_cached(self):
+        """Results showing a memory address, such as the default repr of an object, shouldn't be cached."""
+        code = "class A: pass\nprint(A())"
+        self.cache.set(code, {"stdout": "<__main__.A object at 0x7f3a2c1b9e50>", "returncode": 0})
+        self.assertIsNone(self.cache.get(code))
+
+    def test_dict_displays_are_cached(self):
+        """Dict displays and code which doesn't compile shouldn't be mistaken for sets."""
+        for code in ("print({'a': 1})", "print({)"):
+            with self.subTest(code=code):
+                self.cache.set(code, {"stdout": "", "returncode": 0})
+                self.assertIsNotNone(self.cache.get(code))
+
+    def test_results_expire(self):
+        """Results should expire after the TTL, and the oldest results should be evicted beyond the max size."""
+        for code in ("1", "2", "3"):
+            self.cache.set(code, {"stdout": "", "returncode": 0})
+        self.assertIsNone(self.cache.get("1"))
+        self.assertIsNotNone(self.cache.get("2"))
+
+        with patch("bot.exts.utils.snekbox.time.monotonic", return_value=float("inf")):
+            self.assertIsNone(self.cache.get("3"))
+
+
+class SnekboxStubServerTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for evaluating code with a local stub of the snekbox server."""
+
+    async def asyncSetUp(self):
+        self.running = 0
+        self.max_running = 0
+        self.n_requests = 0
+        self.release = asyncio.Event()
+
+        app = web.Application()
+        app.router.add_post("/eval", self.stub_eval)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        patcher = patch("bot.exts.utils.snekbox.URLs.snekbox_eval_api", f"http://127.0.0.1:{port}/eval")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.bot = MockBot()
+        self.bot.http_session = aiohttp.ClientSession()
+        self.cog = Snekbox(bot=self.bot)
+
+    async def asyncTearDown(self):
+        await self.bot.http_session.close()
+        await self.runner.cleanup()
+
+    async def stub_eval(self, request: web.Request) -> web.Response:
+        """Echo the input as the output once the test releases the running jobs."""
+        self.n_requests += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await self.release.wait()
+        self.running -= 1
+
+        data = await request.json()
+        return web.json_response({"stdout": data["input"], "returncode": 0})
+
+    @staticmethod
+    def make_context(channel_id: int) -> MockContext:
+        """Return a context in the channel with `channel_id`."""
+        ctx = MockContext()
+        ctx.channel.id = channel_id
+        ctx.send = AsyncMock()
+        return ctx
+
+    async def test_jobs_are_limited_and_queued(self):
+        """Jobs beyond the limits should be told their position and wait for the running jobs."""
+        contexts = [self.make_context(channel_id) for channel_id in (1, 1, 2, 3, 4)]
+        jobs = [
+            asyncio.create_task(self.cog.eval_job(ctx, f"print({i})"))
+            for i, ctx in enumerate(contexts)
+        ]
+
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+        self.assertEqual(self.running, snekbox.MAX_JOBS)
+        self.assertIn("position 1", contexts[1].send.call_args[0][0])
+        self.assertIn("position 2", contexts[4].send.call_args[0][0])
+
+        self.release.set()
+        results = await asyncio.gather(*jobs)
+
+        self.assertEqual([result["stdout"] for result in results], [f"print({i})" for i in range(5)])
+        self.assertEqual(self.max_running, snekbox.MAX_JOBS)
+        self.assertIn(call("snekbox.queue_wait", ANY), self.bot.stats.timing.call_args_list)
+
+    async def test_repeated_code_uses_cached_results(self):
+        """Evaluating the same deterministic code again should not send another request."""
+        self.release.set()
+        ctx = self.make_context(1)
+
+        first = await self.cog.eval_job(ctx, "print(1)")
+        second = await self.cog.eval_job(ctx, "print(1)")
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.n_requests, 1)
+        self.bot.stats.incr.assert_called_once_with("snekbox.cache_hits")
+
+
 class SnekboxSetupTests(unittest.TestCase):
     """Tests setup of the `Snekbox` cog."""
 
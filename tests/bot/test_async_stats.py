@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import MagicMock
+
+from bot.async_stats import AsyncStatsClient
+
+
+class AsyncStatsClientTests(unittest.TestCase):
+    """Tests for the buffered statsd client."""
+
+    def setUp(self):
+        self.loop = MagicMock()
+        self.client = AsyncStatsClient(self.loop, "127.0.0.1", prefix="bot", max_packet_size=64)
+        self.client._transport = MagicMock()
+
+    def sent_packets(self) -> list:
+        """Return the decoded packets sent through the mocked transport."""
+        return [call[0][0].decode("ascii") for call in self.client._transport.sendto.call_args_list]
+
+    def test_metrics_are_buffered_until_flush(self):
+        """Metrics should not be sent until the buffer is flushed."""
+        self.client.timing("foo", 1)
+        self.client.gauge("bar", 2)
+
+        self.client._transport.sendto.assert_not_called()
+        self.loop.call_later.assert_called_once_with(1, self.client.flush)
+
+        self.client.flush()
+        self.assertEqual(self.sent_packets(), ["bot.foo:1.000000|ms\nbot.bar:2|g"])
+
+    def test_counters_are_summed_between_flushes(self):
+        """Unsampled increments of the same counter should be sent as a single summed metric."""
+        for _ in range(3):
+            self.client.incr("foo")
+        self.client.decr("foo", 5)
+        self.client.incr("bar", 2)
+
+        self.client.flush()
+        self.assertEqual(self.sent_packets(), ["bot.foo:-2|c\nbot.bar:2|c"])
+
+    def test_full_buffer_is_flushed_immediately(self):
+        """A buffer reaching the maximum packet size should be sent without waiting for the timer."""
+        for _ in range(3):
+            self.client.gauge("a_long_gauge_name", 1)
+
+        self.assertTrue(self.client._transport.sendto.called)
+        self.loop.call_later.return_value.cancel.assert_called_once()
+
+    def test_packets_do_not_exceed_maximum_size(self):
+        """Buffered metrics should be split into packets no larger than the maximum packet size."""
+        self.client._max_packet_size = 1000
+        for i in range(10):
+            self.client.gauge(f"gauge_{i}", i)
+        self.client._max_packet_size = 64
+
+        self.client.flush()
+
+        packets = self.sent_packets()
+        self.assertGreater(len(packets), 1)
+        self.assertTrue(all(len(packet) <= 64 for packet in packets))
+        self.assertEqual(sum(packet.count("|g") for packet in packets), 10)
+
+    def test_close_flushes_and_closes_transport(self):
+        """Closing the client should send the remaining metrics and close the transport."""
+        self.client.incr("foo")
+
+        self.client.close()
+
+        self.assertEqual(self.sent_packets(), ["bot.foo:1|c"])
+        self.client._transport.close.assert_called_once()
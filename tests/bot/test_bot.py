@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from discord.ext import commands
+
+from bot.bot import Bot
+
+
+class FooCog(commands.Cog):
+    """A cog with a single listener."""
+
+    def __init__(self):
+        self.calls = 0
+
+    @commands.Cog.listener()
+    async def on_foo(self) -> None:
+        """Count the calls of the listener."""
+        self.calls += 1
+
+
+@patch("bot.bot.constants.Stats.instrumentation", True, create=True)
+class BotInstrumentationTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for the latency timers of listeners and commands."""
+
+    async def asyncSetUp(self):
+        self.bot = Bot(command_prefix="!", redis_session=MagicMock())
+        self.bot.stats = MagicMock()
+
+    async def test_listeners_are_timed(self):
+        """A cog's listeners should be wrapped in a timer named after the event and the cog."""
+        cog = FooCog()
+        self.bot.add_cog(cog)
+
+        [listener] = self.bot.extra_events["on_foo"]
+        await listener()
+
+        self.assertEqual(cog.calls, 1)
+        self.bot.stats.timing.assert_called_once()
+        self.assertEqual(self.bot.stats.timing.call_args[0][0], "latency.listeners.on_foo.FooCog")
+
+    async def test_timed_listeners_are_removed(self):
+        """Removing a cog should remove the timers its listeners were wrapped in."""
+        self.bot.add_cog(FooCog())
+        self.bot.remove_cog("FooCog")
+
+        self.assertEqual(self.bot.extra_events["on_foo"], [])
+        self.assertEqual(self.bot._instrumented_listeners, {})
+
+    async def test_listeners_with_custom_names_are_removed_without_name(self):
+        """A timed listener added under a custom event name should be removed without passing the name."""
+        cog = FooCog()
+        self.bot.add_listener(cog.on_foo, "on_bar")
+        self.bot.remove_listener(cog.on_foo)
+
+        self.assertEqual(self.bot.extra_events["on_bar"], [])
+        self.assertEqual(self.bot._instrumented_listeners, {})
+
+    @patch("bot.bot.constants.Stats.instrumentation", False, create=True)
+    async def test_listeners_are_not_wrapped_when_disabled(self):
+        """Listeners should be added as they are if instrumentation is disabled."""
+        cog = FooCog()
+        self.bot.add_cog(cog)
+
+        self.assertEqual(self.bot.extra_events["on_foo"], [cog.on_foo])
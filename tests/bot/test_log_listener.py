@@ -0,0 +1,79 @@
+import logging
+import queue
+import unittest
+from logging import handlers
+from unittest.mock import patch
+
+import bot
+
+
+class RecordingHandler(logging.Handler):
+    """A handler which keeps the records it handles."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+class LogListenerTests(unittest.TestCase):
+    """Tests for moving the root logger's handlers behind a queue listener."""
+
+    def setUp(self):
+        self.handler = RecordingHandler()
+        self.logger = logging.Logger("test_log_listener")
+        self.logger.handlers = [self.handler]
+
+        for patcher in (
+            patch("bot.root_log", self.logger),
+            patch("bot.log_queue", queue.SimpleQueue()),
+            patch("bot.log_listener", None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(bot.stop_log_listener)
+
+    def test_handlers_are_moved_behind_queue_and_restored(self):
+        """The root handlers should move to the listener on start and come back on stop."""
+        bot.start_log_listener()
+
+        queue_handler, = self.logger.handlers
+        self.assertIsInstance(queue_handler, handlers.QueueHandler)
+        self.assertEqual(bot.log_listener.handlers, (self.handler,))
+
+        bot.stop_log_listener()
+
+        self.assertEqual(self.logger.handlers, [self.handler])
+        self.assertIsNone(bot.log_listener)
+
+    def test_records_are_formatted_before_being_queued(self):
+        """Records should be written with their arguments as they were when they were logged."""
+        bot.start_log_listener()
+
+        value = ["before"]
+        self.logger.warning("value: %s", value)
+        value[0] = "after"
+
+        bot.stop_log_listener()
+
+        record, = self.handler.records
+        self.assertEqual(record.getMessage(), "value: ['before']")
+        self.assertIsNone(record.args)
+
+    def test_repeated_calls_are_idempotent(self):
+        """Starting or stopping the listener again should leave it as it is."""
+        bot.start_log_listener()
+        listener = bot.log_listener
+        bot.start_log_listener()
+
+        self.assertIs(bot.log_listener, listener)
+        self.assertEqual(len(self.logger.handlers), 1)
+        self.assertEqual(listener.handlers, (self.handler,))
+
+        bot.stop_log_listener()
+        bot.stop_log_listener()
+
+        self.assertEqual(self.logger.handlers, [self.handler])
+        self.assertIsNone(bot.log_listener)
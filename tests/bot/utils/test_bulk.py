@@ -0,0 +1,87 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+
+from bot.utils.bulk import BulkExecutor, MAX_ATTEMPTS
+
+
+def http_exception(status: int, retry_after: str = "0.5") -> discord.HTTPException:
+    """Return an HTTP exception with the given `status` and Retry-After header."""
+    response = MagicMock(status=status, reason="foo", headers={"Retry-After": retry_after})
+    return discord.HTTPException(response, "bar")
+
+
+class BulkExecutorTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for sending requests in bulk with `BulkExecutor`."""
+
+    def setUp(self):
+        self.executor = BulkExecutor("foo")
+
+    async def test_requests_are_sent_concurrently(self):
+        """Up to `max_concurrency` requests should be in flight at once."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def request(_item: int) -> None:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+
+        result = await self.executor.run(range(10), request, max_concurrency=3)
+
+        self.assertEqual(max_in_flight, 3)
+        self.assertEqual(result.n_success, 10)
+        self.assertFalse(result.paused)
+
+    @patch("bot.utils.bulk.asyncio.sleep", new_callable=AsyncMock)
+    async def test_rate_limited_requests_are_retried(self, sleep):
+        """A 429 should be retried after the time in its Retry-After header."""
+        request = AsyncMock(side_effect=[http_exception(429), None])
+
+        result = await self.executor.run([1], request, max_concurrency=1)
+
+        sleep.assert_awaited_once_with(0.5)
+        self.assertEqual(request.await_count, 2)
+        self.assertEqual(result.n_success, 1)
+
+    @patch("bot.utils.bulk.asyncio.sleep", new_callable=AsyncMock)
+    async def test_failed_requests_are_counted_by_status(self, _sleep):
+        """Requests failing with other statuses, or rate limited too often, should be counted as failed."""
+        request = AsyncMock(side_effect=[http_exception(403)] + [http_exception(429)] * MAX_ATTEMPTS)
+
+        result = await self.executor.run([1, 2], request, max_concurrency=1)
+
+        self.assertEqual(result.n_success, 0)
+        self.assertEqual(result.failed_statuses, {403: 1, 429: 1})
+
+    async def test_other_exceptions_abort_run(self):
+        """An exception which isn't an HTTP error should stop the run and be stored in the result."""
+        error = ValueError()
+        request = AsyncMock(side_effect=[None, error, None])
+
+        result = await self.executor.run([1, 2, 3], request, max_concurrency=1)
+
+        self.assertIs(result.exception, error)
+        self.assertEqual(result.n_success, 1)
+        self.assertEqual(request.await_count, 2)
+
+    async def test_pause_stops_taking_items(self):
+        """Pausing should let in-flight requests finish without starting new ones until resumed."""
+        async def request(item: int) -> None:
+            if item == 1:
+                self.executor.pause()
+
+        request = AsyncMock(side_effect=request)
+
+        result = await self.executor.run([1, 2, 3], request, max_concurrency=1)
+        self.assertTrue(result.paused)
+        self.assertEqual(result.n_success, 1)
+
+        self.executor.resume()
+        result = await self.executor.run([2, 3], request, max_concurrency=1)
+        self.assertFalse(result.paused)
+        self.assertEqual(result.n_success, 2)
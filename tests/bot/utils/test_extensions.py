@@ -0,0 +1,32 @@
+import sys
+import unittest
+from unittest.mock import patch
+
+from bot.utils import extensions
+
+
+class WalkExtensionsTests(unittest.TestCase):
+    """Tests for finding extensions in the bot.exts subpackage."""
+
+    def test_packages_with_setup_are_extensions(self):
+        """Packages should only be extensions if their `__init__` module defines `setup`."""
+        found = set(extensions.walk_extensions())
+
+        self.assertIn("bot.exts.backend.sync", found)
+        self.assertNotIn("bot.exts.backend", found)
+        self.assertIn("bot.exts.backend.error_handler", found)
+
+    def test_private_modules_are_skipped(self):
+        """Modules and packages with names starting with an underscore should not be extensions."""
+        for name in extensions.walk_extensions():
+            with self.subTest(extension=name):
+                self.assertFalse(extensions.unqualify(name).startswith("_"))
+
+    def test_packages_are_not_imported(self):
+        """Finding extensions should not import the packages in bot.exts."""
+        with patch.dict(sys.modules):
+            sys.modules.pop("bot.exts.backend.sync", None)
+
+            list(extensions.walk_extensions())
+
+            self.assertNotIn("bot.exts.backend.sync", sys.modules)
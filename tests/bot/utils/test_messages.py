@@ -1,6 +1,10 @@
+import asyncio
 import unittest
+from io import BytesIO
+from unittest.mock import MagicMock, patch
 
 from bot.utils import messages
+from tests.helpers import MockAttachment, MockMessage, MockTextChannel
 
 
 class TestMessages(unittest.TestCase):
@@ -25,3 +29,136 @@ class TestMessages(unittest.TestCase):
         for username_in, username_out in test_cases:
             with self.subTest(input=username_in, expected_output=username_out):
                 self.assertEqual(messages.sub_clyde(username_in), username_out)
+
+
+class FakeResponse:
+    """A CDN response whose body is sent once its `release` event is set."""
+
+    def __init__(self, status: int, body: bytes, release: asyncio.Event):
+        self.status = status
+        self.reason = "foo"
+        self.body = body
+        self.release = release
+        self.content = self
+
+    async def iter_chunked(self, size: int):  # noqa: ANN201
+        await self.release.wait()
+        for i in range(0, len(self.body), size):
+            yield self.body[i:i + size]
+
+    async def __aenter__(self) -> "FakeResponse":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        pass
+
+
+class SendAttachmentsTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for re-uploading attachments with `send_attachments`."""
+
+    def setUp(self):
+        self.responses = {}
+        self.requested = []
+        self.http_session = MagicMock()
+        self.http_session.get.side_effect = self.get
+
+        self.destination = MockTextChannel()
+        self.destination.guild.filesize_limit = 1000
+        self.destination.send.return_value.attachments = [MagicMock(url="url")]
+
+    def get(self, url: str) -> FakeResponse:
+        """Record the request for `url` and return its fake response."""
+        self.requested.append(url)
+        return self.responses[url]
+
+    def add_attachment(self, name: str, status: int = 200) -> MockAttachment:
+        """Return an attachment served by the fake CDN with the given response `status`."""
+        self.responses[name] = FakeResponse(status, name.encode(), asyncio.Event())
+        return MockAttachment(filename=name, proxy_url=name, url=name, size=3)
+
+    async def test_attachments_are_downloaded_ahead_and_uploaded_in_order(self):
+        """A bounded amount of downloads should run at once, and the uploads should keep their order."""
+        attachments = [self.add_attachment(f"{i}.png") for i in range(messages.MAX_CONCURRENT_ATTACHMENTS + 1)]
+        message = MockMessage(attachments=attachments)
+
+        task = asyncio.create_task(messages.send_attachments(message, self.destination, self.http_session))
+        for _ in range(3):
+            await asyncio.sleep(0)
+        self.assertEqual(self.requested, [a.proxy_url for a in attachments[:messages.MAX_CONCURRENT_ATTACHMENTS]])
+
+        # Finish the downloads in reverse order.
+        for attachment in reversed(attachments):
+            self.responses[attachment.proxy_url].release.set()
+            await asyncio.sleep(0)
+
+        self.assertEqual(await task, ["url"] * len(attachments))
+        uploaded = [call.kwargs["file"].filename for call in self.destination.send.call_args_list]
+        self.assertEqual(uploaded, [a.filename for a in attachments])
+        self.assertEqual(messages._in_flight_bytes.in_use, 0)
+
+    async def test_failed_download_does_not_stop_other_uploads(self):
+        """An attachment which can't be downloaded should be skipped."""
+        attachments = [self.add_attachment("0.png", status=404), self.add_attachment("1.png")]
+        for response in self.responses.values():
+            response.release.set()
+
+        message = MockMessage(attachments=attachments)
+
+        urls = await messages.send_attachments(message, self.destination, self.http_session)
+
+        self.assertEqual(urls, ["url"])
+        self.assertEqual(self.destination.send.call_args.kwargs["file"].filename, "1.png")
+        self.assertEqual(messages._in_flight_bytes.in_use, 0)
+
+    @patch("bot.utils.messages.CHUNK_SIZE", 2)
+    @patch("bot.utils.messages.MAX_IN_MEMORY_SIZE", 2)
+    async def test_large_attachment_is_buffered_on_disk(self):
+        """An attachment larger than `MAX_IN_MEMORY_SIZE` should be written to a file outside of the event loop."""
+        attachment = self.add_attachment("large.png")
+        self.responses[attachment.proxy_url].release.set()
+        loop = asyncio.get_running_loop()
+
+        with patch.object(loop, "run_in_executor", wraps=loop.run_in_executor) as run_in_executor:
+            with await messages._download_attachment(attachment, self.http_session) as file:
+                self.assertNotIsInstance(file, BytesIO)
+                self.assertEqual(file.read(), b"large.png")
+
+        # The file is created, then each of the 5 chunks is written.
+        self.assertEqual(run_in_executor.call_count, 6)
+
+
+class ByteBudgetTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for the limit on the total size of the attachments being re-uploaded."""
+
+    async def test_sizes_are_granted_in_order(self):
+        """A size which fits shouldn't be granted before an earlier one which doesn't."""
+        budget = messages._ByteBudget(10)
+        await budget.acquire(8)
+
+        large = asyncio.create_task(budget.acquire(5))
+        small = asyncio.create_task(budget.acquire(1))
+        await asyncio.sleep(0)
+        self.assertFalse(large.done())
+        self.assertFalse(small.done())
+
+        budget.release(8)
+        await asyncio.gather(large, small)
+        self.assertEqual(budget.in_use, 6)
+
+    async def test_oversized_size_is_granted_alone(self):
+        """A size larger than the limit should be granted once nothing else is held."""
+        budget = messages._ByteBudget(10)
+
+        await asyncio.wait_for(budget.acquire(20), timeout=1)
+        self.assertEqual(budget.in_use, 20)
+
+    async def test_cancelled_waiter_is_removed(self):
+        """Cancelling a waiting acquisition should let the next one be granted."""
+        budget = messages._ByteBudget(10)
+        await budget.acquire(8)
+        large = asyncio.create_task(budget.acquire(5))
+        await asyncio.sleep(0)
+
+        large.cancel()
+        await asyncio.wait_for(budget.acquire(2), timeout=1)
+        self.assertEqual(budget.in_use, 10)
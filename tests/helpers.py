@@ -518,3 +518,39 @@ class MockAsyncWebhook(CustomMockMixin, unittest.mock.MagicMock):
     """
     spec_set = webhook_instance
     additional_spec_asyncs = ("send", "edit", "delete", "execute")
+
+
+class FakeRedisCache:
+    """A dict-backed stand-in for a `RedisCache` which counts the round trips made to it."""
+
+    def __init__(self, data: dict = None):
+        self.data = dict(data or {})
+        self.round_trips = 0
+
+    async def get(self, key, default=None):  # noqa: ANN001, ANN201
+        self.round_trips += 1
+        return self.data.get(key, default)
+
+    async def set(self, key, value) -> None:  # noqa: ANN001
+        self.round_trips += 1
+        self.data[key] = value
+
+    async def delete(self, key) -> None:  # noqa: ANN001
+        self.round_trips += 1
+        self.data.pop(key, None)
+
+    async def pop(self, key, default=None):  # noqa: ANN001, ANN201
+        self.round_trips += 1
+        return self.data.pop(key, default)
+
+    async def update(self, items: dict) -> None:
+        self.round_trips += 1
+        self.data.update(items)
+
+    async def to_dict(self) -> dict:
+        self.round_trips += 1
+        return dict(self.data)
+
+    async def clear(self) -> None:
+        self.round_trips += 1
+        self.data.clear()